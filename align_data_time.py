@@ -1,5 +1,8 @@
 # align_data_time.py
 
+import time
+import tracemalloc
+
 import pandas as pd
 import numpy as np
 import config
@@ -10,17 +13,385 @@ from calc_indicators import (
     compute_ema,
     extend_index,
     compute_bollinger_bands,
+    add_weekly_senkou_b_slope_features,
 )
 
-from get_data import extend_weekly_index
+from get_data import extend_weekly_index, update_weekly_from_daily
 from math_helpers import smooth_savgol
+from rolling_extrema import rolling_extrema
+from streaming_indicators import StreamingEMA
+from indicator_registry import BuildContext, indicator, producer_of, resolve
+
+FUTURE_DAYS = 26 * 7  # daily rows appended for the forward-shifted cloud
+CHIKOU_CUTOFF_DAYS = 26 * 2 * 7  # weekly Chikou is dropped in the last rows
+EMA_PERIODS = (9, 20, 50, 100, 200, 365, "2y")
+
+
+def _ema_span(p):
+    return 365 * 2 if p == "2y" else p
+
+
+def build_weekly_ichimoku(weekly, slope_features=True):
+    """
+    Weekly Ichimoku on the 26-week extended index
+    (+ smoothed Senkou B slope features used by the signals).
+    """
+    ichimoku = compute_ichimoku(extend_weekly_index(weekly), prefix="W_", weekly=True)
+    if slope_features:
+        ichimoku = add_weekly_senkou_b_slope_features(ichimoku)
+    return ichimoku
+
+
+# =========================
+# Daily indicators (daily index)
+# =========================
+def _register_ema(p):
+    col = f"EMA_{p}"
+    span = _ema_span(p)
+
+    def _ema_resume(data, ctx, previous):
+        # Rebuild the exact ewm(adjust=False) state after the previous rows:
+        # last EMA value, decayed once per trailing NaN close.
+        ema = StreamingEMA(span, name=col)
+        ema.ewm.weighted = previous[col][-1]
+        if ema.ewm.weighted == ema.ewm.weighted:
+            for close in previous["D_Close"][::-1]:
+                if close == close:
+                    break
+                ema.ewm.old_wt *= 1.0 - ema.ewm.alpha
+
+        values = [ema.update({"D_Close": c})[col] for c in data["D_Close"]]
+        return pd.DataFrame({col: values}, index=data.index)
+
+    @indicator(f"ema_{p}", produces=[col], requires=["D_Close"], resume=_ema_resume)
+    def _ema(data, ctx):
+        return pd.DataFrame({col: compute_ema(data, span)}, index=data.index)
+
+
+def _slope_window():
+    return getattr(config, "EMA_SLOPE_WINDOW_DAYS", 28)
+
+
+def _register_ema_slope(p):
+    col = f"EMA_{p}"
+
+    @indicator(
+        f"ema_{p}_slope",
+        produces=[f"{col}_slope_%"],
+        requires=[col],
+        warmup=_slope_window,
+    )
+    def _ema_slope(data, ctx):
+        past = data[col].shift(_slope_window())
+        return pd.DataFrame(
+            {f"{col}_slope_%": (data[col] - past) / past * 100}, index=data.index
+        )
+
+
+for _p in EMA_PERIODS:
+    _register_ema(_p)
+for _p in EMA_PERIODS:
+    _register_ema_slope(_p)
+
+
+# Rolling mean / std use compensated running sums over the whole history,
+# so the bands are only bit-identical when computed from the first bar.
+@indicator(
+    "daily_bb",
+    produces=["D_BB_Middle_20", "D_BB_Upper_20", "D_BB_Lower_20", "D_BB_Width_20"],
+    requires=["D_Close"],
+)
+def _daily_bb(data, ctx):
+    return compute_bollinger_bands(data, period=20, std_dev=2, prefix="D_")
+
+
+def _daily_extrema(ctx):
+    # One shared rolling-extrema pass for Donchian AND daily Ichimoku windows
+    return ctx.memo(
+        "daily_extrema",
+        lambda: rolling_extrema(
+            ctx.daily["D_High"], ctx.daily["D_Low"], (9, 26, 52, 365)
+        ),
+    )
+
+
+def _register_donchian(w):
+    @indicator(
+        f"donchian_{w}",
+        produces=[f"DC_Upper_{w}", f"DC_Lower_{w}", f"DC_Middle_{w}"],
+        requires=["D_High", "D_Low"],
+        warmup=365 - 1,  # shares the extrema pass with every window
+    )
+    def _donchian(data, ctx):
+        extrema = _daily_extrema(ctx)
+        upper, lower = extrema.max(w), extrema.min(w)
+        return pd.DataFrame(
+            {
+                f"DC_Upper_{w}": upper,
+                f"DC_Lower_{w}": lower,
+                f"DC_Middle_{w}": (upper + lower) / 2,
+            },
+            index=data.index,
+        )
+
+
+for _w in (365, 26):
+    _register_donchian(_w)
+
+
+# =========================
+# Weekly → daily (mapped onto the extended index by the builder)
+# =========================
+@indicator(
+    "weekly_ha",
+    produces=["W_HA_Close", "W_HA_Open", "W_HA_High", "W_HA_Low"],
+    stage="weekly",
+    align="ffill",
+    causal=True,
+)
+def _weekly_ha(data, ctx):
+    ha_weekly = getattr(config, "weekly_data_HA", None)
+    if ha_weekly is None:
+        ha_weekly = compute_heikin_ashi(ctx.weekly_raw, prefix="W_", weekly=True)
+    return ha_weekly
+
+
+@indicator(
+    "weekly_raw",
+    produces=["W_Open", "W_High", "W_Low", "W_Close", "W_Volume", "W_Count"],
+    stage="weekly",
+    align="ffill",
+    causal=True,
+)
+def _weekly_raw(data, ctx):
+    return ctx.weekly_raw
+
+
+def _weekly_ichimoku_finalize(cols, ctx):
+    # Mask weekly lines where daily data is missing
+    no_close = np.isnan(cols["D_Close"])
+    for col in ("W_Tenkan_sen", "W_Kijun_sen"):
+        if col in cols:
+            cols[col][no_close] = np.nan
+
+    # Drop future Chikou values
+    cutoff_index = ctx.n_rows - CHIKOU_CUTOFF_DAYS
+    if "W_Chikou_span" in cols and cutoff_index > 0:
+        cols["W_Chikou_span"][max(0, cutoff_index - ctx.row_offset) :] = np.nan
+
+
+@indicator(
+    "weekly_ichimoku",
+    produces=[
+        "W_Tenkan_sen",
+        "W_Kijun_sen",
+        "W_Senkou_span_A",
+        "W_Senkou_span_B",
+        "W_Chikou_span",
+        "W_Senkou_span_A_future",
+        "W_Senkou_span_B_future",
+        "W_Senkou_span_B_smooth",
+        "W_Senkou_span_B_smooth_slope",
+        "W_Senkou_span_B_slope_pct",
+    ],
+    requires=["D_Close"],
+    stage="weekly",
+    align="interpolate",
+    finalize=_weekly_ichimoku_finalize,
+    tail_rows=CHIKOU_CUTOFF_DAYS,
+)
+def _weekly_ichimoku(data, ctx):
+    ichimoku_weekly = getattr(config, "ichimoku_weekly", None)
+
+    if ichimoku_weekly is None:
+        ichimoku_weekly = build_weekly_ichimoku(ctx.weekly_raw, slope_features=False)
+        config.ichimoku_weekly = ichimoku_weekly
+
+    return ichimoku_weekly
+
+
+# =========================
+# Future cloud (extended index)
+# =========================
+@indicator(
+    "daily_ichimoku",
+    produces=[
+        "D_Tenkan_sen",
+        "D_Kijun_sen",
+        "D_Senkou_span_A",
+        "D_Senkou_span_B",
+        "D_Chikou_span",
+        "D_Senkou_span_A_future",
+        "D_Senkou_span_B_future",
+    ],
+    requires=["D_High", "D_Low", "D_Close"],
+    stage="extended",
+    warmup=365 - 1,  # shares the extrema pass with Donchian
+    lookahead=26,  # Chikou / *_future are shifted back by 26 bars
+)
+def _daily_ichimoku(data, ctx):
+    extrema = _daily_extrema(ctx).pad(len(data) - len(ctx.daily), index=data.index)
+    return compute_ichimoku(data, extrema=extrema)
+
+
+# =========================
+# Weekly → daily mapping
+# =========================
+def _take(values: np.ndarray, positions: np.ndarray, missing: np.ndarray):
+    if not missing.any():
+        return values[positions]
+    out = values.astype(float)[positions]
+    out[missing] = np.nan
+    return out
+
+
+def _map_weekly(frame, align, index, r0):
+    """
+    {column: values for daily rows r0..} of a weekly frame on `index`.
+
+    ffill       → reindex(method="ffill")
+    interpolate → reindex + interpolate(method="time"): linear in time
+                  between weekly bars that fall on a daily row, leading
+                  NaNs kept, trailing rows hold the last valid value.
+    """
+    rows = index[r0:]
+
+    if align == "ffill":
+        pos = frame.index.searchsorted(rows, side="right") - 1
+        missing = pos < 0
+        return {col: _take(frame[col].to_numpy(), pos, missing) for col in frame}
+
+    x = index.asi8
+    x_rows = x[r0:]
+    # daily row of every weekly bar (only exact timestamp matches count)
+    at = index.searchsorted(frame.index)
+    on_index = at < len(index)
+    on_index[on_index] = index[at[on_index]] == frame.index[on_index]
+
+    out = {}
+    for col in frame.columns:
+        values = frame[col].to_numpy(dtype=float)
+        valid = on_index & ~np.isnan(values)
+        if not valid.any():
+            out[col] = np.full(len(rows), np.nan)
+            continue
+
+        xp, fp = x[at[valid]], values[valid]
+        filled = np.interp(x_rows, xp, fp)
+        filled[x_rows < xp[0]] = np.nan
 
+        # rows that carry a weekly bar keep its exact value
+        exact = at[valid] >= r0
+        filled[at[valid][exact] - r0] = fp[exact]
+        out[col] = filled
+    return out
 
-def get_data_with_indicators_and_time_alignment():
+
+# =========================
+# Build
+# =========================
+def _input_frame(cols, columns, index, start, stop):
+    """
+    Narrow frame with only the `columns` an indicator reads (rows start..stop).
+    """
+    return pd.DataFrame({col: cols[col][start:stop] for col in columns}, index=index)
+
+
+def _fill(plan, ctx, cols, weekly_frames, base, index, r0):
+    """
+    Write rows r0.. of every planned indicator into `cols`
+    (column → full-length row of the final block). Rows before r0 hold the
+    previous build; `ctx.daily` starts early enough for every warm-up.
+    Returns {column: values} for weekly columns that are not float
+    (full builds only; kept in their own dtype like reindex does).
+    """
+    n_daily, n_rows = len(base), len(index)
+    start = n_daily - len(ctx.daily)
+    other = {}
+
+    for col in base.columns:
+        cols[col][r0:n_daily] = base[col].to_numpy()[r0:]
+
+    for ind in plan:
+        if ind.stage == "weekly":
+            mapped = _map_weekly(weekly_frames[ind.name], ind.align, index, r0)
+            for col, values in mapped.items():
+                if values.dtype.kind == "f" or r0 > 0:
+                    cols[col][r0:] = values
+                else:
+                    other[col] = values
+            if ind.finalize is not None:
+                tail = {col: cols[col][r0:] for col in (*mapped, *ind.requires)}
+                ind.finalize(tail, ctx)
+            continue
+
+        stop = n_daily if ind.stage == "daily" else n_rows
+        if r0 > 0 and ind.resume is not None:
+            prev = {col: cols[col][:r0] for col in (*ind.requires, *ind.produces)}
+            inputs = _input_frame(cols, ind.requires, index[r0:stop], r0, stop)
+            out, first = ind.resume(inputs, ctx, prev), r0
+        else:
+            first = start if ind.warmup_rows() is not None else 0
+            inputs = _input_frame(cols, ind.requires, index[first:stop], first, stop)
+            out = ind.compute(inputs, ctx)
+
+        for col in ind.produces:
+            cols[col][r0:stop] = out[col].to_numpy()[r0 - first :]
+
+    return other
+
+
+def _frame(block, order, index, other):
+    # Transposed view: one C-ordered row per column → Fortran-ordered 2D frame
+    data = pd.DataFrame(block.T, index=index, columns=order, copy=False)
+    for col, values in other.items():
+        data[col] = values
+    return data
+
+
+def _start_stats():
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    return time.perf_counter(), tracing, tracemalloc.get_traced_memory()[0]
+
+
+def _finish_stats(stats, started, data):
+    t0, tracing, mem0 = started
+    peak = tracemalloc.get_traced_memory()[1]
+    if not tracing:
+        tracemalloc.stop()
+    stats["seconds"] = time.perf_counter() - t0
+    stats["peak_mb"] = (peak - mem0) / 2**20
+    stats["frame_mb"] = data.memory_usage(deep=True).sum() / 2**20
+
+
+def _prefixed(daily):
+    base = daily.copy()
+    base.columns = [f"D_{col}" for col in base.columns]
+    return base
+
+
+def get_data_with_indicators_and_time_alignment(columns=None, stats=None):
     """
     Align daily + weekly data and compute indicators.
     Assumes daily and weekly data already exist in config.
+
+    columns=None → every registered indicator (full frame, e.g. for plotting).
+    Otherwise only the indicators needed for `columns` are computed
+    (see indicator_registry.required_columns); the D_ OHLCV columns are
+    always present.
+
+    Single pass: every indicator is computed on narrow inputs, the final
+    float block is allocated once, and weekly frames are mapped straight
+    into it (forward-filled / time-interpolated) without building
+    intermediate wide frames.
+
+    stats: optional dict, filled with build seconds, peak traced memory
+    and final frame size (MB).
     """
+    started = _start_stats() if stats is not None else None
 
     # =========================
     # Fetch data from config
@@ -34,101 +405,203 @@ def get_data_with_indicators_and_time_alignment():
             "Fetch data in main.py before calling alignment."
         )
 
-    # =========================
-    # Prepare daily data
-    # =========================
-    data = daily.copy()
-    data.columns = [f"D_{col}" for col in data.columns]
+    base = _prefixed(daily)
+    index = extend_index(base[[]], future_days=FUTURE_DAYS).index
+    plan = resolve(columns)
+    ctx = BuildContext(base, weekly_raw, plan, n_rows=len(index))
 
-    # =========================
-    # Daily EMAs
-    # =========================
-    for p in (9, 20, 50, 100, 200, 365):
-        data[f"EMA_{p}"] = compute_ema(data, p)
+    # Weekly frames are small: compute them first so the final column
+    # order is known before the block is allocated
+    weekly_frames = {
+        ind.name: ind.compute(None, ctx) for ind in plan if ind.stage == "weekly"
+    }
+    order = list(base.columns)
+    for ind in plan:
+        if ind.stage == "weekly":
+            order.extend(weekly_frames[ind.name].columns)
+        else:
+            order.extend(ind.produces)
 
-    data["EMA_2y"] = compute_ema(data, 365 * 2)
+    block = np.full((len(order), len(index)), np.nan)
+    cols = {col: block[k] for k, col in enumerate(order)}
+    other = _fill(plan, ctx, cols, weekly_frames, base, index, r0=0)
+    data = _frame(block, order, index, other)
 
-    slope_window = getattr(config, "EMA_SLOPE_WINDOW_DAYS", 28)
-    for p in (9, 20, 50, 100, 200, 365, "2y"):
-        col = f"EMA_{p}"
-        if col in data.columns:
-            data[f"{col}_slope_%"] = (
-                (data[col] - data[col].shift(slope_window))
-                / data[col].shift(slope_window)
-                * 100
-            )
+    if stats is not None:
+        _finish_stats(stats, started, data)
+    return data
 
-    # =========================
-    # Daily Bollinger Bands
-    # =========================
-    bb_daily = compute_bollinger_bands(data, period=20, std_dev=2, prefix="D_")
-    data = pd.concat([data, bb_daily], axis=1)
 
-    # =========================
-    # Donchian Channels
-    # =========================
-    data["DC_Upper_365"] = data["D_High"].rolling(365).max()
-    data["DC_Lower_365"] = data["D_Low"].rolling(365).min()
-    data["DC_Middle_365"] = (data["DC_Upper_365"] + data["DC_Lower_365"]) / 2
+# =========================
+# Incremental update
+# =========================
+def _first_change(old, new):
+    """
+    First row where two weekly frames differ (None → identical).
+    """
+    if not old.columns.equals(new.columns):
+        return 0
 
-    data["DC_Upper_26"] = data["D_High"].rolling(26).max()
-    data["DC_Lower_26"] = data["D_Low"].rolling(26).min()
-    data["DC_Middle_26"] = (data["DC_Upper_26"] + data["DC_Lower_26"]) / 2
+    common = min(len(old), len(new))
+    first = common if len(old) != len(new) else None
 
-    # =========================
-    # Extend daily index (future cloud)
-    # =========================
-    future_days = 26 * 7
-    data = extend_index(data, future_days=future_days)
+    same_index = old.index[:common] == new.index[:common]
+    if not same_index.all():
+        first = int(np.argmin(same_index))
 
-    # =========================
-    # Weekly Heikin-Ashi
-    # =========================
-    ha_weekly = getattr(config, "weekly_data_HA", None)
-    if ha_weekly is None:
-        ha_weekly = compute_heikin_ashi(weekly_raw, prefix="W_", weekly=True)
+    for col in old.columns:
+        a = old[col].to_numpy()[:common]
+        b = new[col].to_numpy()[:common]
+        same = a == b
+        if a.dtype.kind == "f":
+            same |= np.isnan(a) & np.isnan(b)
+        if not same.all():
+            row = int(np.argmin(same))
+            first = row if first is None else min(first, row)
+    return first
 
-    ha_weekly_daily = ha_weekly.reindex(data.index, method="ffill")
 
-    # =========================
-    # Weekly raw → daily
-    # =========================
-    weekly_daily = weekly_raw.reindex(data.index, method="ffill")
+def _weekly_start_row(frame, align, first, index):
+    """
+    First daily row whose mapped value can change when weekly rows
+    `first`.. change.
+    """
+    if first >= len(frame):
+        return len(index)
+    if align == "ffill":
+        return int(index.searchsorted(frame.index[first]))
 
-    data = pd.concat([data, ha_weekly_daily, weekly_daily], axis=1)
+    # interpolated rows depend on the last valid weekly bar before `first`
+    at = index.searchsorted(frame.index[:first])
+    on_index = at < len(index)
+    on_index[on_index] = index[at[on_index]] == frame.index[:first][on_index]
 
-    # =========================
-    # Weekly Ichimoku
-    # =========================
-    ichimoku_weekly = getattr(config, "ichimoku_weekly", None)
+    row = len(index)
+    for col in frame.columns:
+        valid = on_index & ~np.isnan(frame[col].to_numpy(dtype=float)[:first])
+        row = min(row, int(at[valid][-1]) if valid.any() else 0)
+    return row
 
-    if ichimoku_weekly is None:
-        weekly_extended = extend_weekly_index(weekly_raw)
-        ichimoku_weekly = compute_ichimoku(weekly_extended, prefix="W_", weekly=True)
-        config.ichimoku_weekly = ichimoku_weekly
 
-    ichimoku_weekly_daily = ichimoku_weekly.reindex(data.index).interpolate(
-        method="time"
+def append_bars(data, new_bars, stats=None):
+    """
+    Append new daily bars to a frame built by
+    get_data_with_indicators_and_time_alignment (same columns), and move
+    config.daily_data / weekly_data / ichimoku_weekly / weekly_data_HA forward.
+
+    Only the tail is recomputed: the new daily rows, the future cloud rows,
+    the rows whose weekly bar or interpolation span changed (last partial
+    week, forward-shifted Senkou, Chikou) and the Chikou cutoff window.
+    The result is bit-identical to a full rebuild. Recursive EMAs continue
+    from their last value; daily BB is recomputed over the full close
+    history (compensated rolling sums) and only its tail rows are written.
+
+    config.weekly_bb / weekly_HMA / weekly_ATR are not part of this frame:
+    refresh them separately if the caller uses them.
+
+    stats: optional dict, filled like the full build plus `first_row`
+    (first recomputed row) and `rows` (recomputed rows).
+    """
+    started = _start_stats() if stats is not None else None
+
+    old_daily = config.daily_data
+    new_bars = new_bars[new_bars.index > old_daily.index[-1]]
+    if new_bars.empty:
+        return data
+
+    producer = producer_of()
+    columns = [c for c in data.columns if c in producer]
+    plan = resolve(columns)
+    n_old = len(old_daily)
+
+    # --- old weekly frames (before config moves forward) ---
+    # causal ones change exactly where the weekly bars change: no need
+    # to keep their old frame
+    ichimoku = getattr(config, "ichimoku_weekly", None)
+    had_ichimoku = ichimoku is not None
+    slope_features = had_ichimoku and "W_Senkou_span_B_slope_pct" in ichimoku
+    old_weekly = config.weekly_data
+    old_ctx = BuildContext(_prefixed(old_daily), old_weekly, plan)
+    old_frames = {
+        ind.name: ind.compute(None, old_ctx)
+        for ind in plan
+        if ind.stage == "weekly" and not ind.causal
+    }
+
+    # --- move config forward ---
+    daily = pd.concat([old_daily, new_bars])
+    config.daily_data = daily
+    config.weekly_data = update_weekly_from_daily(old_weekly, new_bars.index[0])
+    if getattr(config, "weekly_data_HA", None) is not None:
+        config.weekly_data_HA = compute_heikin_ashi(
+            config.weekly_data, prefix="W_", weekly=True
+        )
+    config.ichimoku_weekly = (
+        build_weekly_ichimoku(config.weekly_data, slope_features=slope_features)
+        if had_ichimoku
+        else None
     )
 
-    data = pd.concat([data, ichimoku_weekly_daily], axis=1)
+    base = _prefixed(daily)
+    index = extend_index(base[[]], future_days=FUTURE_DAYS).index
+    new_ctx = BuildContext(base, config.weekly_data, plan)
+    weekly_frames = {
+        ind.name: ind.compute(None, new_ctx) for ind in plan if ind.stage == "weekly"
+    }
 
-    # Mask weekly lines where daily data is missing
-    if "W_Tenkan_sen" in data.columns:
-        data["W_Tenkan_sen"] = data["W_Tenkan_sen"].where(data["D_Close"].notna())
-    if "W_Kijun_sen" in data.columns:
-        data["W_Kijun_sen"] = data["W_Kijun_sen"].where(data["D_Close"].notna())
+    order = list(base.columns)
+    for ind in plan:
+        if ind.stage == "weekly":
+            order.extend(weekly_frames[ind.name].columns)
+        else:
+            order.extend(ind.produces)
 
-    # Drop future Chikou values
-    cutoff_days = 26 * 2 * 7
-    cutoff_index = len(data) - cutoff_days
-    if "W_Chikou_span" in data.columns and cutoff_index > 0:
-        data.loc[data.index[cutoff_index:], "W_Chikou_span"] = np.nan
+    # Anything unexpected → full rebuild (always exact)
+    if (
+        list(data.columns) != order
+        or len(data) != n_old + FUTURE_DAYS
+        or not data.index[:n_old].equals(index[:n_old])
+        or any(data[c].dtype.kind != "f" for c in order)
+    ):
+        data = get_data_with_indicators_and_time_alignment(columns=columns)
+        if stats is not None:
+            _finish_stats(stats, started, data)
+            stats["first_row"], stats["rows"] = 0, len(data)
+        return data
 
-    # =========================
-    # Daily Ichimoku
-    # =========================
-    ichimoku_daily = compute_ichimoku(data)
-    data = pd.concat([data, ichimoku_daily], axis=1)
+    # --- first row that can change ---
+    weekly_first = _first_change(old_weekly, config.weekly_data)
+    r0 = n_old
+    for ind in plan:
+        r0 = min(r0, n_old - ind.lookahead, len(data) - ind.tail_rows)
+        if ind.stage == "weekly":
+            if ind.causal:
+                first = weekly_first
+            else:
+                first = _first_change(old_frames[ind.name], weekly_frames[ind.name])
+            if first is not None:
+                r0 = min(
+                    r0,
+                    _weekly_start_row(weekly_frames[ind.name], ind.align, first, index),
+                )
+    r0 = max(0, r0)
+
+    warmups = [ind.warmup_rows() for ind in plan if ind.stage != "weekly"]
+    warmup = max([w for w in warmups if w is not None], default=0)
+    start = max(0, r0 - warmup)
+    ctx = BuildContext(
+        base.iloc[start:], config.weekly_data, plan, n_rows=len(index), row_offset=r0
+    )
+
+    # --- new block: old rows before r0, recomputed tail ---
+    block = np.full((len(order), len(index)), np.nan)
+    cols = {col: block[k] for k, col in enumerate(order)}
+    for col in order:
+        cols[col][:r0] = data[col].to_numpy()[:r0]
+    other = _fill(plan, ctx, cols, weekly_frames, base, index, r0)
+    data = _frame(block, order, index, other)
 
+    if stats is not None:
+        _finish_stats(stats, started, data)
+        stats["first_row"], stats["rows"] = r0, len(data) - r0
     return data
@@ -1,35 +1,91 @@
 # backtest.py
 from trend.trend_check import trend_check
 from trade import Trade
-from sell import sell_check
+from sell import prepare_sell_arrays, sell_check
 from buy import buy_check
 import pandas as pd
 import numpy as np
-from signals.core import check_signal_sequence
-from signals.helpers.cloud_future_check import future_week_sena_above_senb
+import signals.core as core
+from signals.core import check_signal_sequence, has_active_sequence
+from signals.prescreen import prescreen
+from signals.senb_w_future_flat_base import senb_w_future_flat_base
+from signals.helpers.cloud_future_check import (
+    future_week_sena_above_senb,
+    future_week_sena_below_senb,
+)
+from indicator_registry import required_columns, uses
 import config
 
 
-def run_backtest(data: pd.DataFrame):
+def backtest_columns():
+    """
+    Aligned-frame columns read by run_backtest and everything it calls
+    (signals, kill switch, buy / sell rules). None → unknown, build everything.
+    """
+    return required_columns(
+        run_backtest, buy_check, sell_check, future_week_sena_below_senb, *core.SIGNALS
+    )
+
+
+@uses("D_Close")
+def run_backtest(data: pd.DataFrame, stop=None, start=None):
     """
     Assumes `data` already has all required columns initialized in main().
+    start / stop: optional rows to begin at / end at (exclusive), e.g. to
+    test on a window of the history with the same frame (flat, starting
+    capital at `start`); equity / cash are NaN outside the window.
+
+    The per-bar path reads NumPy arrays extracted once before the loop
+    (close, sell-rule columns, weekly HMA positions); equity and cash are
+    written into preallocated arrays.
+
+    Quiet stretches (no open trade, no active sequence, and the pre-screen
+    says no sequence can start) are skipped in one step: nothing can happen
+    there, so equity = cash. The pre-screen mirrors senb_w_future_flat_base,
+    so it is only used while that is the first signal (core.SIGNALS can be
+    overridden); otherwise every bar is evaluated.
     """
     trades, buy_markers, sell_markers, open_trades = [], [], [], []
-    cash_series, equity_series, equity_index = [], [], []
     cash = 10000  # Starting capital
 
-    for i in range(52, len(data) - 26):
-        current_date = data.index[i]
-        close = data["D_Close"].iloc[i]
-        if pd.isna(close):
-            print(f"⛔ End of valid data at {data.index[i].date()}")
+    index = data.index
+    closes = data["D_Close"].to_numpy(dtype=float)
+    sell_arrays = prepare_sell_arrays(data)
+    equity_arr = np.full(len(data), np.nan)
+    cash_arr = np.full(len(data), np.nan)
+
+    screen = None
+    if core.SIGNALS and core.SIGNALS[0] is senb_w_future_flat_base:
+        screen = prescreen(data)
+        candidates = np.flatnonzero(screen.candidate)
+
+    start = 52 if start is None else max(52, start)
+    stop = len(data) - 26 if stop is None else min(stop, len(data) - 26)
+    missing = np.flatnonzero(np.isnan(closes[start:stop]))
+    end = start + missing[0] if len(missing) else stop  # first bar without data
+
+    i = start
+    while i < stop:
+        # === Quiet stretch → jump to the next candidate bar ===
+        if screen is not None and not open_trades and not has_active_sequence():
+            k = np.searchsorted(candidates, i)
+            nxt = min(candidates[k] if k < len(candidates) else stop, end)
+            if nxt > i:
+                equity_arr[i:nxt] = cash
+                cash_arr[i:nxt] = cash
+                i = nxt
+                continue
+
+        current_date = index[i]
+        close = closes[i]
+        if np.isnan(close):
+            print(f"⛔ End of valid data at {current_date.date()}")
             break
 
         # === Equity snapshot before trades ===
         current_equity = cash + sum(t.quantity * close for t in open_trades)
-        equity_series.append(current_equity)
-        equity_index.append(current_date)
-        cash_series.append(cash)
+        equity_arr[i] = current_equity
+        cash_arr[i] = cash
 
         # === Buy Check only if Uptrend ===
         # if data['Uptrend'].iloc[i]:
@@ -37,7 +93,7 @@ def run_backtest(data: pd.DataFrame):
         if len(open_trades) == 0:
             # extra minimal check if w_senb is under W_sena
             # if future_week_sena_above_senb(data, i):
-            if check_signal_sequence(data, i):
+            if check_signal_sequence(data, i, screen=screen):
                 print(
                     f"🚀 in back test. -Buy trigger (Gold Star) at {data.index[i].date()}"
                 )
@@ -58,11 +114,12 @@ def run_backtest(data: pd.DataFrame):
             i=i,
             cash=cash,
             sell_markers=sell_markers,
+            arrays=sell_arrays,
         )
+        i += 1
 
-    equity_df = pd.Series(equity_series, index=equity_index, name="Equity")
-    cash_df = pd.Series(cash_series, index=equity_index, name="Cash")
-    equity_df = equity_df.reindex(data.index).where(data["D_Close"].notna())
-    cash_df = cash_df.reindex(data.index).where(data["D_Close"].notna())
+    valid = data["D_Close"].notna()
+    equity_df = pd.Series(equity_arr, index=index, name="Equity").where(valid)
+    cash_df = pd.Series(cash_arr, index=index, name="Cash").where(valid)
 
     return data, buy_markers, sell_markers, trades, equity_df, cash_df
@@ -0,0 +1,190 @@
+# backtest_runner.py
+
+import contextlib
+import importlib
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+
+import pandas as pd
+import config
+from backtest import backtest_columns, run_backtest
+from metrics import trade_stats
+from pipeline import prepare_data, reset_state
+import signals.core as core
+
+# =========================
+# Strategy configuration
+# =========================
+# (module name, attribute) → value before the first override in this process
+_ORIGINAL = {}
+
+
+def _setting(name):
+    """
+    "OFFLINE" → (config, "OFFLINE")
+    "signals.core.MIN_BARS_BETWEEN_SEQS" → (signals.core, "MIN_BARS_BETWEEN_SEQS")
+    """
+    module_name, _, attr = name.rpartition(".")
+    module = importlib.import_module(module_name) if module_name else config
+    if not hasattr(module, attr):
+        raise KeyError(f"Unknown strategy setting: {name!r}")
+    return module, attr
+
+
+def apply_strategy(strategy):
+    """
+    strategy: {setting: value}. A setting is a config attribute
+    ("OFFLINE", "data_provider", ...) or a dotted module constant
+    ("signals.core.MIN_BARS_BETWEEN_SEQS"). Unknown names raise, so a
+    typo does not silently run the default strategy.
+    """
+    for name, value in (strategy or {}).items():
+        module, attr = _setting(name)
+        _ORIGINAL.setdefault((module.__name__, attr), getattr(module, attr))
+        setattr(module, attr, value)
+
+
+def restore_strategy():
+    """
+    Undo every apply_strategy override in this process.
+    """
+    for (module_name, attr), value in _ORIGINAL.items():
+        setattr(importlib.import_module(module_name), attr, value)
+    _ORIGINAL.clear()
+
+
+# =========================
+# One symbol (runs inside a worker process)
+# =========================
+def run_symbol(symbol, strategy=None, quiet=True):
+    """
+    Backtest one symbol from a clean state. Never raises: errors are
+    returned in the result, so one bad symbol does not stop the others.
+    """
+    t0 = time.perf_counter()
+    seconds = {}
+    out = None
+    error = None
+
+    log = io.StringIO()
+    redirect = contextlib.redirect_stdout(log) if quiet else contextlib.nullcontext()
+    with redirect:
+        try:
+            restore_strategy()
+            apply_strategy(strategy)
+            reset_state()
+
+            t = time.perf_counter()
+            data = prepare_data(symbol, columns=backtest_columns())
+            seconds["prepare"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            out = run_backtest(data)
+            seconds["backtest"] = time.perf_counter() - t
+        except Exception:
+            error = traceback.format_exc()
+
+    seconds["total"] = time.perf_counter() - t0
+
+    if out is None:
+        trades, equity, cash, sequences = [], None, None, 0
+    else:
+        _, _, _, trades, equity, cash = out
+        sequences = len(core.list_of_signal_sequences)
+
+    return SimpleNamespace(
+        symbol=symbol,
+        ok=error is None,
+        trades=trades,
+        equity=equity,
+        cash=cash,
+        sequences=sequences,
+        seconds=seconds,
+        pid=os.getpid(),
+        error=error,
+    )
+
+
+# =========================
+# Many symbols
+# =========================
+def run_symbols(symbols, strategy=None, max_workers=None, quiet=True):
+    """
+    Backtest `symbols` in parallel, one worker process per task.
+
+    config and the signal-sequence list are per-process globals, so each
+    worker resets them before every symbol (see pipeline.reset_state).
+    max_workers=None → all cores; 1 → run in this process (debugging).
+    Returns {symbol: result} in the caller's order.
+    """
+    symbols = list(symbols)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(symbols)))
+
+    if max_workers == 1:
+        return {sym: run_symbol(sym, strategy, quiet) for sym in symbols}
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        futures = [ex.submit(run_symbol, sym, strategy, quiet) for sym in symbols]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results[res.symbol] = res
+
+    return {sym: results[sym] for sym in symbols}
+
+
+# =========================
+# Aggregation
+# =========================
+def aggregate(results) -> pd.DataFrame:
+    """
+    One row of trade_stats per symbol plus "ALL" (every closed trade pooled).
+    """
+    rows = {}
+    pooled = []
+    for sym, res in results.items():
+        row = trade_stats(res.trades)
+        row["sequences"] = res.sequences
+        row["seconds"] = res.seconds.get("total", 0.0)
+        row["ok"] = res.ok
+        rows[sym] = row
+        pooled.extend(res.trades)
+
+    total = trade_stats(pooled)
+    total["sequences"] = sum(r["sequences"] for r in rows.values())
+    total["seconds"] = sum(r["seconds"] for r in rows.values())
+    total["ok"] = all(r["ok"] for r in rows.values())
+    rows["ALL"] = total
+
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def print_run_report(results, wall_seconds=None):
+    table = aggregate(results)
+    print("\n🧪 MULTI-SYMBOL BACKTEST")
+    with pd.option_context("display.width", 140, "display.max_columns", None):
+        print(table.round(2).to_string())
+
+    for res in results.values():
+        if not res.ok:
+            last = res.error.strip().splitlines()[-1]
+            print(f"ERR {res.symbol:10} | {last}")
+
+    line = f"{table.loc['ALL', 'seconds']:.2f}s summed per-symbol"
+    if wall_seconds is not None:
+        line += f" | {wall_seconds:.2f}s wall"
+    print(line)
+
+
+if __name__ == "__main__":
+    from universe import UNIVERSE
+
+    t0 = time.perf_counter()
+    results = run_symbols(UNIVERSE)
+    print_run_report(results, wall_seconds=time.perf_counter() - t0)
@@ -1,6 +1,8 @@
 # buy.py
 from trade import Trade
+from indicator_registry import uses
 
+@uses("D_Close")
 def buy_check(open_trades, data, i, cash, buy_markers, equity, trades):
     current_date = data.index[i]
     close = float(data["D_Close"].iloc[i])
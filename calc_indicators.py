@@ -1,7 +1,16 @@
 # calc_indicators.py
 import pandas as pd
 import numpy as np
+from pandas.tseries.frequencies import to_offset
 from math_helpers import smooth_savgol
+from rolling_extrema import rolling_extrema
+
+try:
+    from scipy.signal import lfilter
+
+    _HAS_SCIPY = True
+except Exception:
+    _HAS_SCIPY = False
 
 
 def compute_ema(data, period=200, column="D_Close"):
@@ -11,7 +20,16 @@ def compute_ema(data, period=200, column="D_Close"):
     return data[column].ewm(span=period, adjust=False).mean()
 
 
-def compute_ichimoku(data, prefix="D_", weekly=False):
+def compute_ichimoku(
+    data,
+    prefix="D_",
+    weekly=False,
+    tenkan=9,
+    kijun=26,
+    senkou_b=52,
+    shift=26,
+    extrema=None,
+):
     """
     Compute Ichimoku Cloud components.
 
@@ -19,36 +37,38 @@ def compute_ichimoku(data, prefix="D_", weekly=False):
     - data: DataFrame with prefixed OHLC columns
     - prefix: e.g. "D_" or "W_"
     - weekly: if True, overrides prefix to "W_"
+    - tenkan / kijun / senkou_b / shift: Ichimoku periods (9 / 26 / 52 / 26)
+    - extrema: optional precomputed RollingExtrema on the same High/Low
+      (shared with Donchian / parameter sweeps); computed here if None
     """
     if weekly:
         prefix = "W_"
 
     ichimoku = pd.DataFrame(index=data.index)
 
-    high_9 = data[f"{prefix}High"].rolling(window=9).max()
-    low_9 = data[f"{prefix}Low"].rolling(window=9).min()
-    ichimoku[f"{prefix}Tenkan_sen"] = (high_9 + low_9) / 2
+    windows = (tenkan, kijun, senkou_b)
+    if extrema is None or not extrema.has(windows) or len(extrema) != len(data):
+        extrema = rolling_extrema(data[f"{prefix}High"], data[f"{prefix}Low"], windows)
 
-    high_26 = data[f"{prefix}High"].rolling(window=26).max()
-    low_26 = data[f"{prefix}Low"].rolling(window=26).min()
-    ichimoku[f"{prefix}Kijun_sen"] = (high_26 + low_26) / 2
+    ichimoku[f"{prefix}Tenkan_sen"] = extrema.mid(tenkan)
+    ichimoku[f"{prefix}Kijun_sen"] = extrema.mid(kijun)
 
     ichimoku[f"{prefix}Senkou_span_A"] = (
         (ichimoku[f"{prefix}Tenkan_sen"] + ichimoku[f"{prefix}Kijun_sen"]) / 2
-    ).shift(26)
+    ).shift(shift)
 
-    high_52 = data[f"{prefix}High"].rolling(window=52).max()
-    low_52 = data[f"{prefix}Low"].rolling(window=52).min()
-    ichimoku[f"{prefix}Senkou_span_B"] = ((high_52 + low_52) / 2).shift(26)
+    ichimoku[f"{prefix}Senkou_span_B"] = pd.Series(
+        extrema.mid(senkou_b), index=data.index
+    ).shift(shift)
 
-    ichimoku[f"{prefix}Chikou_span"] = data[f"{prefix}Close"].shift(-26)
+    ichimoku[f"{prefix}Chikou_span"] = data[f"{prefix}Close"].shift(-shift)
 
     ichimoku[f"{prefix}Senkou_span_A_future"] = ichimoku[
         f"{prefix}Senkou_span_A"
-    ].shift(-26)
+    ].shift(-shift)
     ichimoku[f"{prefix}Senkou_span_B_future"] = ichimoku[
         f"{prefix}Senkou_span_B"
-    ].shift(-26)
+    ].shift(-shift)
 
     return ichimoku
 
@@ -99,15 +119,10 @@ def compute_heikin_ashi(data, prefix="D_", weekly=False):
         + data[f"{prefix}Close"]
     ) / 4
 
-    ha[f"{prefix}HA_Open"] = 0.0
-    ha.iloc[0, ha.columns.get_loc(f"{prefix}HA_Open")] = (
-        data[f"{prefix}Open"].iloc[0] + data[f"{prefix}Close"].iloc[0]
-    ) / 2
-
-    for i in range(1, len(data)):
-        ha.iloc[i, ha.columns.get_loc(f"{prefix}HA_Open")] = (
-            ha.iloc[i - 1][f"{prefix}HA_Open"] + ha.iloc[i - 1][f"{prefix}HA_Close"]
-        ) / 2
+    first_open = (data[f"{prefix}Open"].iloc[0] + data[f"{prefix}Close"].iloc[0]) / 2
+    ha[f"{prefix}HA_Open"] = _heikin_ashi_open(
+        ha[f"{prefix}HA_Close"].to_numpy(dtype=float), first_open
+    )
 
     ha[f"{prefix}HA_High"] = pd.concat(
         [data[f"{prefix}High"], ha[f"{prefix}HA_Open"], ha[f"{prefix}HA_Close"]], axis=1
@@ -120,6 +135,29 @@ def compute_heikin_ashi(data, prefix="D_", weekly=False):
     return ha
 
 
+def _heikin_ashi_open(ha_close: np.ndarray, first_open: float) -> np.ndarray:
+    """
+    HA_Open[i] = (HA_Open[i-1] + HA_Close[i-1]) / 2, HA_Open[0] = first_open.
+
+    First-order linear filter over the lagged HA_Close, computed in one pass:
+        w[m] = 0.5 * w[m-1] + 0.5 * HA_Close[m],   HA_Open[m+1] = w[m]
+    Halving is exact in floating point, so this is bit-identical to the
+    bar-by-bar recurrence.
+    """
+    out = np.empty(len(ha_close))
+    if len(out) == 0:
+        return out
+    out[0] = first_open
+
+    if _HAS_SCIPY:
+        out[1:], _ = lfilter([0.5], [1.0, -0.5], ha_close[:-1], zi=[0.5 * first_open])
+    else:
+        for i in range(1, len(out)):
+            out[i] = (out[i - 1] + ha_close[i - 1]) / 2
+
+    return out
+
+
 def compute_bollinger_bands(data, period=20, std_dev=2, prefix="D_"):
     """
     Compute Bollinger Bands (Upper, Middle, Lower).
@@ -157,32 +195,71 @@ def extend_index(df, future_days=26):
     if freq is None:
         freq = pd.Timedelta(df.index[1] - df.index[0])  # fallback
 
-    if isinstance(freq, str) and not any(char.isdigit() for char in freq):
-        freq = "1" + freq  # Add '1' in front if no number
-    start = last_date + pd.to_timedelta(freq)
+    # offset, not timedelta: calendar aliases ("B", "W-THU") have no fixed length
+    freq = to_offset(freq)
+    start = last_date + freq
     new_dates = pd.date_range(start=start, periods=future_days, freq=freq)
     extension = pd.DataFrame(index=new_dates)
     return pd.concat([df_extended, extension])
 
 
+def _wma_values(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Linearly weighted moving average (weights 1..length, newest heaviest).
+    All windows are evaluated as one matrix-vector product over a strided
+    view of the input (no copies). Same warm-up as rolling(length):
+    the first length-1 values and any window containing NaN are NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if length > len(values):
+        return out
+
+    weights = np.arange(1, length + 1, dtype=float)
+    windows = np.lib.stride_tricks.sliding_window_view(values, length)
+    out[length - 1 :] = (windows @ weights) / weights.sum()
+    return out
+
+
 def WMA(series, length):
-    weights = np.arange(1, length + 1)
-    return series.rolling(length).apply(
-        lambda prices: np.dot(prices, weights) / weights.sum(), raw=True
-    )
+    values = series.to_numpy(dtype=float)
+    return pd.Series(_wma_values(values, length), index=series.index)
 
 
-def compute_HMA(data, periods, prefix="D_"):
-    hma = pd.DataFrame(index=data.index)
+def compute_HMA_values(close: np.ndarray, periods) -> dict:
+    """
+    HMA for several periods in one call.
+
+    HMA(p) = WMA(2 * WMA(close, p // 2) - WMA(close, p), sqrt(p))
+    WMAs of close are shared between periods
+    (e.g. WMA_25 is the full window of HMA_25 and the half window of HMA_50).
+
+    Returns {period: ndarray}.
+    """
+    close = np.asarray(close, dtype=float)
+    wma_close = {}
 
+    def wma_of_close(length):
+        if length not in wma_close:
+            wma_close[length] = _wma_values(close, length)
+        return wma_close[length]
+
+    out = {}
     for period in periods:
         half_length = max(1, period // 2)
         sqrt_length = max(1, int(period**0.5))
 
-        wma_half = WMA(data[f"{prefix}Close"], half_length)
-        wma_full = WMA(data[f"{prefix}Close"], period)
+        raw = 2 * wma_of_close(half_length) - wma_of_close(period)
+        out[period] = _wma_values(raw, sqrt_length)
+
+    return out
+
 
-        hma[f"{prefix}HMA_{period}"] = WMA(2 * wma_half - wma_full, sqrt_length)
+def compute_HMA(data, periods, prefix="D_"):
+    hma = pd.DataFrame(index=data.index)
+
+    values = compute_HMA_values(data[f"{prefix}Close"].to_numpy(dtype=float), periods)
+    for period in periods:
+        hma[f"{prefix}HMA_{period}"] = values[period]
 
     return hma
 
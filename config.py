@@ -7,3 +7,20 @@ weekly_data_HA = None  # will hold Heikin Ashi weekly data
 weekly_bb = None  # will hold Bollinger Bands for weekly data
 weekly_HMA = None  # will hold HMA for weekly data
 weekly_ATR = None
+
+# data cache (see data_cache.py)
+DATA_CACHE_DIR = "data_cache"  # per-symbol OHLCV files
+OFFLINE = False  # True → never touch the network, read cache only
+data_provider = None  # DataProvider (see data_providers.py); None → yfinance
+
+# run options
+PLOT_RESULTS = True  # False → skip the plot, build only the backtest columns
+
+# weekly BB squeeze (see identify_bb_squeeze.py)
+BB_SQUEEZE_WINDOW = 52  # weeks of BB width history
+BB_SQUEEZE_PCT = 0.15  # squeeze = width in the lowest 15% of that window
+
+# indicator cache (see indicator_cache.py)
+USE_INDICATOR_CACHE = True
+INDICATOR_CACHE_DIR = "indicator_cache"  # computed indicator frames
+INDICATOR_CACHE_MAX_MB = 2048  # LRU eviction above this size
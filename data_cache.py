@@ -0,0 +1,219 @@
+# data_cache.py
+
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import config
+
+try:
+    import pyarrow  # noqa: F401
+
+    _HAS_PARQUET = True
+except Exception:
+    _HAS_PARQUET = False
+
+
+# =========================
+# Cache location / mode
+# =========================
+def cache_dir() -> str:
+    return os.environ.get("TRADING_BOT_CACHE_DIR") or getattr(
+        config, "DATA_CACHE_DIR", "data_cache"
+    )
+
+
+def is_offline() -> bool:
+    """
+    Offline mode never touches the network (CI / research sandboxes).
+    Enabled by config.OFFLINE or env TRADING_BOT_OFFLINE=1.
+    """
+    env = os.environ.get("TRADING_BOT_OFFLINE", "").strip().lower()
+    if env in ("1", "true", "yes"):
+        return True
+    return bool(getattr(config, "OFFLINE", False))
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name)
+
+
+def _file_stem(symbol: str, interval: str, source: str) -> str:
+    # one directory per provider: bars of different sources never mix
+    return os.path.join(cache_dir(), _safe(source), f"{_safe(symbol)}_{interval}")
+
+
+def _data_path(symbol: str, interval: str, source: str) -> str:
+    ext = ".parquet" if _HAS_PARQUET else ".pkl"
+    return _file_stem(symbol, interval, source) + ext
+
+
+def _meta_path(symbol: str, interval: str, source: str) -> str:
+    return _file_stem(symbol, interval, source) + ".json"
+
+
+# =========================
+# Raw read / write
+# =========================
+def read_cached(symbol: str, interval: str = "1d", source: str = "yfinance"):
+    """
+    Return (frame, meta) for a cached symbol, or (None, None) if not cached.
+    `source`: name of the provider the bars came from.
+    """
+    path = _data_path(symbol, interval, source)
+    if not os.path.exists(path):
+        return None, None
+
+    if _HAS_PARQUET:
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_pickle(path)
+
+    meta = {}
+    if os.path.exists(_meta_path(symbol, interval, source)):
+        with open(_meta_path(symbol, interval, source)) as f:
+            meta = json.load(f)
+
+    return df, meta
+
+
+def write_cached(
+    symbol: str,
+    df: pd.DataFrame,
+    start,
+    interval: str = "1d",
+    source: str = "yfinance",
+):
+    """
+    Write the full cached history for a symbol.
+    `start` is the earliest date the cache is known to cover (requested start,
+    not first bar — e.g. BTC has no bars before 2014 even if we ask for 2000).
+    """
+    path = _data_path(symbol, interval, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp = path + ".tmp"
+    if _HAS_PARQUET:
+        df.to_parquet(tmp)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+    meta = {
+        "symbol": symbol,
+        "source": source,
+        "interval": interval,
+        "start": pd.Timestamp(start).strftime("%Y-%m-%d"),
+        "first_bar": str(df.index[0]) if len(df) else None,
+        "last_bar": str(df.index[-1]) if len(df) else None,
+        "rows": int(len(df)),
+    }
+    with open(_meta_path(symbol, interval, source), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _slice(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    # Same convention as yf.download: start inclusive, end exclusive
+    idx = df.index
+    mask = (idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))
+    return df.loc[mask].copy()
+
+
+def _merge(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    # Newly downloaded bars win (the last cached bar may have been partial)
+    merged = pd.concat([old, new])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+REVALIDATE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close"]
+
+
+def _adjusted_since(cached: pd.DataFrame, fresh: pd.DataFrame, bar) -> bool:
+    """
+    True if `bar` has different prices in `fresh` than in `cached`.
+    yfinance back-adjusts Close for splits and Adj Close for splits and
+    dividends, so a changed old bar means the cached prefix is stale.
+    """
+    if bar not in fresh.index:
+        return False
+    cols = [c for c in REVALIDATE_COLUMNS if c in cached and c in fresh]
+    old = cached.loc[bar, cols].to_numpy(dtype=float)
+    new = fresh.loc[bar, cols].to_numpy(dtype=float)
+    return not np.allclose(old, new, rtol=1e-6, equal_nan=True)
+
+
+# =========================
+# Cache-through loader
+# =========================
+def load_history(
+    symbol, start, end, interval, download, offline=None, source="yfinance"
+):
+    """
+    Return OHLCV for [start, end) reading through the on-disk cache.
+
+    - First run: downloads the full range and stores it.
+    - Later runs: downloads only bars from the last closed cached bar
+      onwards and appends them (the last bar is refetched, it may have been
+      partial). If that closed bar changed (split / dividend adjustment),
+      the whole range is downloaded again instead.
+    - Offline: never calls `download`; fails if the symbol was never cached.
+
+    `download(symbol, start, end, interval)` must return a flat-column frame.
+    `source` names the provider behind `download` (cache subdirectory).
+    """
+    if offline is None:
+        offline = is_offline()
+
+    start_ts = pd.Timestamp(start)
+    end_ts = pd.Timestamp(end)
+
+    cached, meta = read_cached(symbol, interval, source)
+
+    if cached is None or cached.empty:
+        if offline:
+            raise RuntimeError(
+                f"Offline mode: no cached data for symbol: {symbol}\n"
+                f"Run once online to fill {os.path.join(cache_dir(), source)}/"
+            )
+        fresh = download(symbol, start_ts, end_ts, interval)
+        if fresh.empty:
+            return fresh
+        write_cached(symbol, fresh, start_ts, interval, source)
+        return _slice(fresh, start_ts, end_ts)
+
+    if offline:
+        return _slice(cached, start_ts, end_ts)
+
+    covered_from = pd.Timestamp(meta.get("start", cached.index[0]))
+    merged = cached
+
+    # --- Missing history at the front → refetch the requested range ---
+    if start_ts < covered_from:
+        fresh = download(symbol, start_ts, end_ts, interval)
+        if not fresh.empty:
+            merged = _merge(merged, fresh)
+            covered_from = start_ts
+
+    # --- Missing bars at the tail → fetch only the increment ---
+    last_bar = merged.index[-1]
+    if last_bar + pd.Timedelta(days=1) < end_ts:
+        # start one bar earlier: the last *closed* cached bar is refetched too
+        # and tells whether the history was re-adjusted since it was cached
+        check_bar = merged.index[-2] if len(merged) > 1 else last_bar
+        new = download(symbol, check_bar, end_ts, interval)
+        if not new.empty:
+            if _adjusted_since(merged, new, check_bar):
+                # split / dividend: every older bar changed → full refetch
+                fresh = download(symbol, covered_from, end_ts, interval)
+                if not fresh.empty:
+                    merged = fresh
+            else:
+                merged = _merge(merged, new)
+
+    if merged is not cached:
+        write_cached(symbol, merged, covered_from, interval, source)
+
+    return _slice(merged, start_ts, end_ts)
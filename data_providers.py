@@ -0,0 +1,134 @@
+# data_providers.py
+
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+OHLCV_COLUMNS = ["Adj Close", "Close", "High", "Low", "Open", "Volume"]
+
+
+class DataProvider(ABC):
+    """
+    Source of daily OHLCV bars.
+
+    fetch() returns the same layout as yf.download(auto_adjust=False):
+    flat OHLCV columns, DatetimeIndex, start inclusive, end exclusive.
+    """
+
+    name = "base"
+    cacheable = False  # True → worth caching on disk (slow / remote source)
+
+    @abstractmethod
+    def fetch(self, symbol, start, end, interval="1d") -> pd.DataFrame: ...
+
+    def __call__(self, symbol, start, end, interval="1d") -> pd.DataFrame:
+        return self.fetch(symbol, start, end, interval)
+
+
+def _slice(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    idx = df.index
+    mask = (idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))
+    return df.loc[mask].copy()
+
+
+# =========================
+# Yahoo Finance (network)
+# =========================
+class YFinanceProvider(DataProvider):
+    name = "yfinance"
+    cacheable = True
+
+    def __init__(self, session=None, progress=True):
+        self.session = session
+        self.progress = progress
+
+    def fetch(self, symbol, start, end, interval="1d") -> pd.DataFrame:
+        import yfinance as yf
+
+        kwargs = {}
+        if self.session is not None:
+            kwargs["session"] = self.session
+
+        data = yf.download(
+            symbol,
+            start=start,
+            end=end,
+            interval=interval,
+            auto_adjust=False,
+            progress=self.progress,
+            **kwargs,
+        )
+
+        # Flatten multi-index columns if present
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = [col[0] for col in data.columns]
+
+        return data
+
+
+# =========================
+# Local CSV / Parquet directory
+# =========================
+class FileProvider(DataProvider):
+    """
+    Reads <root>/<SYMBOL>.parquet or <root>/<SYMBOL>.csv
+    (also <SYMBOL>_<interval>.*, which is what data_cache writes into
+    <cache dir>/<provider name>/).
+    CSV: first column is the date index.
+    """
+
+    name = "file"
+
+    def __init__(self, root):
+        self.root = root
+
+    def _find(self, symbol, interval):
+        for stem in (f"{symbol}_{interval}", symbol):
+            for ext in (".parquet", ".csv"):
+                path = os.path.join(self.root, stem + ext)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def symbols(self):
+        names = set()
+        for fname in os.listdir(self.root):
+            stem, ext = os.path.splitext(fname)
+            if ext in (".parquet", ".csv"):
+                names.add(stem)
+        return sorted(names)
+
+    def fetch(self, symbol, start, end, interval="1d") -> pd.DataFrame:
+        path = self._find(symbol, interval)
+        if path is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        if path.endswith(".parquet"):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+
+        return _slice(df.sort_index(), start, end)
+
+
+# =========================
+# In-memory (tests / benchmarks / synthetic data)
+# =========================
+class InMemoryProvider(DataProvider):
+    name = "memory"
+
+    def __init__(self, frames=None):
+        self.frames = dict(frames or {})
+
+    def add(self, symbol, df):
+        self.frames[symbol] = df
+
+    def symbols(self):
+        return sorted(self.frames)
+
+    def fetch(self, symbol, start, end, interval="1d") -> pd.DataFrame:
+        df = self.frames.get(symbol)
+        if df is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return _slice(df, start, end)
@@ -1,33 +1,13 @@
 # get_data.py
 
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
 import config
+from data_cache import load_history
+from data_providers import DataProvider, YFinanceProvider
+
+# Asset lists (stocks / crypto) live in universe.py
 
-"""
-stocks
-"AAPL"
-"TSLA"
-"NVDA"
-"AMD"
-"MSFT"
-"AMZN"
-"META"
-"GOOGL"
-"NFLX"
-"AVGO"
-"BRK-B"
-
-crypto
-"BTC-USD"
-"ETH-USD"
-"SOL-USD"
-"LINK-USD"
-"XRP-USD"
-"ADA-USD"
-"LTC-USD"
-"""
 # =========================
 # Date range
 # =========================
@@ -36,52 +16,91 @@ END_DATE = datetime.today().strftime("%Y-%m-%d")
 
 
 # =========================
-# Daily data (single source of truth)
+# Symbol (default when none is passed)
 # =========================
-def fetch_daily_data(start=START_DATE, end=END_DATE, interval="1d"):
-    # symbol = "AAPL"
-    # symbol = "BRK-B"
-    # symbol = "BTC-USD"
-    # symbol = "ADA-USD"
-    # symbol = "LINK-USD" (good swingtrader)
-
-    # symbol = "GLD"  # gold ETF (to many sequences running)
-    # symbol = "BTC-USD"
-    # symbol = "GOOGL"
-    # symbol = "BRK-B"
-    # symbol = "LINK-USD"  # (good swingtrader)
-    # symbol = "ADA-USD"  # (100 winrate 1 good trade)
-    # symbol = "SOL-USD"
-    # symbol = "XRP-USD"
-    # symbol = "BTC-USD"
-    symbol = "XRP-USD"
+# DEFAULT_SYMBOL = "AAPL"
+# DEFAULT_SYMBOL = "BRK-B"
+# DEFAULT_SYMBOL = "ADA-USD"
+# DEFAULT_SYMBOL = "GLD"  # gold ETF (to many sequences running)
+# DEFAULT_SYMBOL = "BTC-USD"
+# DEFAULT_SYMBOL = "GOOGL"
+# DEFAULT_SYMBOL = "LINK-USD"  # (good swingtrader)
+# DEFAULT_SYMBOL = "ADA-USD"  # (100 winrate 1 good trade)
+# DEFAULT_SYMBOL = "SOL-USD"
+DEFAULT_SYMBOL = "XRP-USD"
+
 
+# =========================
+# Data provider
+# =========================
+def get_provider(provider=None) -> DataProvider:
+    """
+    Resolve the data provider: explicit arg → config.data_provider → yfinance.
+    """
+    if provider is not None:
+        return provider
+    return getattr(config, "data_provider", None) or YFinanceProvider()
+
+
+# =========================
+# Daily data (single source of truth)
+# =========================
+def fetch_daily_data(
+    symbol=None,
+    start=START_DATE,
+    end=END_DATE,
+    interval="1d",
+    offline=None,
+    provider=None,
+):
     """
     Fetch DAILY data only.
     This is the single source of truth for all higher timeframes.
+
+    - symbol=None → DEFAULT_SYMBOL
+    - provider=None → config.data_provider (yfinance by default)
+    - Remote providers read through the local cache (see data_cache.py);
+      only new bars are downloaded. Local providers are read directly.
     """
-    data = yf.download(
-        symbol,
-        start=start,
-        end=end,
-        interval=interval,
-        auto_adjust=False,
-        progress=True,
-    )
+    symbol = symbol or DEFAULT_SYMBOL
+    provider = get_provider(provider)
+
+    if provider.cacheable:
+        data = load_history(
+            symbol,
+            start,
+            end,
+            interval,
+            download=provider.fetch,
+            offline=offline,
+            source=provider.name,
+        )
+    else:
+        data = provider.fetch(symbol, start, end, interval)
 
     if data.empty:
         raise RuntimeError(f"No daily data returned for symbol: {symbol}")
 
-    # Flatten multi-index columns if present
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = [col[0] for col in data.columns]
-
     return data
 
 
 # =========================
 # Weekly data (derived from daily)
 # =========================
+def _resample_weekly(daily, anchor, min_days):
+    weekly = daily.resample(anchor).agg(
+        W_Open=("Open", "first"),
+        W_High=("High", "max"),
+        W_Low=("Low", "min"),
+        W_Close=("Close", "last"),
+        W_Volume=("Volume", "sum"),
+        W_Count=("Close", "count"),
+    )
+
+    # Drop partial / broken weeks
+    return weekly[weekly["W_Count"] >= min_days]
+
+
 def fetch_weekly_data_from_daily(anchor="W-THU", min_days=5):
     """
     FAIL-SAFE weekly data builder.
@@ -99,17 +118,7 @@ def fetch_weekly_data_from_daily(anchor="W-THU", min_days=5):
             "Daily data must be fetched first."
         )
 
-    weekly = daily.resample(anchor).agg(
-        W_Open=("Open", "first"),
-        W_High=("High", "max"),
-        W_Low=("Low", "min"),
-        W_Close=("Close", "last"),
-        W_Volume=("Volume", "sum"),
-        W_Count=("Close", "count"),
-    )
-
-    # Drop partial / broken weeks
-    weekly = weekly[weekly["W_Count"] >= min_days]
+    weekly = _resample_weekly(daily, anchor, min_days)
 
     if weekly.empty:
         raise RuntimeError(
@@ -120,6 +129,23 @@ def fetch_weekly_data_from_daily(anchor="W-THU", min_days=5):
     return weekly
 
 
+def update_weekly_from_daily(weekly, since, anchor="W-THU", min_days=5):
+    """
+    Weekly data after new daily bars (from `since` on) were added to
+    config.daily_data. Weeks that end before `since` are kept as they are;
+    only the weeks from there on are resampled again.
+    Same result as fetch_weekly_data_from_daily().
+    """
+    daily = config.daily_data
+    keep = weekly[weekly.index < pd.Timestamp(since)]
+    if keep.empty:
+        return fetch_weekly_data_from_daily(anchor=anchor, min_days=min_days)
+
+    # resampling restarts right after a week boundary → same bins
+    tail = _resample_weekly(daily[daily.index > keep.index[-1]], anchor, min_days)
+    return pd.concat([keep, tail])
+
+
 # =========================
 # Weekly index extension (Ichimoku-safe)
 # =========================
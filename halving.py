@@ -0,0 +1,260 @@
+# halving.py
+
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from backtest_runner import _setting, restore_strategy
+from sweep import evaluate_all, expand_grid, share_symbols
+
+STATE_VERSION = 3
+
+
+# =========================
+# Plan
+# =========================
+def _sample_configs(grid, n_configs, seed):
+    """
+    Every grid configuration, or a seeded random subset of n_configs
+    (same seed → same subset, in grid order).
+    """
+    configs = expand_grid(grid)
+    if n_configs is None or n_configs >= len(configs):
+        return configs
+    rng = np.random.default_rng(seed)
+    keep = np.sort(rng.choice(len(configs), size=n_configs, replace=False))
+    return [configs[k] for k in keep]
+
+
+def _budgets(min_budget, eta):
+    """
+    History / symbol fraction per rung: min_budget, min_budget * eta, ... 1.
+    The first rung is always min_budget; a later rung whose next step would
+    reach the full history becomes the full history itself
+    (0.1, eta 3 → 0.1, 0.3, 1; 0.5, eta 3 → 0.5, 1).
+    """
+    if not 0 < min_budget <= 1:
+        raise ValueError(f"min_budget must be in (0, 1], got {min_budget}")
+    if eta <= 1:
+        raise ValueError(f"eta must be > 1, got {eta}")
+    if min_budget == 1:
+        return [1.0]
+
+    budgets = [min_budget]
+    b = min_budget * eta
+    while b * eta <= 1 + 1e-9:  # 1/9 * 3 * 3 may round just above 1
+        budgets.append(b)
+        b *= eta
+    budgets.append(1.0)
+    return budgets
+
+
+def _stop_row(n_rows, valid_rows, budget, warmup=52):
+    """
+    Backtest stop row covering `budget` of the valid (non-future) bars.
+    """
+    return min(n_rows, warmup + math.ceil(budget * max(0, valid_rows - warmup)))
+
+
+# =========================
+# State file
+# =========================
+def _load_state(path, header):
+    """
+    Finished results of a state file: {task key: row}, empty if none.
+
+    The file is JSON lines: the search header, then one result per line.
+    A torn last line (interrupted write) is cut off so appending resumes
+    on a clean line.
+    """
+    results = {}
+    if path is None or not os.path.exists(path):
+        return results
+
+    good = 0  # bytes up to the last complete line
+    with open(path, "rb") as f:
+        first = f.readline()
+        if first.endswith(b"\n"):
+            state = json.loads(first)
+            if {k: state.get(k) for k in header} != header:
+                raise ValueError(
+                    f"{path} belongs to a different search (grid / seed / "
+                    "symbols / budgets / strategy changed); use a new state file"
+                )
+            good = len(first)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    break
+                results[_task_key(row["rung"], row["run"], row["symbol"])] = row
+                good += len(line)
+
+    if good < os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(good)
+    return results
+
+
+def _open_state(path, header):
+    """
+    Append handle on the state file (header written if it is new), or None.
+    """
+    if path is None:
+        return None
+    out = open(path, "a")
+    if out.tell() == 0:
+        out.write(json.dumps(header) + "\n")
+        out.flush()
+    return out
+
+
+def _task_key(rung, config_id, symbol):
+    return f"{rung}:{config_id}:{symbol}"
+
+
+# =========================
+# Search
+# =========================
+def successive_halving(
+    symbols,
+    grid,
+    n_configs=None,
+    eta=3,
+    min_budget=1 / 9,
+    metric="total_return",
+    seed=0,
+    strategy=None,
+    state_path=None,
+    max_workers=None,
+    verbose=False,
+):
+    """
+    Successive halving over strategy settings.
+
+    Rung k evaluates the surviving configurations on a budget b_k
+    (min_budget, min_budget * eta, ..., 1): the first b_k of each symbol's
+    history (run_backtest stop row) on the first ceil(b_k * len(symbols))
+    symbols. Only the best 1/eta (mean `metric` over those symbols) move on.
+    The last rung is the full history on every symbol.
+
+    - grid: {setting: [values]} as in sweep.run_sweep
+    - n_configs: seeded random subset of the grid (None → all)
+    - state_path: JSON lines file, one line per finished (rung, config,
+      symbol) result appended as it arrives; rerunning with the same
+      arguments resumes where it stopped
+    - verbose: print one progress line per rung
+
+    Returns (table of the final rung, sorted best first, {rung: table}).
+    """
+    symbols = list(symbols)
+    for name in grid:
+        _setting(name)  # fail fast on typos, before any work
+
+    configs = _sample_configs(grid, n_configs, seed)
+    budgets = _budgets(min_budget, eta)
+    header = {
+        "version": STATE_VERSION,
+        "seed": seed,
+        "symbols": symbols,
+        "budgets": budgets,
+        "metric": metric,
+        "configs": json.loads(json.dumps(configs, default=str)),
+        # base settings applied under every configuration (share_symbols)
+        "strategy": json.loads(json.dumps(strategy or {}, default=str)),
+    }
+    results = _load_state(state_path, header)
+
+    shared, frames = share_symbols(symbols, strategy)
+    out = _open_state(state_path, header)
+    stops = {}
+    for symbol, frame in shared.items():
+        valid = np.flatnonzero(~np.isnan(frame.column("D_Close")))
+        stops[symbol] = (len(frame.spec.index), int(valid[-1]) + 1 if len(valid) else 0)
+
+    tables = {}
+    survivors = list(range(len(configs)))
+    try:
+        for rung, budget in enumerate(budgets):
+            rung_symbols = symbols[: max(1, math.ceil(budget * len(symbols)))]
+            tasks = []
+            for config_id in survivors:
+                for symbol in rung_symbols:
+                    if _task_key(rung, config_id, symbol) in results:
+                        continue  # resumed
+                    n_rows, valid_rows = stops[symbol]
+                    stop = _stop_row(n_rows, valid_rows, budget)
+                    tasks.append((config_id, configs[config_id], symbol, stop))
+
+            t0 = time.perf_counter()
+            for row in evaluate_all(tasks, frames, strategy, max_workers):
+                row["rung"], row["budget"] = rung, budget
+                results[_task_key(rung, row["run"], row["symbol"])] = row
+                if out is not None:
+                    out.write(json.dumps(row, default=str) + "\n")
+                    out.flush()
+
+            rows = [
+                results[_task_key(rung, config_id, symbol)]
+                for config_id in survivors
+                for symbol in rung_symbols
+            ]
+            table = (
+                pd.DataFrame(rows)
+                .groupby("run", sort=True)
+                .agg(
+                    score=(metric, "mean"),
+                    trades=("trades", "sum"),
+                    errors=("error", lambda e: int((e != "").sum())),
+                )
+            )
+            for name in grid:
+                table[name] = [configs[c][name] for c in table.index]
+            table["rung"], table["budget"] = rung, budget
+            table["symbols"] = len(rung_symbols)
+            # best score first; ties → lower config id (deterministic)
+            table = table.sort_values("score", ascending=False, kind="stable")
+            tables[rung] = table
+
+            if verbose:
+                print(
+                    f"🪜 rung {rung}: {len(survivors)} configs × "
+                    f"{len(rung_symbols)} symbols @ {budget:.0%} history "
+                    f"({len(tasks)} runs, {time.perf_counter() - t0:.2f}s)"
+                )
+
+            if rung == len(budgets) - 1:
+                break
+            keep = max(1, len(survivors) // eta)
+            survivors = sorted(int(c) for c in table.index[:keep])
+    finally:
+        for frame in shared.values():
+            frame.close()
+        if out is not None:
+            out.close()
+        restore_strategy()
+
+    return tables[max(tables)], tables
+
+
+if __name__ == "__main__":
+    from universe import CRYPTO
+
+    grid = {
+        "signals.core.MIN_BARS_BETWEEN_SEQS": [40, 60, 90],
+        "signals.find_pivotline_cross.LOOKBACK_DAYS": [7, 14, 28],
+        "signals.evaluate_range_tension.MIN_REGLINE_CROSSES": [3, 4, 5],
+        "signals.evaluate_range_tension.MIN_EMA_CROSSES": [3, 4, 5],
+        "signals.helpers.find_start_of_consolidation.SLOPE_ABS_THRESHOLD": [1.5, 2.0],
+    }
+    t0 = time.perf_counter()
+    best, _ = successive_halving(
+        CRYPTO, grid, state_path="halving_state.jsonl", verbose=True
+    )
+    print(best.head(10).to_string())
+    print(f"{time.perf_counter() - t0:.2f}s wall")
@@ -0,0 +1,159 @@
+# indicator_cache.py
+
+import contextlib
+import hashlib
+import json
+import os
+
+import pandas as pd
+import config
+from data_cache import _HAS_PARQUET
+
+# Bump when indicator code changes its output → old entries are never hit again
+CACHE_VERSION = 1
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of a frame (values + index + column names).
+    Identical OHLCV → identical fingerprint, regardless of where it came from.
+    """
+    h = hashlib.sha1()
+    h.update(json.dumps([str(c) for c in df.columns]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Content-addressed on-disk cache for computed indicator frames.
+
+    key = (symbol, indicator name, parameters, fingerprint of source OHLCV)
+    Frames are stored as Parquet (pickle without pyarrow). When the directory
+    grows past max_bytes, least recently used entries are evicted
+    (file mtime is refreshed on every hit).
+    """
+
+    def __init__(self, directory=None, max_bytes=None, enabled=None):
+        self.directory = directory or getattr(
+            config, "INDICATOR_CACHE_DIR", "indicator_cache"
+        )
+        if max_bytes is None:
+            max_bytes = int(getattr(config, "INDICATOR_CACHE_MAX_MB", 2048) * 2**20)
+        self.max_bytes = max_bytes
+        if enabled is None:
+            enabled = getattr(config, "USE_INDICATOR_CACHE", True)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    # =========================
+    # Keys / paths
+    # =========================
+    @staticmethod
+    def key(symbol, name, params, source_fp) -> str:
+        payload = json.dumps(
+            {
+                "v": CACHE_VERSION,
+                "symbol": symbol,
+                "name": name,
+                "params": params,
+                "source": source_fp,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _path(self, key, name):
+        ext = ".parquet" if _HAS_PARQUET else ".pkl"
+        return os.path.join(self.directory, f"{name}-{key[:16]}{ext}")
+
+    # =========================
+    # Get / put
+    # =========================
+    def get(self, key, name):
+        path = self._path(key, name)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_parquet(path) if _HAS_PARQUET else pd.read_pickle(path)
+        except FileNotFoundError:  # evicted by another process meanwhile
+            return None
+        except Exception:
+            # truncated / corrupt entry → treat as miss
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            return None
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)  # LRU: mark as recently used
+        return df
+
+    def put(self, key, name, df):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key, name)
+        tmp = f"{path}.{os.getpid()}.tmp"  # one writer per file, even across processes
+        if _HAS_PARQUET:
+            df.to_parquet(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_or_compute(self, symbol, name, params, source_fp, compute):
+        """
+        Return the cached frame for this key, or compute(), store and return it.
+        """
+        if not self.enabled:
+            return compute()
+
+        key = self.key(symbol, name, params, source_fp)
+        df = self.get(key, name)
+        if df is not None:
+            self.hits += 1
+            return df
+
+        self.misses += 1
+        df = compute()
+        self.put(key, name, df)
+        return df
+
+    # =========================
+    # Eviction
+    # =========================
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+        """
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = []
+        for fname in os.listdir(self.directory):
+            path = os.path.join(self.directory, fname)
+            if fname.endswith(".tmp"):
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for fname in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, fname))
+
+    def report(self):
+        print(
+            f"🗄️ Indicator cache: {self.hits} hits, {self.misses} misses "
+            f"({self.directory})"
+        )
@@ -0,0 +1,193 @@
+# indicator_registry.py
+
+# =========================
+# Producers
+# =========================
+# name -> Indicator, in registration order.
+# Registration order is also the column order of the aligned frame, and
+# every indicator may only require columns of indicators registered before it.
+REGISTRY = {}
+
+# Input columns (the D_-prefixed daily OHLCV): always present, never computed
+BASE_COLUMNS = ("D_Adj Close", "D_Close", "D_High", "D_Low", "D_Open", "D_Volume")
+
+
+STAGES = ("daily", "extended", "weekly")
+
+
+class Indicator:
+    """
+    One block of columns of the aligned daily frame.
+
+    - produces: column names this indicator adds
+    - requires: columns it reads (produced by earlier indicators)
+    - stage:
+        "daily"    → compute returns columns on the daily index
+                     (before the future extension; NaN in future rows)
+        "extended" → compute returns columns on the extended index
+        "weekly"   → compute returns a WEEKLY frame; the builder maps it onto
+                     the extended daily index with `align`
+                     ("ffill" or "interpolate")
+    - compute(data, ctx): `data` holds only the required columns
+    - finalize(cols, ctx): optional in-place fix-up of the aligned arrays
+      (cols: {column: array}, includes the required columns)
+
+    Incremental updates (align_data_time.append_bars):
+    - warmup: input rows before a row that its value depends on
+      (int, or callable → int). None → the whole history
+    - lookahead: rows after a row that its value depends on
+      (e.g. Chikou = Close shifted back)
+    - tail_rows: rows at the end of the frame that depend on the frame length
+    - resume(data, ctx, previous): optional; continue a recursive indicator
+      from the rows already computed (`previous`: {column: values before
+      the first new row}) instead of the full history
+    - causal: weekly frame row w only depends on weekly bars <= w, so it
+      changes exactly where the weekly bars change
+    """
+
+    def __init__(
+        self,
+        name,
+        produces,
+        requires,
+        stage,
+        compute,
+        align=None,
+        finalize=None,
+        warmup=None,
+        lookahead=0,
+        tail_rows=0,
+        resume=None,
+        causal=False,
+    ):
+        self.name = name
+        self.produces = tuple(produces)
+        self.requires = tuple(requires)
+        self.stage = stage
+        self.compute = compute
+        self.align = align
+        self.finalize = finalize
+        self.warmup = warmup
+        self.lookahead = lookahead
+        self.tail_rows = tail_rows
+        self.resume = resume
+        self.causal = causal
+
+    def warmup_rows(self):
+        return self.warmup() if callable(self.warmup) else self.warmup
+
+    def __repr__(self):
+        return f"Indicator({self.name!r}, stage={self.stage!r})"
+
+
+def indicator(name, produces, requires=(), stage="daily", align=None, **options):
+    """
+    Decorator: register compute(data, ctx) as the producer of `produces`.
+    options: finalize / warmup / lookahead / tail_rows / resume / causal
+    (see Indicator).
+    """
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r}")
+    if (stage == "weekly") != (align in ("ffill", "interpolate")):
+        raise ValueError("Weekly indicators need align='ffill' or 'interpolate'")
+
+    def decorator(compute):
+        producer = producer_of()
+        missing = [c for c in requires if c not in producer and c not in BASE_COLUMNS]
+        if missing:
+            raise ValueError(
+                f"Indicator {name!r} requires {missing}, "
+                "register their producers first"
+            )
+        REGISTRY[name] = Indicator(
+            name, produces, requires, stage, compute, align=align, **options
+        )
+        return compute
+
+    return decorator
+
+
+def producer_of() -> dict:
+    """
+    {column: indicator name}
+    """
+    return {col: ind.name for ind in REGISTRY.values() for col in ind.produces}
+
+
+def resolve(columns=None) -> list:
+    """
+    Indicators needed for `columns` (transitive closure over `requires`),
+    in registration order. None → every registered indicator.
+    """
+    if columns is None:
+        return list(REGISTRY.values())
+
+    producer = producer_of()
+    columns = [c for c in columns if c not in BASE_COLUMNS]
+    unknown = [c for c in columns if c not in producer]
+    if unknown:
+        raise KeyError(f"No registered indicator produces {unknown}")
+
+    needed = set()
+    stack = [producer[c] for c in columns]
+    while stack:
+        name = stack.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        stack.extend(
+            producer[c] for c in REGISTRY[name].requires if c not in BASE_COLUMNS
+        )
+
+    return [ind for ind in REGISTRY.values() if ind.name in needed]
+
+
+# =========================
+# Consumers
+# =========================
+def uses(*columns):
+    """
+    Decorator for signals / exit rules: declare the aligned-frame columns
+    the function reads. Columns it creates itself are not listed.
+    """
+
+    def decorator(func):
+        func.uses_columns = tuple(columns)
+        return func
+
+    return decorator
+
+
+def required_columns(*consumers):
+    """
+    Union of the columns declared by `consumers` (in first-seen order).
+    Returns None if any consumer has no declaration → compute everything.
+    """
+    columns = []
+    for func in consumers:
+        declared = getattr(func, "uses_columns", None)
+        if declared is None:
+            return None
+        columns.extend(c for c in declared if c not in columns)
+    return columns
+
+
+class BuildContext:
+    """
+    Shared state of one frame build: the inputs, the rows being written
+    (row_offset .. n_rows) and a per-build memo for intermediates that
+    several indicators use (e.g. the daily rolling extrema).
+    """
+
+    def __init__(self, daily, weekly_raw, plan, n_rows=None, row_offset=0):
+        self.daily = daily
+        self.weekly_raw = weekly_raw
+        self.plan = [ind.name for ind in plan]
+        self.n_rows = n_rows
+        self.row_offset = row_offset
+        self._memo = {}
+
+    def memo(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
@@ -122,3 +122,31 @@ def print_trade_results(trades):
             print(f"Trade from {t.entry_date.date()} to {t.exit_date.date()} "
                   f"({duration} days): {t.profit():.2f} USD "
                   f"({t.profit_pct():.2f}%) | Equity Impact: {equity_impact:.2f}%")
+
+
+def trade_stats(trades):
+    """
+    Headline numbers of analyze_performance as a dict (no printing),
+    for comparing runs side by side.
+    """
+    closed_trades = [t for t in trades if t.exit_price is not None]
+    profits = [t.profit() for t in closed_trades]
+    wins = [p for p in profits if p > 0]
+    losses = [p for p in profits if p <= 0]
+
+    win_rate = len(wins) / len(closed_trades) * 100 if closed_trades else 0
+    loss_sum = abs(sum(losses))
+    profit_factor = float(sum(wins) / loss_sum) if loss_sum > 0 else float('inf')
+
+    equity_curve = np.cumsum(profits) if profits else np.zeros(1)
+    peak = np.maximum.accumulate(equity_curve)
+    max_drawdown = float(np.max(peak - equity_curve))
+
+    return {
+        "trades": len(closed_trades),
+        "win_rate": win_rate,
+        "total_return": float(sum(profits)),
+        "profit_factor": profit_factor,
+        "avg_return_pct": float(np.mean([t.profit_pct() for t in closed_trades])) if closed_trades else 0.0,
+        "max_drawdown": max_drawdown,
+    }
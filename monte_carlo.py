@@ -0,0 +1,170 @@
+# monte_carlo.py
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# =========================
+# Trade ledger
+# =========================
+def trade_ledger(trades):
+    """
+    Closed trades → (profit in USD, return on the equity at entry).
+    """
+    closed = [t for t in trades if t.exit_price is not None]
+    profits = np.array([t.profit() for t in closed], dtype=float)
+    equity = np.array([t.entry_equity or np.nan for t in closed], dtype=float)
+    return profits, profits / equity
+
+
+# =========================
+# Resampling
+# =========================
+def resample_paths(n_trades, n_paths, method="bootstrap", seed=0):
+    """
+    (n_paths, n_trades) int array of trade positions, one path per row.
+
+    - "bootstrap": draw trades with replacement (uncertainty of the edge)
+    - "shuffle":   random order of the same trades (sequence risk only)
+    """
+    rng = np.random.default_rng(seed)
+    if method == "bootstrap":
+        return rng.integers(0, n_trades, size=(n_paths, n_trades))
+    if method == "shuffle":
+        return rng.random((n_paths, n_trades)).argsort(axis=1)
+    raise ValueError(f"Unknown method {method!r} (bootstrap / shuffle)")
+
+
+def _max_streak(flags):
+    """
+    Longest run of True in every row of a 2D bool array.
+    """
+    n = flags.shape[1]
+    pos = np.arange(1, n + 1)
+    last_break = np.maximum.accumulate(np.where(flags, 0, pos), axis=1)
+    return np.where(flags, pos - last_break, 0).max(axis=1)
+
+
+def path_metrics(profits, returns, capital):
+    """
+    Per-path versions of what metrics.analyze_performance prints, for a
+    (n_paths, n_trades) batch of trade profits / equity returns.
+    Every metric is one vectorized pass over the whole batch.
+    """
+    wins = profits > 0
+    losses = ~wins
+    n = profits.shape[1]
+
+    win_sum = np.where(wins, profits, 0).sum(axis=1)
+    loss_sum = np.abs(np.where(losses, profits, 0).sum(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_factor = np.where(loss_sum > 0, win_sum / loss_sum, np.inf)
+
+    # USD curve as in analyze_performance (cumulative profit, no compounding)
+    curve = np.cumsum(profits, axis=1)
+    peak = np.maximum.accumulate(curve, axis=1)
+    max_dd = (peak - curve).max(axis=1)
+    top = peak.max(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_dd_pct = np.where(top > 0, max_dd / top * 100, 0.0)
+
+    # compounded account equity (each trade risks its share of equity)
+    equity = capital * np.cumprod(1 + returns, axis=1)
+    equity = np.hstack([np.full((len(equity), 1), capital), equity])
+    eq_peak = np.maximum.accumulate(equity, axis=1)
+    equity_dd_pct = ((eq_peak - equity) / eq_peak).max(axis=1) * 100
+
+    return {
+        "win_rate": wins.sum(axis=1) / n * 100,
+        "profit_factor": profit_factor,
+        "total_return": curve[:, -1],
+        "max_drawdown": max_dd,
+        "max_drawdown_pct": max_dd_pct,
+        "max_win_streak": _max_streak(wins),
+        "max_loss_streak": _max_streak(losses),
+        "final_equity": equity[:, -1],
+        "equity_drawdown_pct": equity_dd_pct,
+    }
+
+
+# =========================
+# Monte Carlo
+# =========================
+def monte_carlo(
+    trades,
+    n_paths=20000,
+    method="bootstrap",
+    seed=0,
+    ruin_drawdown=0.5,
+    capital=None,
+    percentiles=PERCENTILES,
+):
+    """
+    Resample the closed trades into n_paths alternative histories and
+    report the distribution of every metric.
+
+    - ruin: compounded equity falls `ruin_drawdown` (50%) below its peak
+    - capital: starting equity (None → entry equity of the first trade)
+
+    Returns SimpleNamespace(table, prob_ruin, metrics {name: per-path
+    array}, observed {name: value of the actual trade order}, seconds).
+    None when there are fewer than 2 closed trades.
+    """
+    t0 = time.perf_counter()
+    profits, returns = trade_ledger(trades)
+    if len(profits) < 2:
+        return None
+    if capital is None:
+        capital = next(t.entry_equity for t in trades if t.exit_price is not None)
+
+    idx = resample_paths(len(profits), n_paths, method, seed)
+    metrics = path_metrics(profits[idx], returns[idx], capital)
+    observed = {
+        k: v[0] for k, v in path_metrics(profits[None], returns[None], capital).items()
+    }
+
+    # "nearest": percentiles of metrics with inf values (profit factor) stay defined
+    table = pd.DataFrame(
+        {
+            name: np.percentile(values, percentiles, method="nearest")
+            for name, values in metrics.items()
+        },
+        index=[f"p{p}" for p in percentiles],
+    ).T
+    table.insert(0, "observed", pd.Series(observed))
+
+    prob_ruin = float(np.mean(metrics["equity_drawdown_pct"] >= ruin_drawdown * 100))
+
+    return SimpleNamespace(
+        table=table,
+        prob_ruin=prob_ruin,
+        ruin_drawdown=ruin_drawdown,
+        metrics=metrics,
+        observed=observed,
+        method=method,
+        n_paths=n_paths,
+        n_trades=len(profits),
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def print_monte_carlo(result):
+    print("\n🎲 MONTE CARLO ROBUSTNESS")
+    if result is None:
+        print("Need at least 2 closed trades.")
+        return
+    print(
+        f"{result.n_paths} {result.method} paths of {result.n_trades} trades "
+        f"({result.seconds:.2f}s)"
+    )
+    with pd.option_context("display.width", 140, "display.max_columns", None):
+        print(result.table.round(2).to_string())
+    print(
+        f"Probability of ruin (≥{result.ruin_drawdown:.0%} equity drawdown): "
+        f"{result.prob_ruin:.2%}"
+    )
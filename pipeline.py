@@ -0,0 +1,223 @@
+# pipeline.py
+
+import numpy as np
+import pandas as pd
+import config
+from calc_indicators import compute_bollinger_bands, compute_HMA, compute_ATR
+from identify_bb_squeeze import identify_bb_squeeze_percentile
+from align_data_time import (
+    build_weekly_ichimoku,
+    get_data_with_indicators_and_time_alignment,
+)
+from indicator_cache import IndicatorCache, fingerprint
+from get_data import fetch_daily_data, fetch_weekly_data_from_daily
+import signals.core as core
+from signals.context import context as signal_context
+from signals.SignalSequence import reset_ids
+
+# =========================
+# Columns written during the backtest
+# =========================
+BOOL_COLS = [
+    "Uptrend",
+    "Trend_Buy_Zone",
+    "W_SenB_Future_flat_to_up_point",
+    "W_SenB_Trend_Dead",
+    "Real_uptrend_start",
+    "Real_uptrend_end",
+    "Searching_micro_trendline",
+    "Searching_macro_trendline",
+    "Start_of_Dead_Trendline",
+    "W_SenB_Consol_Start_SenB",
+    "W_SenB_Consol_Start_Price",
+    "W_SenB_Consol_Start_Price_Adjusted",
+    "W_SenB_Consol_start_Adj_jump_6_months",
+    "regline_aproved",
+    "Regline_cross_event",
+    # signal columns:
+    "senb_w_future_flat_base",
+    "senb_w_future_slope_pct",
+    "chikou_free",
+    "gold_star",
+    "all_signals_on",
+    # signal helpers:
+    "W_SenB_Future_slope_ok_point",
+    "chikou_free_check_origin",
+    "found_consolidation",
+    "BB_squeeze_start",
+    "BB_squeeze_end",
+    "BB_tight_channel",
+    "BB_post_squeeze_expansion",
+]
+FLOAT_COLS = [
+    "Regline_from_last_adjusted",
+    "r_2_values_for_regline",
+    "Flatness_ratio",
+    "regline_crosses",
+    "W_SenB_trailing_poly",
+    "W_SenB_trailing_slope_pct",
+    "W_SenB_base_val",
+    #####trendline columns #####
+    "trendln_breakout",
+    "trendln_top",
+    "trendln_bottom",
+    "trendln_mid",
+    "trendln_resist2",
+    "trendln_breakdown",
+    #####trendline columns #####
+    # pivots
+    "pivot_resistance_price",
+    "pivot_support_price",
+    # gausian smooth columns
+    "smooth_s2",
+    "smooth_s5",
+    "smooth_s10",
+    "smooth_s20",
+    # pivot lines
+    "pivot_support_line",
+    "pivot_resistance_line",
+]
+
+# Derived columns that must not carry stale values into a new run
+RESET_COLS = [
+    "Regline_from_last_adjusted",
+    "regline_crosses",
+    "regline_aproved",
+    "r_2_values_for_regline",
+]
+
+
+def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
+    for col in BOOL_COLS:
+        if col not in df.columns:
+            df[col] = False
+        else:
+            df[col] = df[col].fillna(False).astype(bool)
+    for col in FLOAT_COLS:
+        if col not in df.columns:
+            df[col] = np.nan
+        else:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+# =========================
+# Process state
+# =========================
+def reset_state():
+    """
+    Forget everything a previous run left in module globals
+    (config frames, signal sequences and their ids, per-bar signal memo).
+    Run settings in config are kept.
+    """
+    config.daily_data = None
+    config.weekly_data = None
+    config.ichimoku_weekly = None
+    config.weekly_data_HA = None
+    config.weekly_bb = None
+    config.weekly_HMA = None
+    config.weekly_ATR = None
+    # cleared in place: other modules hold a reference to the sequence list
+    core.registry.clear()
+    reset_ids()
+    signal_context.clear()
+    signal_context.reset_stats()
+
+
+# =========================
+# Data for one symbol
+# =========================
+def build_weekly_bb(weekly_data) -> pd.DataFrame:
+    """
+    Weekly Bollinger Bands + squeeze flags (config.BB_SQUEEZE_WINDOW / _PCT).
+    """
+    bb = compute_bollinger_bands(weekly_data, period=20, std_dev=2, prefix="W_")
+    return identify_bb_squeeze_percentile(
+        bb,
+        bb_width_col="W_BB_Width_20",
+        window=config.BB_SQUEEZE_WINDOW,
+        pct=config.BB_SQUEEZE_PCT,
+    )
+
+
+def prepare_data(symbol, columns=None, cache=None) -> pd.DataFrame:
+    """
+    Daily data + weekly context (in config) + aligned indicator frame for
+    `symbol`, ready for run_backtest.
+
+    - columns: aligned-frame columns to build (None → all, for plotting)
+    - cache: IndicatorCache (None → a new one with the config settings)
+    """
+    cache = cache or IndicatorCache()
+
+    daily = fetch_daily_data(symbol)
+    config.daily_data = daily
+    # --- Weekly context (in config) ---
+    weekly_data = fetch_weekly_data_from_daily()
+    config.weekly_data = weekly_data
+    # config.weekly_data_HA = compute_heikin_ashi(weekly_data, prefix="W_", weekly=True)
+
+    # Indicator frames are cached on disk, keyed by the daily OHLCV content:
+    # a repeat run on unchanged data goes straight to the backtest.
+    source_fp = fingerprint(daily)
+
+    config.ichimoku_weekly = cache.get_or_compute(
+        symbol,
+        "ichimoku_weekly",
+        {"tenkan": 9, "kijun": 26, "senkou_b": 52, "shift": 26, "slope": True},
+        source_fp,
+        lambda: build_weekly_ichimoku(weekly_data),
+    )
+
+    config.weekly_bb = cache.get_or_compute(
+        symbol,
+        "weekly_bb",
+        {
+            "period": 20,
+            "std_dev": 2,
+            "squeeze_window": config.BB_SQUEEZE_WINDOW,
+            "squeeze_pct": config.BB_SQUEEZE_PCT,
+        },
+        source_fp,
+        lambda: build_weekly_bb(weekly_data),
+    )
+
+    periods = [14, 25, 50, 100]
+    config.weekly_HMA = cache.get_or_compute(
+        symbol,
+        "weekly_HMA",
+        {"periods": periods},
+        source_fp,
+        lambda: compute_HMA(weekly_data, periods=periods, prefix="W_"),
+    )
+
+    config.weekly_ATR = cache.get_or_compute(
+        symbol,
+        "weekly_ATR",
+        {"periods": periods},
+        source_fp,
+        lambda: compute_ATR(weekly_data, periods=periods, prefix="W_"),
+    )
+
+    # --- Daily data + indicators aligned with weekly ---
+    data = cache.get_or_compute(
+        symbol,
+        "aligned",
+        {
+            "ema_slope_window": getattr(config, "EMA_SLOPE_WINDOW_DAYS", 28),
+            "columns": columns,
+        },
+        source_fp,
+        lambda: get_data_with_indicators_and_time_alignment(columns=columns),
+    )
+
+    # --- One-time reset of derived columns (avoid stale state) ---
+    for c in RESET_COLS:
+        if c in data.columns:
+            data[c] = False if c == "regline_aproved" else np.nan
+
+    # If your consolidation flag is recomputed during the run and might have stale Trues from a prior session, uncomment:
+    # if "W_SenB_Consol_Start_Price_Adjusted" in data.columns:
+    #     data["W_SenB_Consol_Start_Price_Adjusted"] = False
+
+    return ensure_columns(data)
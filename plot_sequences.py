@@ -1,6 +1,5 @@
 # plot/plot_sequences.py
 
-import numpy as np
 import plotly.graph_objects as go
 
 
@@ -58,26 +57,14 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
         # --------------------------------------------------
         # 1) Frozen trend regression + diagnostics
         # --------------------------------------------------
-        if seq.helpers.get("trend_reg_frozen"):
+        if seq.trend_reg_frozen:
 
-            start_ts = seq.helpers.get("trend_reg_start_ts")
-            end_ts = seq.helpers.get("trend_reg_end_ts")
-            m = seq.helpers.get("trend_reg_m")
-            b = seq.helpers.get("trend_reg_b")
+            start_i = seq.trend_reg_start_i
+            end_i = seq.trend_reg_end_i
 
-            if (
-                m is not None
-                and start_ts is not None
-                and end_ts is not None
-                and start_ts in data.index
-                and end_ts in data.index
-            ):
-                segment = data.loc[start_ts:end_ts]
-
-                reg_y = seq.helpers.get("trend_reg_y")
-                if reg_y is None:
-                    x = np.arange(len(segment))
-                    reg_y = m * x + b
+            if seq.trend_reg_m is not None and end_i < len(data):
+                segment = data.iloc[start_i : end_i + 1]
+                _, reg_y = seq.trend_reg_line()
 
                 # --- regression line ---
                 key = "trend_regression"
@@ -100,11 +87,10 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
                 )
 
                 # --- regline ↔ smooth crossings ---
-                cross_ts = seq.helpers.get("range_tension_regline_cross_ts", [])
                 smooth_col = "smooth_s10"
 
-                if cross_ts:
-                    cross_ts = [ts for ts in cross_ts if ts in segment.index]
+                if seq.regline_cross_i is not None and len(seq.regline_cross_i):
+                    cross_ts = data.index[seq.regline_cross_i].tolist()
                     cross_y = (
                         segment.loc[cross_ts, smooth_col]
                         if smooth_col in segment.columns
@@ -127,11 +113,8 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
                     )
 
                 # --- EMA ↔ smooth crossings ---
-                ema_cross_ts = seq.helpers.get("range_tension_ema_cross_ts", [])
-                ema_col = "EMA_50"
-
-                if ema_cross_ts:
-                    ema_cross_ts = [ts for ts in ema_cross_ts if ts in segment.index]
+                if seq.ema_cross_i is not None and len(seq.ema_cross_i):
+                    ema_cross_ts = data.index[seq.ema_cross_i].tolist()
                     ema_cross_y = (
                         segment.loc[ema_cross_ts, smooth_col]
                         if smooth_col in segment.columns
@@ -160,21 +143,11 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
         # --------------------------------------------------
         # 2) Pivot resistance
         # --------------------------------------------------
-        res_m = seq.helpers.get("pivot_resistance_m")
-        res_b = seq.helpers.get("pivot_resistance_b")
-        start_ts = seq.helpers.get("pivot_start_ts")
-        end_ts = seq.helpers.get("pivot_end_ts")
+        line = seq.pivot_line()
 
-        if (
-            res_m is not None
-            and start_ts is not None
-            and end_ts is not None
-            and start_ts in data.index
-            and end_ts in data.index
-        ):
-            segment = data.loc[start_ts:end_ts]
-            x = np.arange(len(segment))
-            y = res_m * x + res_b
+        if line is not None and seq.pivot_end_i < len(data):
+            segment = data.iloc[seq.pivot_start_i : seq.pivot_end_i + 1]
+            _, y = line
 
             key = "pivot_resistance"
             fig.add_trace(
@@ -194,19 +167,11 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
         # --------------------------------------------------
         # 3) Pivot support
         # --------------------------------------------------
-        sup_m = seq.helpers.get("pivot_support_m")
-        sup_b = seq.helpers.get("pivot_support_b")
+        line = seq.pivot_line(support=True)
 
-        if (
-            sup_m is not None
-            and start_ts is not None
-            and end_ts is not None
-            and start_ts in data.index
-            and end_ts in data.index
-        ):
-            segment = data.loc[start_ts:end_ts]
-            x = np.arange(len(segment))
-            y = sup_m * x + sup_b
+        if line is not None and seq.pivot_end_i < len(data):
+            segment = data.iloc[seq.pivot_start_i : seq.pivot_end_i + 1]
+            _, y = line
 
             key = "pivot_support"
             fig.add_trace(
@@ -226,9 +191,8 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
         # --------------------------------------------------
         # 4) Pivot DAILY CLOSE break marker
         # --------------------------------------------------
-        break_ts = seq.helpers.get("pivot_break_ts")
-
-        if break_ts is not None and break_ts in data.index:
+        if seq.pivot_break_i is not None and seq.pivot_break_i < len(data):
+            break_ts = data.index[seq.pivot_break_i]
             key = "pivot_breakout"
             fig.add_trace(
                 go.Scatter(
@@ -247,9 +211,8 @@ def plot_signal_sequences(fig, data, signal_sequences, row=1, col=1):
         # --------------------------------------------------
         # 5) Paired WEEKLY BB ↔ PIVOT marker
         # --------------------------------------------------
-        pair_ts = seq.helpers.get("bb_pivot_pair_ts")
-
-        if pair_ts is not None and pair_ts in data.index:
+        if seq.bb_pivot_pair_i is not None and seq.bb_pivot_pair_i < len(data):
+            pair_ts = data.index[seq.bb_pivot_pair_i]
             key = "bb_pivot_pair"
             fig.add_trace(
                 go.Scatter(
@@ -0,0 +1,113 @@
+# rolling_extrema.py
+
+import numpy as np
+import pandas as pd
+
+
+class RollingExtrema:
+    """
+    Trailing rolling max(high) / min(low) for several window sizes,
+    stored as two (n_windows, n_bars) float arrays.
+
+    Same values and NaN semantics as pandas rolling(w).max() / .min():
+    the first w-1 bars and every window that contains a NaN are NaN.
+    """
+
+    def __init__(self, windows, max_block, min_block, index=None):
+        self.windows = tuple(windows)
+        self.max_block = max_block
+        self.min_block = min_block
+        self.index = index
+        self._row = {w: k for k, w in enumerate(self.windows)}
+
+    def __len__(self):
+        return self.max_block.shape[1]
+
+    def max(self, window) -> np.ndarray:
+        return self.max_block[self._row[window]]
+
+    def min(self, window) -> np.ndarray:
+        return self.min_block[self._row[window]]
+
+    def mid(self, window) -> np.ndarray:
+        """(max + min) / 2: Tenkan / Kijun / Senkou B / Donchian middle."""
+        return (self.max(window) + self.min(window)) / 2
+
+    def series(self, kind, window) -> pd.Series:
+        values = {"max": self.max, "min": self.min, "mid": self.mid}[kind](window)
+        return pd.Series(values, index=self.index)
+
+    def has(self, windows) -> bool:
+        return all(w in self._row for w in windows)
+
+    def pad(self, extra_bars, index=None):
+        """
+        Append `extra_bars` of NaN (future rows of an extended index).
+        Rolling windows over appended NaN rows are NaN anyway, so this equals
+        recomputing on the extended series.
+        """
+        filler = np.full((len(self.windows), extra_bars), np.nan)
+        return RollingExtrema(
+            self.windows,
+            np.hstack([self.max_block, filler]),
+            np.hstack([self.min_block, filler]),
+            index=index,
+        )
+
+
+def _doubling_levels(x: np.ndarray, top_level: int, op):
+    """
+    levels[k][i] = op over x[i - 2**k + 1 .. i] (NaN where incomplete).
+    Each level is built from the previous one in one vectorized step.
+    """
+    levels = [x]
+    for k in range(1, top_level + 1):
+        prev = levels[-1]
+        half = 1 << (k - 1)
+        cur = np.full_like(prev, np.nan)
+        cur[half:] = op(prev[half:], prev[:-half])
+        levels.append(cur)
+    return levels
+
+
+def _windowed(levels, window, n, op):
+    out = np.full(n, np.nan)
+    if window > n:
+        return out
+    k = window.bit_length() - 1  # 2**k <= window < 2**(k+1)
+    lvl = levels[k]
+    span = 1 << k
+    # window = two overlapping power-of-two blocks ending at i and i - (window - span)
+    shift = window - span
+    out[window - 1 :] = op(lvl[window - 1 :], lvl[window - 1 - shift : n - shift])
+    return out
+
+
+def rolling_extrema(high, low, windows, index=None) -> RollingExtrema:
+    """
+    Rolling max(high) and min(low) for all `windows` in one shared pass.
+
+    The power-of-two block maxima/minima (sparse table) are built once up
+    to the largest window, and every window is then answered with one
+    vectorized op over two overlapping blocks: O(n log W) total instead of
+    one full rolling pass per window and side.
+    """
+    if index is None and isinstance(high, pd.Series):
+        index = high.index
+
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    windows = tuple(sorted(set(int(w) for w in windows)))
+    n = len(high)
+
+    top = max(windows).bit_length() - 1
+    hi_levels = _doubling_levels(high, top, np.maximum)
+    lo_levels = _doubling_levels(low, top, np.minimum)
+
+    max_block = np.empty((len(windows), n))
+    min_block = np.empty((len(windows), n))
+    for k, w in enumerate(windows):
+        max_block[k] = _windowed(hi_levels, w, n, np.maximum)
+        min_block[k] = _windowed(lo_levels, w, n, np.minimum)
+
+    return RollingExtrema(windows, max_block, min_block, index=index)
@@ -1,38 +1,74 @@
 from trade import Trade
 import config
-import pandas as pd
+from types import SimpleNamespace
+from indicator_registry import uses
 
-def sell_check(open_trades, data, i, cash, sell_markers):
+SELL_COLUMNS = (
+    "D_Close",
+    "D_Senkou_span_A_future",
+    "D_Senkou_span_B_future",
+    "D_Senkou_span_A",
+    "D_Senkou_span_B",
+    "D_Kijun_sen",
+    "D_Tenkan_sen",
+    "EMA_9",
+    "W_HA_Open",
+    "W_HA_Close",
+)
+
+
+def prepare_sell_arrays(data):
+    """
+    Everything sell_check reads per bar, resolved once per backtest:
+    - one float array per column
+    - w_pos: row of config.weekly_HMA at or before each daily row
+      (= weekly_HMA.index.asof(date); -1 → no weekly bar yet)
+    """
+    w_hma = config.weekly_HMA
+    w_pos = w_hma.index.searchsorted(data.index, side="right") - 1
+    return SimpleNamespace(
+        cols={c: data[c].to_numpy(dtype=float) for c in SELL_COLUMNS},
+        w_pos=w_pos,
+        w_hma=w_hma[["W_HMA_14", "W_HMA_25", "W_HMA_50", "W_HMA_100"]].to_numpy(),
+    )
+
+
+@uses(*SELL_COLUMNS)
+def sell_check(open_trades, data, i, cash, sell_markers, arrays=None):
+    """
+    arrays: prepare_sell_arrays(data), built once by the caller
+    (rebuilt here when missing → slow, but same result).
+    """
     if i == 0:
         return open_trades, cash, sell_markers
 
+    if arrays is None:
+        arrays = prepare_sell_arrays(data)
+    col = arrays.cols
+
     current_date = data.index[i]
-    close = data['D_Close'].iloc[i]
+    close = col['D_Close'][i]
 
     # === Ichimoku lines ===
-    D_sen_A_future = data['D_Senkou_span_A_future'].iloc[i]
-    D_sen_B_future = data['D_Senkou_span_B_future'].iloc[i]
-    D_sen_A = data['D_Senkou_span_A'].iloc[i]
-    D_sen_B = data['D_Senkou_span_B'].iloc[i]
-    kijun_sen = data['D_Kijun_sen'].iloc[i]
-    d_tenkan_sen = data['D_Tenkan_sen'].iloc[i]
+    D_sen_A_future = col['D_Senkou_span_A_future'][i]
+    D_sen_B_future = col['D_Senkou_span_B_future'][i]
+    D_sen_A = col['D_Senkou_span_A'][i]
+    D_sen_B = col['D_Senkou_span_B'][i]
+    kijun_sen = col['D_Kijun_sen'][i]
+    d_tenkan_sen = col['D_Tenkan_sen'][i]
 
     # === Weekly HMA (from config) ===
-    w_hma = config.weekly_HMA  # weekly-indexed DF
-    wk_idx = w_hma.index.asof(current_date)
-    if pd.isna(wk_idx):
+    wk_pos = arrays.w_pos[i]
+    if wk_pos < 0:
         return open_trades, cash, sell_markers
 
-    w_hma_14  = w_hma.loc[wk_idx, "W_HMA_14"]
-    w_hma_25  = w_hma.loc[wk_idx, "W_HMA_25"]
-    w_hma_50  = w_hma.loc[wk_idx, "W_HMA_50"]
-    w_hma_100 = w_hma.loc[wk_idx, "W_HMA_100"]
+    w_hma_14, w_hma_25, w_hma_50, w_hma_100 = arrays.w_hma[wk_pos]
 
-    ema_9  = data['EMA_9'].iloc[i]
+    ema_9  = col['EMA_9'][i]
 
     # === Daily Heikin-Ashi (optional) ===
-    w_open = data['W_HA_Open'].iloc[i]
-    w_close = data['W_HA_Close'].iloc[i]
+    w_open = col['W_HA_Open'][i]
+    w_close = col['W_HA_Close'][i]
     ha_red = w_close < w_open
 
     # === SELL CONDITION: close below the entire daily cloud ===
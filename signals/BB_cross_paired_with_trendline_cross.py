@@ -53,10 +53,10 @@ def BB_cross_paired_with_trendline_cross(
     # --------------------------------------------------
     bb_weekly_cross = weekly_close > weekly_upper
 
-    if bb_weekly_cross and "bb_weekly_break_ts" not in seq.helpers:
-        seq.helpers["bb_weekly_break_ts"] = weekly_ts
-        seq.helpers["bb_weekly_break_close"] = weekly_close
-        seq.helpers["bb_weekly_break_upper"] = weekly_upper
+    if bb_weekly_cross and seq.bb_weekly_break_w is None:
+        seq.bb_weekly_break_w = w_pos
+        seq.bb_weekly_break_close = weekly_close
+        seq.bb_weekly_break_upper = weekly_upper
 
         print(
             f"📊 WEEKLY BB BREAK | "
@@ -70,26 +70,26 @@ def BB_cross_paired_with_trendline_cross(
     # --------------------------------------------------
     # 3) Pair with DAILY pivot / trendline break
     # --------------------------------------------------
-    pivot_ts = seq.helpers.get("pivot_break_ts")
-    bb_ts = seq.helpers.get("bb_weekly_break_ts")
-
-    if pivot_ts is None or bb_ts is None:
+    if seq.pivot_break_i is None or seq.bb_weekly_break_w is None:
         return False
 
+    pivot_ts = data.index[seq.pivot_break_i]
+    bb_ts = weekly_data.index[seq.bb_weekly_break_w]
     days_after_pivot = (bb_ts - pivot_ts).days
 
     if 0 < days_after_pivot <= max_pair_days:
-        seq.helpers["bb_pivot_pair_days"] = days_after_pivot
+        seq.bb_pivot_pair_days = days_after_pivot
 
-        seq.helpers["bb_pivot_pair_ts"] = bb_ts
+        pair_i = data.index.get_indexer([bb_ts])[0]
+        seq.bb_pivot_pair_i = pair_i if pair_i != -1 else None
 
         print(
             f"🔗 WEEKLY BB ↔ PIVOT PAIRED | "
             f"pivot={pivot_ts.date()} | "
             f"bb_week={bb_ts.date()} | "
-            f"W_Close={seq.helpers.get('bb_weekly_break_close'):.2f} | "
-            f"W_BB_Upper={seq.helpers.get('bb_weekly_break_upper'):.2f} | "
-            f"Δ={seq.helpers.get('bb_weekly_break_close') - seq.helpers.get('bb_weekly_break_upper'):.2f} | "
+            f"W_Close={seq.bb_weekly_break_close:.2f} | "
+            f"W_BB_Upper={seq.bb_weekly_break_upper:.2f} | "
+            f"Δ={seq.bb_weekly_break_close - seq.bb_weekly_break_upper:.2f} | "
             f"Δ_days={days_after_pivot} | "
             f"seq={seq.id}"
         )
@@ -1,62 +1,151 @@
 # signals/SignalSequence.py
 
-import uuid
+import itertools
+
+import numpy as np
+
+_ids = itertools.count(1)
+
+
+def reset_ids():
+    """
+    Restart sequence ids at 1 (a new run, see pipeline.reset_state).
+    """
+    global _ids
+    _ids = itertools.count(1)
 
 
 class SignalSequence:
+    """
+    State of one signal sequence, in fixed slots (no per-instance dict):
+    a universe scan creates thousands of these.
+
+    - bars are integer positions in the daily frame (`*_i`), not Timestamps
+    - signal progression is a bitmask: bit k ↔ signals.core.SIGNALS[k]
+    - lines are stored as (m, b); their points are rebuilt on demand
+    """
+
+    __slots__ = (
+        "id",
+        "symbol",
+        "start_index",
+        "active",
+        "progress",
+        "entry_signal_i",
+        "gold_star_i",
+        "consolidation_start_index",
+        # ---- Consolidation / segment ----
+        "segment_start_i",
+        # ---- Pivot regime ----
+        "pivot_support_m",
+        "pivot_support_b",
+        "pivot_resistance_m",
+        "pivot_resistance_b",
+        "pivot_start_i",
+        "pivot_end_i",
+        "last_res_pivot_i",
+        "pivot_line_last_update_i",
+        # ---- Pivot breakout ----
+        "pivot_break_i",
+        "pivot_break_val",
+        # ---- Frozen regression line + range tension ----
+        "trend_reg_frozen",
+        "trend_reg_start_i",
+        "trend_reg_end_i",
+        "trend_reg_m",
+        "trend_reg_b",
+        "range_tension_regline_crosses",
+        "range_tension_ema_crosses",
+        "range_tension_segment_len",
+        "regline_cross_i",  # int32 array of bar positions
+        "ema_cross_i",  # int32 array of bar positions
+        # ---- Weekly BB ↔ Pivot pairing ----
+        "bb_weekly_break_w",  # weekly bar position
+        "bb_weekly_break_close",
+        "bb_weekly_break_upper",
+        "bb_pivot_pair_days",
+        "bb_pivot_pair_i",
+    )
+
     def __init__(self, start_index, symbol=None):
-        self.id = str(uuid.uuid4())[:8]
-        self.start_index = start_index
-        self.entry_signal_time = None
-        self.gold_star_time = None
+        self.id = next(_ids)
         self.symbol = symbol
+        self.start_index = start_index
+        self.active = False
+        self.progress = 0
+        self.entry_signal_i = None
+        self.gold_star_i = None
+        self.consolidation_start_index = None
 
-        # --------------------------------------------------
-        # Signal progression state (ordered, boolean)
-        # --------------------------------------------------
-        self.states_dict = {
-            "senb_w_future_flat_base": False,
-            "senb_w_future_slope_pct": False,
-            "trendline_crossings": False,
-            "find_pivotline_cross": False,
-            "evaluate_regline": False,
-            "BB_recent_squeeze": False,
-            "BB_cross_paired_with_trendline_cross": False,
-        }
-
-        # --------------------------------------------------
-        # Persistent STRUCTURAL state (facts, not opinions)
-        # --------------------------------------------------
-        self.helpers = {
-            # ---- BB ↔ Pivot pairing ----
-            "bb_pivot_pair_ts": None,
-            # ---- Pivot regime ----
-            "pivot_support_m": None,
-            "pivot_support_b": None,
-            "pivot_resistance_m": None,
-            "pivot_resistance_b": None,
-            "pivot_start_ts": None,
-            "pivot_end_ts": None,
-            "last_res_pivot_ts": None,
-            # ---- Pivot breakout ----
-            "pivot_break_val": None,
-            "pivot_break_ts": None,
-            # ---- Consolidation / segment ----
-            "segment_start_ts": None,
-            # ---- Frozen regression line ----
-            "trend_reg_frozen": False,
-            "trend_reg_start_ts": None,
-            "trend_reg_end_ts": None,
-            "trend_reg_m": None,
-            "trend_reg_b": None,
-            # ---- Regline ↔ smooth crossings ----
-            "trend_reg_cross_ts": None,  # list[pd.Timestamp]
-            "trend_reg_cross_count": None,
-            # ---- Active pivot-cross candidate ----
-            "active_pivot_cross_time": None,
-            "active_pivot_cross_source": None,  # "live" | "recovered"
-            # ---- NEW: sequence-local pivot state ----
-            "pivot_state": None,
-        }
+        self.segment_start_i = None
 
-        self.active = False
+        self.pivot_support_m = None
+        self.pivot_support_b = None
+        self.pivot_resistance_m = None
+        self.pivot_resistance_b = None
+        self.pivot_start_i = None
+        self.pivot_end_i = None
+        self.last_res_pivot_i = None
+        self.pivot_line_last_update_i = None
+
+        self.pivot_break_i = None
+        self.pivot_break_val = None
+
+        self.trend_reg_frozen = False
+        self.trend_reg_start_i = None
+        self.trend_reg_end_i = None
+        self.trend_reg_m = None
+        self.trend_reg_b = None
+        self.range_tension_regline_crosses = None
+        self.range_tension_ema_crosses = None
+        self.range_tension_segment_len = None
+        self.regline_cross_i = None
+        self.ema_cross_i = None
+
+        self.bb_weekly_break_w = None
+        self.bb_weekly_break_close = None
+        self.bb_weekly_break_upper = None
+        self.bb_pivot_pair_days = None
+        self.bb_pivot_pair_i = None
+
+    # =========================
+    # Signal progression
+    # =========================
+    def fired(self, k) -> bool:
+        return bool(self.progress >> k & 1)
+
+    def mark(self, k):
+        self.progress |= 1 << k
+
+    # =========================
+    # Debug geometry (lazy)
+    # =========================
+    def trend_reg_line(self):
+        """
+        (x, y) of the frozen regression line over its segment, or None.
+        """
+        if not self.trend_reg_frozen:
+            return None
+        x = np.arange(self.trend_reg_end_i - self.trend_reg_start_i + 1)
+        return x, self.trend_reg_m * x + self.trend_reg_b
+
+    def pivot_line(self, support=False):
+        """
+        (x, y) of the pivot support / resistance line, or None.
+        """
+        m, b = (
+            (self.pivot_support_m, self.pivot_support_b)
+            if support
+            else (self.pivot_resistance_m, self.pivot_resistance_b)
+        )
+        if m is None or self.pivot_start_i is None:
+            return None
+        x = np.arange(self.pivot_end_i - self.pivot_start_i + 1)
+        return x, m * x + b
+
+    def __repr__(self):
+        return (
+            f"SignalSequence(id={self.id}, symbol={self.symbol}, "
+            f"start_index={self.start_index}, progress={self.progress:b}, "
+            f"active={self.active})"
+        )
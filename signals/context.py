@@ -0,0 +1,98 @@
+# signals/context.py
+
+from collections import Counter
+
+import pandas as pd
+
+
+class SignalContext:
+    """
+    Per-bar memo of sequence-independent sub-results: everything that
+    depends only on (data, i) is computed by the first sequence that needs
+    it and reused by the other live sequences of that bar.
+
+    Invalidation rules:
+    - another bar or another frame → the memo starts empty
+    - a sub-result that writes a column of `data` calls wrote(column):
+      every entry that declared the column in `reads` is dropped
+    - clear() between runs (pipeline.reset_state, sweep workers)
+
+    Keys are tuples starting with the sub-result name, followed by every
+    setting the result depends on (so a changed tunable never hits).
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self.misses = Counter()
+        self.invalidations = Counter()
+        self.clear()
+
+    def clear(self):
+        self._data = None
+        self._i = None
+        self._memo = {}
+        self._readers = {}  # column → keys whose value read it
+
+    def reset_stats(self):
+        self.hits.clear()
+        self.misses.clear()
+        self.invalidations.clear()
+
+    def memo(self, data, i, key, compute, reads=()):
+        """
+        Value of `key` on bar i of `data`; compute() on a miss.
+        """
+        if data is not self._data or i != self._i:
+            self.clear()
+            self._data, self._i = data, i
+
+        name = key[0]
+        if key in self._memo:
+            self.hits[name] += 1
+            return self._memo[key]
+
+        self.misses[name] += 1
+        value = compute()
+        self._memo[key] = value
+        for column in reads:
+            self._readers.setdefault(column, set()).add(key)
+        return value
+
+    def wrote(self, column):
+        """
+        `column` of the current frame changed: drop the entries that read it.
+        """
+        for key in self._readers.pop(column, ()):
+            if key in self._memo:
+                del self._memo[key]
+                self.invalidations[key[0]] += 1
+
+    # =========================
+    # Statistics
+    # =========================
+    def stats(self) -> pd.DataFrame:
+        names = sorted(set(self.hits) | set(self.misses))
+        table = pd.DataFrame(
+            {
+                "hits": [self.hits[n] for n in names],
+                "misses": [self.misses[n] for n in names],
+                "invalidations": [self.invalidations[n] for n in names],
+            },
+            index=pd.Index(names, name="sub-result"),
+        )
+        table["hit_rate"] = table["hits"] / (table["hits"] + table["misses"])
+        return table
+
+    def report(self):
+        hits = sum(self.hits.values())
+        calls = hits + sum(self.misses.values())
+        print(
+            f"🧠 Signal context: {hits} hits / {calls} calls "
+            f"({hits / calls if calls else 0:.0%} redundant work skipped)"
+        )
+        if calls:
+            print(self.stats().round(2).to_string())
+
+
+# one context per process (the backtest evaluates one bar at a time)
+context = SignalContext()
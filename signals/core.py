@@ -1,6 +1,7 @@
 # signals/core.py
 
 from .SignalSequence import SignalSequence
+from .registry import SequenceRegistry
 from .senb_w_future_flat_base import senb_w_future_flat_base
 from .senb_w_future_slope_pct import senb_w_future_slope_pct
 from .trendline_breakout import trendline_breakout
@@ -10,13 +11,13 @@ from .BB_cross_paired_with_trendline_cross import BB_cross_paired_with_trendline
 from .find_pivotline_cross import find_pivotline_cross
 from .evaluate_range_tension import evaluate_range_tension
 
-from .helpers.cloud_future_check import future_week_sena_below_senb
+from .feature_store import cloud_state
 from .helpers.find_start_of_consolidation import find_start_of_consolidation
 
 # ORDER MATTERS
 SIGNALS = [
     senb_w_future_flat_base,
-    find_start_of_consolidation,  # TODO spawn differnt starting points. ?
+    find_start_of_consolidation,  # shifted starts: signals/multi_start.py
     trendline_breakout,
     # TODO (pivot refactor):
     # - weekly_pivot_update is now sequence-local and returns pivot_state
@@ -36,33 +37,47 @@ SIGNALS = [
     # TODO
 ]
 
-# global sequence storage (all symbols)
+# global sequence storage (all symbols, creation order)
 list_of_signal_sequences = []
 
+# per-symbol active / archived index over that list (see signals/registry.py)
+registry = SequenceRegistry(len(SIGNALS), list_of_signal_sequences)
+
 # anti-spam (per symbol)
 MIN_BARS_BETWEEN_SEQS = 60
 
 
-def check_signal_sequence(data, i, symbol="BTC-USD"):
-    global list_of_signal_sequences
+def has_active_sequence(symbol="BTC-USD"):
+    return registry.has_active(symbol)
+
+
+def check_signal_sequence(data, i, symbol="BTC-USD", screen=None):
+    """
+    screen: optional signals.prescreen.prescreen(data) masks. Bars where
+    `candidate` is False skip the first signal (it cannot fire there) and
+    the kill switch reads `kill` instead of the feature store.
+
+    Only the active sequences of `symbol` are visited (registry), so the
+    per-bar cost does not grow with history or the number of symbols.
+    """
+    active = registry.active_for(symbol)
+    # kill switch (weekly future SenA < SenB): one daily-aligned mask
+    kill = screen.kill if screen is not None else cloud_state(data).sena_below_senb
 
     # ----------------------------------------------------------
     # 1️⃣ Decide whether we are allowed to start a new sequence
     #    (SYMBOL-SPECIFIC)
     # ----------------------------------------------------------
-    recent_active = any(
-        s.active and s.symbol == symbol and (i - s.start_index) < MIN_BARS_BETWEEN_SEQS
-        for s in list_of_signal_sequences
-    )
+    recent_active = any((i - s.start_index) < MIN_BARS_BETWEEN_SEQS for s in active)
 
-    if not recent_active:
+    if not recent_active and (screen is None or screen.candidate[i]):
         first_func = SIGNALS[0]
         new_seq = SignalSequence(start_index=i, symbol=symbol)
 
         if first_func(data, i, new_seq):
-            new_seq.active = True
-            new_seq.states_dict[first_func] = True
-            list_of_signal_sequences.append(new_seq)
+            registry.add(new_seq)
+            registry.step_done(new_seq, 0)
+            active.append(new_seq)
             print(
                 f"🟢 New SignalSequence started at {data.index[i].date()} | "
                 f"symbol={symbol} | seq={new_seq.id}"
@@ -72,13 +87,10 @@ def check_signal_sequence(data, i, symbol="BTC-USD"):
     # 2️⃣ Advance ALL active sequences (same symbol only)
     #     + KILL SWITCH
     # ----------------------------------------------------------
-    for seq in list_of_signal_sequences:
-        if not seq.active or seq.symbol != symbol:
-            continue
-
+    for seq in active:
         # 🛑 Kill switch
-        if seq.entry_signal_time is None and future_week_sena_below_senb(data, i):
-            seq.active = False
+        if seq.entry_signal_i is None and kill[i]:
+            registry.finish(seq)
             print(
                 f"🛑 Sequence killed (weekly future SenA < SenB) at "
                 f"{data.index[i].date()} | symbol={symbol} | seq={seq.id}"
@@ -86,10 +98,10 @@ def check_signal_sequence(data, i, symbol="BTC-USD"):
             continue
 
         # ▶️ Advance signals IN ORDER
-        for func in SIGNALS:
-            if not seq.states_dict.get(func, False):
+        for k, func in enumerate(SIGNALS):
+            if not seq.fired(k):
                 if func(data, i, seq):
-                    seq.states_dict[func] = True
+                    registry.step_done(seq, k)
                     print(
                         f"✅ {func.__name__} triggered at {data.index[i].date()} | "
                         f"symbol={symbol} | seq={seq.id}"
@@ -99,17 +111,9 @@ def check_signal_sequence(data, i, symbol="BTC-USD"):
     # ----------------------------------------------------------
     # 3️⃣ Check if ANY sequence completed (same symbol)
     # ----------------------------------------------------------
-    winners = [
-        s
-        for s in list_of_signal_sequences
-        if s.active
-        and s.symbol == symbol
-        and all(s.states_dict.get(func, False) for func in SIGNALS)
-    ]
-
-    if winners:
-        winner = winners[0]
+    winner = registry.first_complete(symbol)
 
+    if winner is not None:
         data.at[data.index[i], "gold_star"] = True
         print(
             f"🌟 GOLD STAR at {data.index[i].date()} | "
@@ -117,9 +121,7 @@ def check_signal_sequence(data, i, symbol="BTC-USD"):
         )
 
         # terminate only sequences for THIS symbol
-        for s in list_of_signal_sequences:
-            if s.symbol == symbol:
-                s.active = False
+        registry.finish_symbol(symbol)
 
         return True
 
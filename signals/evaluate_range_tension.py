@@ -3,8 +3,14 @@
 import numpy as np
 import pandas as pd
 from signals.helpers.trend_regression import find_trend_regression
+from indicator_registry import uses
 
+# Tunables (module constants → settable by name, see backtest_runner.apply_strategy)
+MIN_REGLINE_CROSSES = 4
+MIN_EMA_CROSSES = 4
 
+
+@uses("D_Close", "EMA_50")
 def evaluate_range_tension(
     data: pd.DataFrame,
     i: int,
@@ -12,8 +18,8 @@ def evaluate_range_tension(
     price_col: str = "D_Close",
     smooth_col: str = "smooth_s10",
     ema_col: str = "EMA_50",
-    min_regline_crosses: int = 4,
-    min_ema_crosses: int = 4,
+    min_regline_crosses: int | None = None,
+    min_ema_crosses: int | None = None,
 ) -> bool:
     """
     Evaluate whether sufficient range tension has built up
@@ -27,21 +33,28 @@ def evaluate_range_tension(
       - smooth ↔ EMA
 
     No direction, no trigger logic.
+    Thresholds default to MIN_REGLINE_CROSSES / MIN_EMA_CROSSES.
     """
+    if min_regline_crosses is None:
+        min_regline_crosses = MIN_REGLINE_CROSSES
+    if min_ema_crosses is None:
+        min_ema_crosses = MIN_EMA_CROSSES
 
     # --------------------------------------------------
     # 1) Require frozen segment + breakout
     # --------------------------------------------------
-    start_ts = seq.helpers.get("segment_start_ts")
-    end_ts = seq.helpers.get("pivot_break_ts")
+    start_i = seq.segment_start_i
+    end_i = seq.pivot_break_i
 
-    if start_ts is None or end_ts is None:
+    if start_i is None or end_i is None:
         return False
 
-    if start_ts not in data.index or end_ts not in data.index:
+    if start_i >= len(data) or end_i >= len(data):
         return False
 
-    segment = data.loc[start_ts:end_ts]
+    start_ts = data.index[start_i]
+    end_ts = data.index[end_i]
+    segment = data.iloc[start_i : end_i + 1]
 
     if smooth_col not in segment.columns:
         return False
@@ -71,12 +84,12 @@ def evaluate_range_tension(
 
     valid = ~np.isnan(signs[1:]) & ~np.isnan(signs[:-1])
     reg_cross_idx = np.where(valid & (signs[1:] * signs[:-1] < 0))[0] + 1
-    reg_cross_ts = segment.index[reg_cross_idx].tolist()
-    reg_cross_count = len(reg_cross_ts)
+    reg_cross_count = len(reg_cross_idx)
 
     # --------------------------------------------------
     # 3) Smooth ↔ EMA crossings (instrument)
     # --------------------------------------------------
+    ema_cross_idx = np.empty(0, dtype=int)
     ema_cross_count = 0
 
     if ema_col in segment.columns:
@@ -87,26 +100,23 @@ def evaluate_range_tension(
         valid = ~np.isnan(signs[1:]) & ~np.isnan(signs[:-1])
 
         ema_cross_idx = np.where(valid & (signs[1:] * signs[:-1] < 0))[0] + 1
-        ema_cross_ts = segment.index[ema_cross_idx].tolist()
-        ema_cross_count = len(ema_cross_ts)
+        ema_cross_count = len(ema_cross_idx)
 
     # --------------------------------------------------
     # 4) Store tension diagnostics
     # --------------------------------------------------
-    seq.helpers["range_tension_regline_crosses"] = reg_cross_count
-    seq.helpers["range_tension_ema_crosses"] = ema_cross_count
-    seq.helpers["range_tension_regline_cross_ts"] = reg_cross_ts
-    seq.helpers["range_tension_ema_cross_ts"] = ema_cross_ts
-    seq.helpers["range_tension_segment_len"] = len(segment)
-
-    # also store regline geometry for plotting
-    seq.helpers["trend_reg_frozen"] = True
-    seq.helpers["trend_reg_start_ts"] = start_ts
-    seq.helpers["trend_reg_end_ts"] = end_ts
-    seq.helpers["trend_reg_m"] = reg.m
-    seq.helpers["trend_reg_b"] = reg.b
-    seq.helpers["trend_reg_x"] = x
-    seq.helpers["trend_reg_y"] = reg_vals
+    seq.range_tension_regline_crosses = reg_cross_count
+    seq.range_tension_ema_crosses = ema_cross_count
+    seq.regline_cross_i = (reg_cross_idx + start_i).astype(np.int32)
+    seq.ema_cross_i = (ema_cross_idx + start_i).astype(np.int32)
+    seq.range_tension_segment_len = len(segment)
+
+    # also store regline geometry for plotting (points: seq.trend_reg_line())
+    seq.trend_reg_frozen = True
+    seq.trend_reg_start_i = start_i
+    seq.trend_reg_end_i = end_i
+    seq.trend_reg_m = reg.m
+    seq.trend_reg_b = reg.b
 
     # --------------------------------------------------
     # 5) Gate: sufficient tension required
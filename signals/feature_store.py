@@ -0,0 +1,64 @@
+# signals/feature_store.py
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import config
+
+from .helpers.day_to_week import day_to_week_map
+
+# (daily.index, weekly frame, features) for the most recent pairs. Frames are
+# compared by identity (as in day_to_week): config replaces a weekly frame
+# when it changes (pipeline / append_bars), which rebuilds its features.
+_STORES = []
+_MAX_STORES = 16
+
+
+def on_daily(daily_index, weekly, weekly_mask) -> np.ndarray:
+    """
+    Weekly bool array → daily bool array (False where no weekly bar).
+    """
+    positions = day_to_week_map(daily_index, weekly.index)
+    out = np.zeros(len(daily_index), dtype=bool)
+    found = positions >= 0
+    out[found] = weekly_mask[positions[found]]
+    return out
+
+
+def _build_cloud(daily_index, ichimoku) -> SimpleNamespace:
+    sena = ichimoku["W_Senkou_span_A_future"].to_numpy(dtype=float)
+    senb = ichimoku["W_Senkou_span_B_future"].to_numpy(dtype=float)
+    return SimpleNamespace(
+        sena_above_senb=on_daily(daily_index, ichimoku, sena > senb),
+        sena_below_senb=on_daily(daily_index, ichimoku, sena < senb),
+    )
+
+
+def cloud_state(data: pd.DataFrame) -> SimpleNamespace:
+    """
+    Weekly future-cloud state on the daily bars of `data`, read by position:
+
+    - sena_above_senb[i]: future weekly Senkou Span A > Span B
+    - sena_below_senb[i]: future weekly Senkou Span A < Span B
+
+    Both False where the weekly value is missing. Built once per
+    (daily index, config.ichimoku_weekly) and reused for every bar.
+    """
+    ichimoku = getattr(config, "ichimoku_weekly", None)
+    if ichimoku is None:
+        raise RuntimeError(
+            "Weekly cloud requested before weekly Ichimoku exists.\n"
+            "config.ichimoku_weekly must be computed first."
+        )
+
+    daily_index = data.index
+    for d_idx, weekly, features in _STORES:
+        if d_idx is daily_index and weekly is ichimoku:
+            return features
+
+    features = _build_cloud(daily_index, ichimoku)
+    _STORES.append((daily_index, ichimoku, features))
+    if len(_STORES) > _MAX_STORES:
+        _STORES.pop(0)
+    return features
@@ -2,12 +2,18 @@
 
 import pandas as pd
 
+from indicator_registry import uses
 
+# Tunable (module constant → settable by name, see backtest_runner.apply_strategy)
+LOOKBACK_DAYS = 14
+
+
+@uses("D_Close")
 def find_pivotline_cross(
     data: pd.DataFrame,
     i: int,
     seq,
-    lookback_days: int = 14,
+    lookback_days: int | None = None,
 ) -> bool:
     """
     Detect whether DAILY CLOSE crossed ABOVE an EXISTING
@@ -18,18 +24,19 @@ def find_pivotline_cross(
     - close-based cross
     - minimal guards
     """
+    if lookback_days is None:
+        lookback_days = LOOKBACK_DAYS
+
     # --------------------------------------------------
     # 1) Require pivot resistance
     # --------------------------------------------------
-    res_m = seq.helpers.get("pivot_resistance_m")
-    res_b = seq.helpers.get("pivot_resistance_b")
-    pivot_start_ts = seq.helpers.get("pivot_start_ts")
+    res_m = seq.pivot_resistance_m
+    res_b = seq.pivot_resistance_b
+    pivot_start_i = seq.pivot_start_i
 
-    if res_m is None or res_b is None or pivot_start_ts not in data.index:
+    if res_m is None or res_b is None or pivot_start_i is None:
         return False
 
-    pivot_start_i = data.index.get_loc(pivot_start_ts)
-
     # --------------------------------------------------
     # 2) Look back for DAILY CLOSE cross
     # --------------------------------------------------
@@ -59,8 +66,8 @@ def find_pivotline_cross(
             #     print(f"curr pivot y : {curr_res:.2f}")
             #     print("--------------------------------")
 
-            seq.helpers["pivot_break_ts"] = data.index[j]
-            seq.helpers["pivot_break_val"] = curr_close
+            seq.pivot_break_i = j
+            seq.pivot_break_val = curr_close
 
             # print(
             #     f"📍 PIVOT CLOSE CROSS at {data.index[j].date()} | "
@@ -1,27 +1,17 @@
 # signals/helpers/future_check.py
-from .day_to_week import day_to_week
-import config
+from ..feature_store import cloud_state
+from indicator_registry import uses
 
 
+@uses()  # weekly cloud read from config.ichimoku_weekly
 def future_week_sena_above_senb(data, i):
-    weekly = config.ichimoku_weekly
     """
     Returns True if future weekly Senkou Span A > Senkou Span B.
+    Reads the precomputed daily-aligned mask (see signals.feature_store).
     """
-    w_i = day_to_week(data, i, weekly)
-    if w_i is None:
-        return False
-    return (
-        weekly["W_Senkou_span_A_future"].iloc[w_i]
-        > weekly["W_Senkou_span_B_future"].iloc[w_i]
-    )
+    return bool(cloud_state(data).sena_above_senb[i])
 
 
+@uses()
 def future_week_sena_below_senb(data, i):
-    w_i = day_to_week(data, i, config.ichimoku_weekly)
-    if w_i is None:
-        return False
-    return (
-        config.ichimoku_weekly["W_Senkou_span_A_future"].iloc[w_i]
-        < config.ichimoku_weekly["W_Senkou_span_B_future"].iloc[w_i]
-    )
+    return bool(cloud_state(data).sena_below_senb[i])
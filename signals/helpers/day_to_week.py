@@ -1,5 +1,6 @@
 # helpers/day_to_week.py
 
+import numpy as np
 import pandas as pd
 import config
 
@@ -29,6 +30,34 @@ def _infer_weekly_anchor(weekly_index: pd.DatetimeIndex) -> str:
     return WEEKDAY_TO_ANCHOR[weekdays.pop()]
 
 
+# (daily.index, weekly.index, positions) for the most recent pairs.
+# Index objects are compared by identity, so a map is reused for as long as
+# the backtest works on the same frames and rebuilt when they are replaced.
+_MAPS = []
+_MAX_MAPS = 16
+
+
+def day_to_week_map(daily_index: pd.DatetimeIndex, weekly_index) -> np.ndarray:
+    """
+    Int array: weekly row position for every daily row (-1 = no weekly bar).
+    Built once per (daily, weekly) index pair.
+    """
+    for d_idx, w_idx, positions in _MAPS:
+        if d_idx is daily_index and w_idx is weekly_index:
+            return positions
+
+    anchor = _infer_weekly_anchor(weekly_index)
+    w_period = weekly_index.to_period(anchor)
+    d_period = daily_index.to_period(anchor)
+
+    positions = w_period.get_indexer(d_period)
+
+    _MAPS.append((daily_index, weekly_index, positions))
+    if len(_MAPS) > _MAX_MAPS:
+        _MAPS.pop(0)
+    return positions
+
+
 def day_to_week(
     daily: pd.DataFrame,
     i: int,
@@ -40,6 +69,7 @@ def day_to_week(
     - weekly defaults to config.weekly_data
     - anchor auto-inferred from weekly index
     - safe for crypto + stocks + any exchange
+    - O(1): reads the precomputed day_to_week_map
     """
 
     if weekly is None:
@@ -48,12 +78,7 @@ def day_to_week(
     if daily is None or weekly is None:
         return None
 
-    anchor = _infer_weekly_anchor(weekly.index)
-
-    d_period = daily.index[i].to_period(anchor)
-    w_period = weekly.index.to_period(anchor)
-
-    try:
-        return int(w_period.get_loc(d_period))
-    except KeyError:
+    pos = day_to_week_map(daily.index, weekly.index)[i]
+    if pos < 0:
         return None
+    return int(pos)
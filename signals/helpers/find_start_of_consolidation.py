@@ -2,10 +2,14 @@
 
 import pandas as pd
 
+from indicator_registry import uses
+from signals.context import context
+
 SLOPE_COL = "W_Senkou_span_B_slope_pct"
 SLOPE_ABS_THRESHOLD = 2.0  # %
 
 
+@uses(SLOPE_COL)
 def find_start_of_consolidation(data: pd.DataFrame, i: int, seq) -> bool:
     """
     Find and lock the start of a consolidation phase for this SignalSequence.
@@ -17,14 +21,32 @@ def find_start_of_consolidation(data: pd.DataFrame, i: int, seq) -> bool:
     - Fallback: highest D_Close_smooth 3–12 months back
 
     Fires ONCE per sequence and then returns True forever for that seq.
+    The walk only depends on (data, i): it runs once per bar for all
+    sequences (signals.context).
     """
 
     # Already locked for this sequence → advance immediately
-    if getattr(seq, "consolidation_start_index", None) is not None:
+    if seq.consolidation_start_index is not None:
         return True
 
+    fired, start_index = context.memo(
+        data,
+        i,
+        ("consolidation_start", SLOPE_ABS_THRESHOLD),
+        lambda: _consolidation_start(data, i),
+    )
+    if start_index is not None:
+        seq.consolidation_start_index = start_index
+    return fired
+
+
+def _consolidation_start(data: pd.DataFrame, i: int):
+    """
+    (fired, consolidation start position or None) at bar i; marks the
+    start columns of `data`.
+    """
     if i <= 0 or i >= len(data) or SLOPE_COL not in data.columns:
-        return False
+        return False, None
 
     j = i
     candidate_idx = None
@@ -59,9 +81,10 @@ def find_start_of_consolidation(data: pd.DataFrame, i: int, seq) -> bool:
                 seg_start_idx = idx[0]
                 seg_start_time = data.index[seg_start_idx]
                 data.loc[seg_start_time, "W_SenB_Consol_Start_Price"] = True
-                seq.consolidation_start_index = seg_start_idx
+                context.wrote("W_SenB_Consol_Start_Price")
+                return True, seg_start_idx  # ✅ COMMIT
 
-            return True  # ✅ COMMIT
+            return True, None  # ✅ COMMIT
 
         j -= 1
 
@@ -70,7 +93,7 @@ def find_start_of_consolidation(data: pd.DataFrame, i: int, seq) -> bool:
         delta = data.index[i] - candidate_idx
         if pd.Timedelta(weeks=12) <= delta <= pd.Timedelta(weeks=52):
             data.loc[candidate_idx, "W_SenB_Consol_Start_Price"] = True
-            seq.consolidation_start_index = data.index.get_loc(candidate_idx)
-            return True  # ✅ COMMIT
+            context.wrote("W_SenB_Consol_Start_Price")
+            return True, data.index.get_loc(candidate_idx)  # ✅ COMMIT
 
-    return False
+    return False, None
@@ -1,9 +1,22 @@
 # signals/helpers/pivot_line_builder.py
+from types import SimpleNamespace
+
 import numpy as np
 from signals.trendline_maker.trendline_builder import best_pivot_trendline
 
 
 def build_pivot_trendlines(data, start_idx, end_ts, seq):
+    fit = fit_pivot_trendlines(data, start_idx, end_ts)
+    apply_pivot_trendlines(fit, seq)
+    return fit.support, fit.resistance
+
+
+def fit_pivot_trendlines(data, start_idx, end_ts):
+    """
+    Best pivot support / resistance lines of the segment (from the pivot
+    columns of `data`). Sequence-independent; apply_pivot_trendlines
+    stores the result on a sequence.
+    """
     segment = data.loc[start_idx:end_ts]
     y_raw = segment["D_Close"].values
 
@@ -13,8 +26,10 @@ def build_pivot_trendlines(data, start_idx, end_ts, seq):
     pivot_lows = [segment.index.get_loc(ts) for ts in pivot_lows_ts]
     pivot_highs = [segment.index.get_loc(ts) for ts in pivot_highs_ts]
 
-    if pivot_highs_ts:
-        seq.helpers["last_res_pivot_ts"] = pivot_highs_ts[-1]
+    # segment-relative → frame positions
+    offset = data.index.get_loc(segment.index[0]) if len(segment) else 0
+
+    last_res_pivot_i = offset + pivot_highs[-1] if pivot_highs_ts else None
     x_full = np.arange(len(y_raw))
 
     support_line = None
@@ -32,17 +47,26 @@ def build_pivot_trendlines(data, start_idx, end_ts, seq):
         if res_m is not None:
             resistance_line = (res_m, res_b)
 
+    return SimpleNamespace(
+        support=support_line,
+        resistance=resistance_line,
+        last_res_pivot_i=last_res_pivot_i,
+        start_i=offset,
+        end_i=offset + len(segment) - 1,
+    )
+
+
+def apply_pivot_trendlines(fit, seq):
     # ---- store STRUCTURE ----
-    if support_line is not None:
-        seq.helpers["pivot_support_m"], seq.helpers["pivot_support_b"] = support_line
+    if fit.last_res_pivot_i is not None:
+        seq.last_res_pivot_i = fit.last_res_pivot_i
 
-    if resistance_line is not None:
-        seq.helpers["pivot_resistance_m"], seq.helpers["pivot_resistance_b"] = (
-            resistance_line
-        )
+    if fit.support is not None:
+        seq.pivot_support_m, seq.pivot_support_b = fit.support
 
-    if support_line or resistance_line:
-        seq.helpers["pivot_start_ts"] = segment.index[0]
-        seq.helpers["pivot_end_ts"] = segment.index[-1]
+    if fit.resistance is not None:
+        seq.pivot_resistance_m, seq.pivot_resistance_b = fit.resistance
 
-    return support_line, resistance_line
+    if fit.support or fit.resistance:
+        seq.pivot_start_i = fit.start_i
+        seq.pivot_end_i = fit.end_i
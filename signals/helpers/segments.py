@@ -1,6 +1,8 @@
 # signals/helpers/segments.py
 import pandas as pd
 
+from signals.context import context
+
 
 def get_segment_bounds(
     data: pd.DataFrame,
@@ -12,7 +14,19 @@ def get_segment_bounds(
     Returns (start_idx, end_idx) for the consolidation segment.
     start_offset_days lets you begin the segment *before* the actual
     W_SenB_Consol_Start_Price to get more context for pivot + trendline building.
+
+    Memoized per bar (signals.context) until that column is written again.
     """
+    return context.memo(
+        data,
+        i,
+        ("segment_bounds", start_offset_days, end_offset_days),
+        lambda: _segment_bounds(data, i, start_offset_days, end_offset_days),
+        reads=("W_SenB_Consol_Start_Price",),
+    )
+
+
+def _segment_bounds(data, i, start_offset_days, end_offset_days):
 
     # --------------------------------------
     # 1) Find the true consolidation anchor
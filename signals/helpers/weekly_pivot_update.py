@@ -21,6 +21,29 @@ def snap_to_real_extreme(y_raw, idx, window=5, mode="high"):
     return lo + local_idx
 
 
+def segment_pivots(y_raw, snap_window: int = 5):
+    """
+    Pure pivot finder on one price segment (no DataFrame writes).
+
+    Returns (smoothed (σ2, σ5, σ10, σ20), support pivots, resistance
+    pivots); pivots are positions in y_raw, snapped to the real extreme.
+    """
+    smoothed = smooth_series(y_raw)
+    lows5, highs5, _, _ = find_local_extrema_trend_aware(smoothed[1])
+
+    highs = [
+        snap_to_real_extreme(y_raw, idx, window=snap_window, mode="high")
+        for idx in highs5
+        if 0 <= idx < len(y_raw)
+    ]
+    lows = [
+        snap_to_real_extreme(y_raw, idx, window=snap_window, mode="low")
+        for idx in lows5
+        if 0 <= idx < len(y_raw)
+    ]
+    return smoothed, lows, highs
+
+
 def weekly_pivot_update(
     data: pd.DataFrame,
     start_idx,
@@ -38,9 +61,9 @@ def weekly_pivot_update(
     y_raw = segment[price_col].values
 
     # ----------------------------------------------------------
-    # 1) Smooth series
+    # 1) Smooth series + σ5 extrema (snapped to REAL price levels)
     # ----------------------------------------------------------
-    y_s2, y_s5, y_s10, y_s20 = smooth_series(y_raw)
+    (y_s2, y_s5, y_s10, y_s20), lows, highs = segment_pivots(y_raw, snap_window)
 
     data.loc[start_idx:end_idx, "smooth_s2"] = y_s2
     data.loc[start_idx:end_idx, "smooth_s5"] = y_s5
@@ -49,33 +72,20 @@ def weekly_pivot_update(
     data.loc[start_idx:end_idx, "smooth_s20"] = y_s20
 
     # ----------------------------------------------------------
-    # 2) σ5 extrema detection ONLY
-    # ----------------------------------------------------------
-    lows5, highs5, _, _ = find_local_extrema_trend_aware(y_s5)
-
-    # ----------------------------------------------------------
-    # 3) Clear pivot columns
+    # 2) Clear pivot columns
     # ----------------------------------------------------------
     data.loc[start_idx:end_idx, "pivot_resistance_price"] = np.nan
     data.loc[start_idx:end_idx, "pivot_support_price"] = np.nan
 
     # ----------------------------------------------------------
-    # 4) Insert snapped σ5 pivots (REAL price levels)
+    # 3) Insert pivots
     # ----------------------------------------------------------
-    for idx in highs5:
-        if 0 <= idx < len(segment):
-            snapped_idx = snap_to_real_extreme(
-                y_raw, idx, window=snap_window, mode="high"
-            )
-            real_ts = segment.index[snapped_idx]
-            data.at[real_ts, "pivot_resistance_price"] = y_raw[snapped_idx]
-
-    for idx in lows5:
-        if 0 <= idx < len(segment):
-            snapped_idx = snap_to_real_extreme(
-                y_raw, idx, window=snap_window, mode="low"
-            )
-            real_ts = segment.index[snapped_idx]
-            data.at[real_ts, "pivot_support_price"] = y_raw[snapped_idx]
+    for snapped_idx in highs:
+        real_ts = segment.index[snapped_idx]
+        data.at[real_ts, "pivot_resistance_price"] = y_raw[snapped_idx]
+
+    for snapped_idx in lows:
+        real_ts = segment.index[snapped_idx]
+        data.at[real_ts, "pivot_support_price"] = y_raw[snapped_idx]
 
     return data
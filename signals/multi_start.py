@@ -0,0 +1,243 @@
+# signals/multi_start.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from signals.SignalSequence import SignalSequence
+from signals.helpers.weekly_pivot_update import segment_pivots
+from signals.trendline_maker.trendline_builder import best_pivot_trendline
+
+# start shifts (bars) around the consolidation anchor: ±4 weeks in weekly steps
+START_OFFSETS = tuple(range(-28, 29, 7))
+MIN_SEGMENT_BARS = 20  # a start closer than this to the end is dropped
+# two lines are the same candidate if they stay within CLUSTER_TOL × price std
+# (of the shared range) at both ends of the range
+CLUSTER_TOL = 0.05
+
+# shared range of the current exploration (set once per worker process)
+_SHARED = None
+
+
+# =========================
+# Shared range (start-independent work)
+# =========================
+def shared_pivots(y_raw, snap_window=5):
+    """
+    Smoothing + σ5 pivots once over the union of all starts; every start
+    uses the pivots inside its own segment.
+    """
+    _, lows, highs = segment_pivots(y_raw, snap_window)
+    return (
+        np.array(sorted(set(lows)), dtype=int),
+        np.array(sorted(set(highs)), dtype=int),
+    )
+
+
+def _init_worker(y_raw, lows, highs):
+    global _SHARED
+    _SHARED = (y_raw, lows, highs)
+
+
+# =========================
+# One start (runs inside a worker process)
+# =========================
+def _fit_start(s):
+    """
+    Best support / resistance line of the segment [s, end] of the shared
+    range, as build_pivot_trendlines fits it (segment-local x).
+
+    Returns {"support" / "resistance": (m, b, pivot A, pivot B) or None},
+    pivots as positions in the shared range.
+    """
+    y_raw, lows, highs = _SHARED
+    y = y_raw[s:]
+    x = np.arange(len(y))
+
+    lines = {}
+    for kind, pivots, support in (
+        ("support", lows, True),
+        ("resistance", highs, False),
+    ):
+        rel = pivots[pivots >= s] - s
+        line = None
+        if len(rel) >= 2:
+            m, b, a, b_pivot, *_ = best_pivot_trendline(x, y, rel, support=support)
+            if m is not None:
+                line = (m, b, s + int(a), s + int(b_pivot))
+        lines[kind] = line
+    return lines
+
+
+# =========================
+# Consensus
+# =========================
+def cluster_lines(lines, n_bars, tol):
+    """
+    Greedy clustering of lines fitted from different starts.
+
+    lines: [(start, m, b, pivot A, pivot B)] in shared-range positions, with
+    x = 0 at `start`. Lines are compared at the first and last bar of the
+    shared range; the first member of a cluster is its representative.
+    Returns [[line, ...], ...] in order of first appearance.
+    """
+    clusters = []
+    ends = np.array([0, n_bars - 1])
+    for line in lines:
+        start, m, b = line[:3]
+        y = m * (ends - start) + b
+        for cluster in clusters:
+            r_start, r_m, r_b = cluster[0][:3]
+            if np.all(np.abs(y - (r_m * (ends - r_start) + r_b)) <= tol):
+                cluster.append(line)
+                break
+        else:
+            clusters.append([line])
+    return clusters
+
+
+# =========================
+# Explorer
+# =========================
+def _starts(anchor_i, end_i, offsets):
+    starts = sorted({max(0, anchor_i + off) for off in offsets})
+    return [s for s in starts if end_i - s + 1 >= MIN_SEGMENT_BARS]
+
+
+def explore_anchor(
+    data: pd.DataFrame,
+    anchor_i: int,
+    end_i: int,
+    offsets=None,
+    symbol=None,
+    price_col: str = "D_Close",
+    max_workers=1,
+):
+    """
+    Multi-start trendline search around one consolidation anchor
+    (Intent.md §3).
+
+    One sequence per start (anchor_i + offset for offset in START_OFFSETS,
+    ending at end_i) fits its best pivot support / resistance line. The
+    starts run in a worker pool (max_workers=None → all cores, 1 → in
+    this process); smoothing and pivots of the shared range are computed
+    once and sent to each worker at startup.
+
+    Lines that recur across starts are clustered into candidates; their
+    consensus is the share of starts that found them.
+
+    Returns SimpleNamespace:
+    - candidates: one row per (kind, candidate line), best consensus first;
+      slope / value at end_i / anchor pivots in frame positions
+    - sequences: one SignalSequence per start with its pivot lines
+      (plottable with plot_sequences.plot_signal_sequences)
+    - seconds
+    """
+    t0 = time.perf_counter()
+    if offsets is None:
+        offsets = START_OFFSETS
+    starts = _starts(anchor_i, end_i, offsets)
+    if not starts:
+        return SimpleNamespace(candidates=pd.DataFrame(), sequences=[], seconds=0.0)
+
+    lo = starts[0]
+    y_raw = data[price_col].values[lo : end_i + 1].astype(float)
+    lows, highs = shared_pivots(y_raw)
+    local = [s - lo for s in starts]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(starts)))
+    if max_workers == 1:
+        _init_worker(y_raw, lows, highs)
+        fits = [_fit_start(s) for s in local]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(y_raw, lows, highs),
+        ) as ex:
+            fits = list(ex.map(_fit_start, local))
+
+    # --- one sequence per start ---
+    sequences = []
+    for s, fit in zip(local, fits):
+        seq = SignalSequence(start_index=lo + s, symbol=symbol)
+        seq.segment_start_i = lo + s
+        if fit["support"] is not None:
+            seq.pivot_support_m, seq.pivot_support_b = fit["support"][:2]
+        if fit["resistance"] is not None:
+            seq.pivot_resistance_m, seq.pivot_resistance_b = fit["resistance"][:2]
+        if fit["support"] or fit["resistance"]:
+            seq.pivot_start_i = lo + s
+            seq.pivot_end_i = end_i
+        sequences.append(seq)
+
+    # --- consensus per candidate line ---
+    tol = CLUSTER_TOL * float(np.nanstd(y_raw))
+    rows = []
+    for kind in ("support", "resistance"):
+        lines = [(s, *fit[kind]) for s, fit in zip(local, fits) if fit[kind]]
+        for cluster in cluster_lines(lines, len(y_raw), tol):
+            start, m, b, a, b_pivot = cluster[0]
+            rows.append(
+                {
+                    "kind": kind,
+                    "consensus": len(cluster) / len(starts),
+                    "starts": len(cluster),
+                    "slope": m,
+                    "value_at_end": m * (len(y_raw) - 1 - start) + b,
+                    "pivot_a": lo + a,
+                    "pivot_b": lo + b_pivot,
+                    "start_offsets": [lo + line[0] - anchor_i for line in cluster],
+                }
+            )
+
+    candidates = pd.DataFrame(rows)
+    if not candidates.empty:
+        candidates = candidates.sort_values(
+            ["kind", "consensus"], ascending=[True, False], kind="stable"
+        ).reset_index(drop=True)
+
+    return SimpleNamespace(
+        candidates=candidates,
+        sequences=sequences,
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def explore_sequence(data: pd.DataFrame, seq, i: int, **kwargs):
+    """
+    explore_anchor around the consolidation start of `seq`, up to bar i.
+    None if the sequence has no consolidation start yet.
+    """
+    if seq.consolidation_start_index is None:
+        return None
+    return explore_anchor(
+        data, seq.consolidation_start_index, i, symbol=seq.symbol, **kwargs
+    )
+
+
+if __name__ == "__main__":
+    from backtest import backtest_columns, run_backtest
+    from get_data import DEFAULT_SYMBOL
+    from pipeline import prepare_data
+    import signals.core as core
+
+    data = prepare_data(DEFAULT_SYMBOL, columns=backtest_columns())
+    data, *_ = run_backtest(data)
+    for seq in core.list_of_signal_sequences:
+        if seq.pivot_break_i is None:
+            continue
+        result = explore_sequence(data, seq, seq.pivot_break_i, max_workers=None)
+        if result is None:
+            continue
+        print(
+            f"\n🧭 seq={seq.id} anchor={data.index[seq.consolidation_start_index].date()} "
+            f"break={data.index[seq.pivot_break_i].date()} ({result.seconds:.2f}s)"
+        )
+        print(result.candidates.drop(columns="start_offsets").round(3).to_string())
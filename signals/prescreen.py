@@ -0,0 +1,61 @@
+# signals/prescreen.py
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import config
+
+from . import senb_w_future_flat_base as flat_base
+from .feature_store import cloud_state, on_daily
+
+
+def _flat_base_weeks(senb_future: np.ndarray, weeks: int) -> np.ndarray:
+    """
+    mask[w]: the `weeks` values before w (w-weeks .. w-1) exist, are not NaN
+    and are all equal.
+    """
+    n = len(senb_future)
+    mask = np.zeros(n, dtype=bool)
+    if n <= weeks:
+        return mask
+
+    # change[k]: value k differs from value k-1 (NaN never equals anything)
+    change = np.ones(n, dtype=bool)
+    change[1:] = ~(senb_future[1:] == senb_future[:-1])
+    broken = np.cumsum(change | np.isnan(senb_future))
+
+    # window [w-weeks, w-1] is flat ⇔ no change inside it after its first value
+    w = np.arange(weeks, n + 1)
+    flat = broken[w - 1] == broken[w - weeks]
+    flat &= ~np.isnan(senb_future[w - weeks])
+    mask[w[w < n]] = flat[w < n]
+    return mask
+
+
+def prescreen(data: pd.DataFrame) -> SimpleNamespace:
+    """
+    Whole-history masks for the backtest loop, from the weekly cloud:
+
+    - candidate[i]: senb_w_future_flat_base can fire at bar i
+      (future SenA > SenB and a perfectly flat future SenB over the last
+      senb_w_future_flat_base.FLAT_BASE_WEEKS weeks).
+      Where it is False, no new sequence can start.
+    - kill[i]: future weekly SenA < SenB (the kill switch)
+
+    The cloud masks come from signals.feature_store; the flat-base mask
+    repeats senb_w_future_flat_base (same FLAT_BASE_WEEKS, read at call
+    time so a strategy override applies to both), which stays the reference.
+    """
+    cloud = cloud_state(data)
+    senb = config.ichimoku_weekly["W_Senkou_span_B_future"].to_numpy(dtype=float)
+
+    # senb_w_future_flat_base positions weeks on config.weekly_data
+    flat = _flat_base_weeks(senb, flat_base.FLAT_BASE_WEEKS)
+    weekly = config.weekly_data
+    flat = np.concatenate([flat, np.zeros(max(0, len(weekly) - len(flat)), bool)])
+    flat = on_daily(data.index, weekly, flat[: len(weekly)])
+
+    return SimpleNamespace(
+        candidate=cloud.sena_above_senb & flat, kill=cloud.sena_below_senb
+    )
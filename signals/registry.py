@@ -0,0 +1,80 @@
+# signals/registry.py
+
+
+class SequenceRegistry:
+    """
+    Index over the SignalSequences of all symbols.
+
+    - all:      every sequence ever created, in creation order
+                (the list plotting / reports read)
+    - active:   symbol → live sequences (insertion-ordered dict used as a set)
+    - archive:  symbol → finished sequences (killed, completed, terminated)
+    - complete: symbol → active sequences whose every signal has fired
+                (progress bitmask == all bits set, see SignalSequence)
+
+    Per-bar work only touches the active sequences of one symbol, so it does
+    not grow with history length or with the number of symbols.
+    """
+
+    def __init__(self, n_steps, sequences=None):
+        self.done_mask = (1 << n_steps) - 1
+        self.all = sequences if sequences is not None else []
+        self.active = {}
+        self.archive = {}
+        self.complete = {}
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def add(self, seq):
+        seq.active = True
+        self.all.append(seq)
+        self.active.setdefault(seq.symbol, {})[seq] = None
+
+    def step_done(self, seq, k):
+        """
+        Record that signal k (position in SIGNALS) fired for `seq`.
+        """
+        seq.mark(k)
+        if seq.progress == self.done_mask:
+            self.complete.setdefault(seq.symbol, {})[seq] = None
+
+    def finish(self, seq):
+        """
+        Deactivate `seq` and move it to the archive.
+        """
+        seq.active = False
+        self.active.get(seq.symbol, {}).pop(seq, None)
+        self.complete.get(seq.symbol, {}).pop(seq, None)
+        self.archive.setdefault(seq.symbol, []).append(seq)
+
+    def finish_symbol(self, symbol):
+        for seq in list(self.active.get(symbol, ())):
+            self.finish(seq)
+
+    def clear(self):
+        # in place: other modules hold a reference to `all`
+        self.all.clear()
+        self.active.clear()
+        self.archive.clear()
+        self.complete.clear()
+
+    # =========================
+    # Queries
+    # =========================
+    def active_for(self, symbol):
+        """
+        Live sequences of `symbol` in creation order (a snapshot: safe to
+        finish sequences while iterating).
+        """
+        return list(self.active.get(symbol, ()))
+
+    def has_active(self, symbol) -> bool:
+        return bool(self.active.get(symbol))
+
+    def first_complete(self, symbol):
+        """
+        Oldest active sequence of `symbol` with every signal fired, or None.
+        """
+        done = self.complete.get(symbol)
+        return next(iter(done)) if done else None
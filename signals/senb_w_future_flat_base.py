@@ -4,26 +4,33 @@ from .helpers.cloud_future_check import future_week_sena_above_senb
 import config
 import pandas as pd
 
+from indicator_registry import uses
 
+# Tunable (module constant → settable by name; signals.prescreen reads it too)
+FLAT_BASE_WEEKS = 8
+
+
+@uses()  # weekly cloud read from config.ichimoku_weekly
 def senb_w_future_flat_base(data: pd.DataFrame, i: int, seq) -> bool:
     if not future_week_sena_above_senb(data, i):
         return False
 
     w_pos = day_to_week(data, i)
-    if w_pos is None or w_pos < 8:
+    weeks = FLAT_BASE_WEEKS
+    if w_pos is None or w_pos < weeks:
         return False
 
     w = config.ichimoku_weekly
     series = w["W_Senkou_span_B_future"]
 
-    # start of rise after a perfectly flat 8-week base
+    # start of rise after a perfectly flat `weeks`-week base
     # prev_val = series.iloc[w_pos - 1]
     # curr_val = series.iloc[w_pos]
     # if pd.isna(prev_val) or pd.isna(curr_val) or not (curr_val > prev_val):
     #     return False
 
-    seg = series.iloc[w_pos - 8 : w_pos]  # 8 values: [w_pos-8, ..., w_pos-1]
-    if len(seg) != 8 or seg.isna().any() or seg.nunique() != 1:
+    seg = series.iloc[w_pos - weeks : w_pos]  # [w_pos-weeks, ..., w_pos-1]
+    if len(seg) != weeks or seg.isna().any() or seg.nunique() != 1:
         return False
 
     base_val = float(seg.iloc[-1])  # flat base value (week just before the rise)
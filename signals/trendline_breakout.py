@@ -5,10 +5,33 @@ import pandas as pd
 
 from signals.helpers.segments import get_segment_bounds
 from signals.helpers.weekly_pivot_update import weekly_pivot_update
-from signals.helpers.pivot_line_builder import build_pivot_trendlines
+from signals.helpers.pivot_line_builder import (
+    apply_pivot_trendlines,
+    fit_pivot_trendlines,
+)
 from signals.helpers.trend_regression import find_trend_regression
+from indicator_registry import uses
+from signals.context import context
 
+# columns of `data` written by weekly_pivot_update
+PIVOT_COLUMNS = (
+    "smooth_s2",
+    "smooth_s5",
+    "smooth_s10",
+    "smooth_s20",
+    "pivot_resistance_price",
+    "pivot_support_price",
+)
 
+
+def _weekly_pivot_lines(data, start_idx, end_ts):
+    data = weekly_pivot_update(data, start_idx, end_ts)
+    for column in PIVOT_COLUMNS:
+        context.wrote(column)
+    return fit_pivot_trendlines(data, start_idx, end_ts)
+
+
+@uses("D_Close")
 def trendline_breakout(data: pd.DataFrame, i: int, seq) -> bool:
     """
     Detect breakout via dominant pivot resistance line.
@@ -34,21 +57,31 @@ def trendline_breakout(data: pd.DataFrame, i: int, seq) -> bool:
     # --------------------------------------------------
     # 2) Weekly pivot STRUCTURE update (authority)
     # --------------------------------------------------
+    # (same segment for every sequence on this bar → once per bar)
+    # A hit skips weekly_pivot_update: the key fixes the segment and the bar
+    # its end, and any other segment's update of the pivot columns drops the
+    # entry, so the skipped writes would only repeat the values in place.
     if i % 7 == 0:
-        data = weekly_pivot_update(data, start_idx, end_ts)
+        fit = context.memo(
+            data,
+            i,
+            ("pivot_lines", start_idx),
+            lambda: _weekly_pivot_lines(data, start_idx, end_ts),
+            reads=PIVOT_COLUMNS,
+        )
         # seq.helpers["pivot_state"] = weekly_pivot_update(
         #     data,
         #     seq.helpers["segment_start_ts"],
         #     end_ts,
         # )
-        build_pivot_trendlines(data, start_idx, end_ts, seq)
+        apply_pivot_trendlines(fit, seq)
 
     # --------------------------------------------------
     # 3) Dominant resistance
     # --------------------------------------------------
 
-    res_m = seq.helpers.get("pivot_resistance_m")
-    res_b = seq.helpers.get("pivot_resistance_b")
+    res_m = seq.pivot_resistance_m
+    res_b = seq.pivot_resistance_b
     if res_m is None:
         ts = data.index[i]
 
@@ -73,8 +106,8 @@ def trendline_breakout(data: pd.DataFrame, i: int, seq) -> bool:
     # --------------------------------------------------
     #
     if curr_val > resistance_val:
-        if seq.helpers.get("segment_start_ts") is None:
-            seq.helpers["segment_start_ts"] = start_idx
+        if seq.segment_start_i is None and start_idx is not None:
+            seq.segment_start_i = data.index.get_loc(start_idx)
         return True
 
     return False
@@ -1,9 +1,10 @@
 # trendline_maker/get_data.py
 
 import pandas as pd
-import yfinance as yf
 from datetime import datetime
 
+from get_data import fetch_daily_data
+
 
 def load_csv_from_drive(file_id):
     """Load CSV from Google Drive file ID."""
@@ -16,9 +17,26 @@ def load_csv_from_drive(file_id):
     return df
 
 
+def auto_adjust(df):
+    """
+    Split- and dividend-adjusted OHLC from Adj Close (what
+    yf.Ticker().history() returns), as the trendlines were tuned on it.
+    """
+    if "Adj Close" not in df.columns:
+        return df
+    df = df.copy()
+    factor = df["Adj Close"] / df["Close"]
+    for col in ("Open", "High", "Low", "Close"):
+        df[col] = df[col] * factor
+    return df.drop(columns="Adj Close")
+
+
 def load_yf(symbol, start, end):
-    """Load OHLC data from Yahoo Finance."""
-    df = yf.Ticker(symbol).history(interval="1d", prepost=False, start=start, end=end)
+    """
+    Load adjusted OHLC data from Yahoo Finance (through the shared daily
+    cache, which stores unadjusted prices + Adj Close).
+    """
+    df = auto_adjust(fetch_daily_data(symbol, start=start, end=end, interval="1d"))
     df["time"] = df.index
     df["time_str"] = df["time"].dt.strftime("%Y-%m-%d")
     df["loc_index"] = range(len(df))
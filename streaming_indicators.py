@@ -0,0 +1,684 @@
+# streaming_indicators.py
+
+"""
+Incremental (O(1) per bar) versions of the indicators in calc_indicators.py
+and the Donchian channels in align_data_time.py.
+
+- update(bar) takes ONE bar (dict with prefixed OHLC keys, e.g. "D_Close")
+  and returns {column: value} with the same column names as the batch functions.
+- state() returns plain JSON-serializable data; restore(state) rebuilds the
+  object, so a daily scanner can resume without replaying decades of bars.
+- EWM-based columns (EMA, Wilder ATR) are bit-identical to the batch ones;
+  rolling-window columns (Bollinger, HMA, SMA ATR) keep running sums and
+  match them up to float rounding.
+
+Forward-shifted Ichimoku columns follow the extended-index convention used
+by the pipeline (compute_ichimoku on a frame extended with future rows):
+*_future columns are known at the current bar, Chikou is not (see
+StreamingIchimoku.last_chikou).
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+NAN = float("nan")
+
+
+def _isnan(x):
+    return x is None or x != x
+
+
+# =========================
+# Base
+# =========================
+class StreamingIndicator(ABC):
+    kind = "base"
+
+    @abstractmethod
+    def update(self, bar: dict) -> dict: ...
+
+    @abstractmethod
+    def state(self) -> dict: ...
+
+    @classmethod
+    @abstractmethod
+    def from_state(cls, state: dict): ...
+
+
+# =========================
+# Building blocks
+# =========================
+class _EWM:
+    """
+    Exact port of pandas ewm(alpha=..., adjust=False).mean() recursion,
+    so streaming values are bit-identical to the batch ones.
+    """
+
+    def __init__(self, alpha, weighted=NAN, old_wt=1.0):
+        self.alpha = alpha
+        self.weighted = weighted
+        self.old_wt = old_wt
+
+    def update(self, cur):
+        if _isnan(self.weighted):
+            if not _isnan(cur):
+                self.weighted = cur
+            return self.weighted
+
+        self.old_wt *= 1.0 - self.alpha
+        if not _isnan(cur):
+            if self.weighted != cur:
+                self.weighted = self.old_wt * self.weighted + self.alpha * cur
+                self.weighted /= self.old_wt + self.alpha
+            self.old_wt = 1.0
+        return self.weighted
+
+    def state(self):
+        return [self.alpha, self.weighted, self.old_wt]
+
+
+class _RollingExtreme:
+    """
+    Monotonic deque rolling max (or min) over the last `window` bars.
+    NaN anywhere in the window → NaN (same as pandas rolling(window).max()).
+    """
+
+    def __init__(self, window, mode="max", t=0, last_nan=-(10**9), items=None):
+        self.window = window
+        self.mode = mode
+        self.t = t
+        self.last_nan = last_nan
+        self.items = deque(tuple(x) for x in (items or []))
+
+    def update(self, x):
+        t = self.t
+        self.t += 1
+
+        if _isnan(x):
+            self.last_nan = t
+        else:
+            # drop values that can never be the extreme again
+            if self.mode == "max":
+                while self.items and x >= self.items[-1][1]:
+                    self.items.pop()
+            else:
+                while self.items and x <= self.items[-1][1]:
+                    self.items.pop()
+            self.items.append((t, x))
+
+        while self.items and self.items[0][0] <= t - self.window:
+            self.items.popleft()
+
+        if t + 1 < self.window or self.last_nan > t - self.window:
+            return NAN
+        return self.items[0][1]
+
+    def state(self):
+        return [
+            self.window,
+            self.mode,
+            self.t,
+            self.last_nan,
+            [list(x) for x in self.items],
+        ]
+
+
+class _RollingStats:
+    """
+    Rolling mean / sample variance over the last `window` bars, updated in
+    O(1) (Welford add / remove). NaN anywhere in the window → NaN, as with
+    pandas rolling(window). Only the window values are serialized; the
+    running sums are rebuilt from them on restore.
+    """
+
+    def __init__(self, window, items=()):
+        self.window = window
+        self.items = deque(maxlen=window)
+        self.n = 0
+        self.nans = 0
+        self.avg = 0.0
+        self.m2 = 0.0
+        for x in items:
+            self.update(x)
+
+    def _add(self, x):
+        if _isnan(x):
+            self.nans += 1
+            return
+        self.n += 1
+        delta = x - self.avg
+        self.avg += delta / self.n
+        self.m2 += delta * (x - self.avg)
+
+    def _remove(self, x):
+        if _isnan(x):
+            self.nans -= 1
+            return
+        self.n -= 1
+        if self.n == 0:
+            self.avg = self.m2 = 0.0
+            return
+        delta = x - self.avg
+        self.avg -= delta / self.n
+        self.m2 -= delta * (x - self.avg)
+
+    def update(self, x):
+        if len(self.items) == self.window:
+            self._remove(self.items[0])
+        self.items.append(x)
+        self._add(x)
+
+    def ready(self):
+        return len(self.items) == self.window and not self.nans
+
+    def mean(self):
+        return self.avg if self.ready() else NAN
+
+    def std(self):
+        if not self.ready() or self.window < 2:
+            return NAN
+        return max(self.m2, 0.0) ** 0.5 / (self.window - 1) ** 0.5
+
+    def state(self):
+        return list(self.items)
+
+
+class _RollingWMA:
+    """
+    Linearly weighted moving average (weights 1..window, newest heaviest)
+    updated in O(1): with S = sum of the window and N = sum of k * x_k,
+    a new bar x gives N' = N + window * x - S and S' = S + x - x_oldest.
+    NaN anywhere in the window → NaN.
+    """
+
+    def __init__(self, window, items=()):
+        self.window = window
+        self.denom = window * (window + 1) / 2
+        self.items = deque(maxlen=window)
+        self.total = 0.0
+        self.numer = 0.0
+        self.nans = 0
+        for x in items:
+            self.update(x)
+
+    def update(self, x):
+        nan = _isnan(x)
+        value = 0.0 if nan else x
+
+        # N uses the full previous window (the oldest bar's weight 1 drops out)
+        self.numer += self.window * value - self.total
+        if len(self.items) == self.window:
+            old = self.items[0]
+            if _isnan(old):
+                self.nans -= 1
+            else:
+                self.total -= old
+        self.items.append(x)
+        self.total += value
+        self.nans += nan
+
+        if len(self.items) < self.window or self.nans:
+            return NAN
+        return self.numer / self.denom
+
+    def state(self):
+        return list(self.items)
+
+
+# =========================
+# EMA
+# =========================
+class StreamingEMA(StreamingIndicator):
+    """Same as compute_ema(data, period, column)."""
+
+    kind = "ema"
+
+    def __init__(self, period=200, column="D_Close", name=None, _ewm=None):
+        self.period = period
+        self.column = column
+        self.name = name or f"EMA_{period}"
+        self.ewm = _EWM(*_ewm) if _ewm else _EWM(2.0 / (period + 1.0))
+
+    def update(self, bar):
+        return {self.name: self.ewm.update(bar[self.column])}
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "period": self.period,
+            "column": self.column,
+            "name": self.name,
+            "_ewm": self.ewm.state(),
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["period"], s["column"], s["name"], _ewm=s["_ewm"])
+
+
+# =========================
+# Ichimoku
+# =========================
+class StreamingIchimoku(StreamingIndicator):
+    """
+    Same columns as compute_ichimoku(data, prefix).
+
+    Chikou_span at bar t is Close[t + shift]: unknown at the live edge (NaN,
+    as in the batch frame). After each update, `last_chikou` holds the
+    Chikou value for the bar `shift` bars back (= the current close).
+    """
+
+    kind = "ichimoku"
+
+    def __init__(self, prefix="D_", tenkan=9, kijun=26, senkou_b=52, shift=26, _s=None):
+        self.prefix = prefix
+        self.tenkan, self.kijun, self.senkou_b, self.shift = (
+            tenkan,
+            kijun,
+            senkou_b,
+            shift,
+        )
+        self.last_chikou = NAN
+
+        if _s is None:
+            self.ext = {
+                w: (_RollingExtreme(w, "max"), _RollingExtreme(w, "min"))
+                for w in (tenkan, kijun, senkou_b)
+            }
+            self.raw_a = deque(maxlen=shift)
+            self.raw_b = deque(maxlen=shift)
+        else:
+            self.ext = {
+                int(w): (_RollingExtreme(*hi), _RollingExtreme(*lo))
+                for w, (hi, lo) in _s["ext"].items()
+            }
+            self.raw_a = deque(_s["raw_a"], maxlen=shift)
+            self.raw_b = deque(_s["raw_b"], maxlen=shift)
+
+    def _mid(self, w, high, low):
+        hi, lo = self.ext[w]
+        return (hi.update(high) + lo.update(low)) / 2
+
+    def update(self, bar):
+        p = self.prefix
+        high, low = bar[f"{p}High"], bar[f"{p}Low"]
+
+        # windows can coincide (e.g. sweeps) → update each extreme once
+        mids = {w: self._mid(w, high, low) for w in self.ext}
+        tenkan = mids[self.tenkan]
+        kijun = mids[self.kijun]
+        raw_a = (tenkan + kijun) / 2
+        raw_b = mids[self.senkou_b]
+
+        span_a = self.raw_a[0] if len(self.raw_a) == self.shift else NAN
+        span_b = self.raw_b[0] if len(self.raw_b) == self.shift else NAN
+        self.raw_a.append(raw_a)
+        self.raw_b.append(raw_b)
+        self.last_chikou = bar[f"{p}Close"]
+
+        return {
+            f"{p}Tenkan_sen": tenkan,
+            f"{p}Kijun_sen": kijun,
+            f"{p}Senkou_span_A": span_a,
+            f"{p}Senkou_span_B": span_b,
+            f"{p}Chikou_span": NAN,
+            f"{p}Senkou_span_A_future": raw_a,
+            f"{p}Senkou_span_B_future": raw_b,
+        }
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "prefix": self.prefix,
+            "periods": [self.tenkan, self.kijun, self.senkou_b, self.shift],
+            "_s": {
+                "ext": {
+                    str(w): [hi.state(), lo.state()] for w, (hi, lo) in self.ext.items()
+                },
+                "raw_a": list(self.raw_a),
+                "raw_b": list(self.raw_b),
+            },
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["prefix"], *s["periods"], _s=s["_s"])
+
+
+# =========================
+# Bollinger Bands
+# =========================
+class StreamingBollinger(StreamingIndicator):
+    """Same columns as compute_bollinger_bands(data, period, std_dev, prefix)."""
+
+    kind = "bollinger"
+
+    def __init__(self, period=20, std_dev=2, prefix="D_", window=None):
+        self.period = period
+        self.std_dev = std_dev
+        self.prefix = prefix
+        self.window = _RollingStats(period, window or [])
+
+    def update(self, bar):
+        p, n = self.prefix, self.period
+        self.window.update(bar[f"{p}Close"])
+        ma = self.window.mean()
+        std = self.window.std()
+
+        upper = ma + self.std_dev * std
+        lower = ma - self.std_dev * std
+        return {
+            f"{p}BB_Middle_{n}": ma,
+            f"{p}BB_Upper_{n}": upper,
+            f"{p}BB_Lower_{n}": lower,
+            f"{p}BB_Width_{n}": upper - lower,
+        }
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "period": self.period,
+            "std_dev": self.std_dev,
+            "prefix": self.prefix,
+            "window": self.window.state(),
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["period"], s["std_dev"], s["prefix"], s["window"])
+
+
+# =========================
+# ATR (relative, %)
+# =========================
+class StreamingATR(StreamingIndicator):
+    """Same columns as compute_ATR(data, periods, prefix, wilder)."""
+
+    kind = "atr"
+
+    def __init__(self, periods=(14,), prefix="D_", wilder=True, _s=None):
+        self.periods = [periods] if isinstance(periods, int) else list(periods)
+        self.prefix = prefix
+        self.wilder = wilder
+
+        _s = _s or {}
+        self.prev_close = _s.get("prev_close", NAN)
+        self.ewm = {
+            p: _EWM(*_s["ewm"][str(p)]) if _s else _EWM(1.0 / p) for p in self.periods
+        }
+        self.tr_window = {
+            p: _RollingStats(p, _s["tr_window"][str(p)] if _s else [])
+            for p in self.periods
+        }
+
+    def update(self, bar):
+        pre = self.prefix
+        high, low, close = bar[f"{pre}High"], bar[f"{pre}Low"], bar[f"{pre}Close"]
+
+        # pandas max(axis=1) skips NaN (first bar has no previous close)
+        candidates = [
+            abs(high - low),
+            abs(high - self.prev_close),
+            abs(low - self.prev_close),
+        ]
+        candidates = [c for c in candidates if not _isnan(c)]
+        tr = max(candidates) if candidates else NAN
+        self.prev_close = close
+
+        out = {}
+        for p in self.periods:
+            if self.wilder:
+                raw_atr = self.ewm[p].update(tr)
+            else:
+                win = self.tr_window[p]
+                win.update(tr)
+                raw_atr = win.mean()
+            out[f"{pre}ATR_{p}"] = 100.0 * raw_atr / close
+        return out
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "periods": self.periods,
+            "prefix": self.prefix,
+            "wilder": self.wilder,
+            "_s": {
+                "prev_close": self.prev_close,
+                "ewm": {str(p): e.state() for p, e in self.ewm.items()},
+                "tr_window": {str(p): w.state() for p, w in self.tr_window.items()},
+            },
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["periods"], s["prefix"], s["wilder"], _s=s["_s"])
+
+
+# =========================
+# HMA
+# =========================
+class StreamingHMA(StreamingIndicator):
+    """Same columns as compute_HMA(data, periods, prefix)."""
+
+    kind = "hma"
+
+    def __init__(self, periods=(14, 25, 50, 100), prefix="D_", _s=None):
+        self.periods = list(periods)
+        self.prefix = prefix
+        closes = _s["closes"] if _s else []
+
+        # WMAs of close are shared between periods (as in compute_HMA_values)
+        lengths = {max(1, p // 2) for p in self.periods} | set(self.periods)
+        self.wma_close = {n: _RollingWMA(n, closes[-n:]) for n in sorted(lengths)}
+        self.raw = {
+            p: _RollingWMA(max(1, int(p**0.5)), _s["raw"][str(p)] if _s else [])
+            for p in self.periods
+        }
+
+    def update(self, bar):
+        close = bar[f"{self.prefix}Close"]
+        wma = {n: w.update(close) for n, w in self.wma_close.items()}
+
+        out = {}
+        for p in self.periods:
+            raw = 2 * wma[max(1, p // 2)] - wma[p]
+            out[f"{self.prefix}HMA_{p}"] = self.raw[p].update(raw)
+        return out
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "periods": self.periods,
+            "prefix": self.prefix,
+            "_s": {
+                "closes": self.wma_close[max(self.periods)].state(),
+                "raw": {str(p): r.state() for p, r in self.raw.items()},
+            },
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["periods"], s["prefix"], _s=s["_s"])
+
+
+# =========================
+# Heikin-Ashi
+# =========================
+class StreamingHeikinAshi(StreamingIndicator):
+    """Same columns as compute_heikin_ashi(data, prefix)."""
+
+    kind = "heikin_ashi"
+
+    def __init__(self, prefix="D_", prev_open=None, prev_close=None):
+        self.prefix = prefix
+        self.prev_open = prev_open
+        self.prev_close = prev_close
+
+    def update(self, bar):
+        p = self.prefix
+        o, h, l, c = bar[f"{p}Open"], bar[f"{p}High"], bar[f"{p}Low"], bar[f"{p}Close"]
+
+        ha_close = (o + h + l + c) / 4
+        if self.prev_open is None:
+            ha_open = (o + c) / 2
+        else:
+            ha_open = (self.prev_open + self.prev_close) / 2
+        self.prev_open, self.prev_close = ha_open, ha_close
+
+        return {
+            f"{p}HA_Close": ha_close,
+            f"{p}HA_Open": ha_open,
+            f"{p}HA_High": float(np.nanmax([h, ha_open, ha_close])),
+            f"{p}HA_Low": float(np.nanmin([l, ha_open, ha_close])),
+        }
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "prefix": self.prefix,
+            "prev_open": self.prev_open,
+            "prev_close": self.prev_close,
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["prefix"], s["prev_open"], s["prev_close"])
+
+
+# =========================
+# Donchian
+# =========================
+class StreamingDonchian(StreamingIndicator):
+    """Same columns as the Donchian block in align_data_time (DC_*_{window})."""
+
+    kind = "donchian"
+
+    def __init__(self, window=26, prefix="D_", _s=None):
+        self.window = window
+        self.prefix = prefix
+        if _s is None:
+            self.hi = _RollingExtreme(window, "max")
+            self.lo = _RollingExtreme(window, "min")
+        else:
+            self.hi = _RollingExtreme(*_s["hi"])
+            self.lo = _RollingExtreme(*_s["lo"])
+
+    def update(self, bar):
+        upper = self.hi.update(bar[f"{self.prefix}High"])
+        lower = self.lo.update(bar[f"{self.prefix}Low"])
+        w = self.window
+        return {
+            f"DC_Upper_{w}": upper,
+            f"DC_Lower_{w}": lower,
+            f"DC_Middle_{w}": (upper + lower) / 2,
+        }
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "window": self.window,
+            "prefix": self.prefix,
+            "_s": {"hi": self.hi.state(), "lo": self.lo.state()},
+        }
+
+    @classmethod
+    def from_state(cls, s):
+        return cls(s["window"], s["prefix"], _s=s["_s"])
+
+
+KINDS = {
+    cls.kind: cls
+    for cls in (
+        StreamingEMA,
+        StreamingIchimoku,
+        StreamingBollinger,
+        StreamingATR,
+        StreamingHMA,
+        StreamingHeikinAshi,
+        StreamingDonchian,
+    )
+}
+
+
+def restore(state: dict) -> StreamingIndicator:
+    return KINDS[state["kind"]].from_state(state)
+
+
+# =========================
+# Engine
+# =========================
+class StreamingIndicatorEngine:
+    """
+    Feeds one bar at a time to a set of streaming indicators.
+
+        engine = StreamingIndicatorEngine.default_daily()
+        engine.warm_up(history)               # once
+        engine.save("state/BTC-USD.json")
+        ...
+        engine = StreamingIndicatorEngine.load("state/BTC-USD.json")
+        row = engine.update(ts, bar)          # every new day, O(1)
+    """
+
+    def __init__(self, indicators, last_ts=None):
+        self.indicators = list(indicators)
+        # compared as Timestamps ("2024-01-02" and a midnight Timestamp are
+        # the same bar); the ISO string is only the saved form
+        self.last_ts = None if last_ts is None else pd.Timestamp(last_ts)
+
+    @classmethod
+    def default_daily(cls, prefix="D_"):
+        return cls(
+            [StreamingEMA(p) for p in (9, 20, 50, 100, 200, 365)]
+            + [
+                StreamingEMA(365 * 2, name="EMA_2y"),
+                StreamingBollinger(20, 2, prefix),
+                StreamingDonchian(365, prefix),
+                StreamingDonchian(26, prefix),
+                StreamingIchimoku(prefix),
+                StreamingATR([14], prefix),
+            ]
+        )
+
+    def update(self, ts, bar: dict) -> dict:
+        ts = pd.Timestamp(ts)
+        if self.last_ts is not None and ts <= self.last_ts:
+            raise ValueError(f"Bar {ts} is not newer than last bar {self.last_ts}")
+
+        row = {}
+        for ind in self.indicators:
+            row.update(ind.update(bar))
+        self.last_ts = ts
+        return row
+
+    def warm_up(self, df):
+        """
+        Feed a history frame (prefixed columns, e.g. D_Close). Returns the rows.
+        """
+        cols = list(df.columns)
+        rows = []
+        for ts, values in zip(df.index, df.itertuples(index=False, name=None)):
+            rows.append(self.update(ts, dict(zip(cols, values))))
+        return rows
+
+    def state(self) -> dict:
+        return {
+            "last_ts": None if self.last_ts is None else self.last_ts.isoformat(),
+            "indicators": [ind.state() for ind in self.indicators],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        return cls([restore(s) for s in state["indicators"]], state.get("last_ts"))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.state(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_state(json.load(f))
@@ -0,0 +1,334 @@
+# sweep.py
+
+import contextlib
+import csv
+import io
+import itertools
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import config
+from backtest import backtest_columns, run_backtest
+from backtest_runner import _setting, apply_strategy, restore_strategy
+from metrics import trade_stats
+from pipeline import build_weekly_bb, prepare_data, reset_state
+import signals.core as core
+from signals.context import context as signal_context
+
+# config frames the backtest reads besides the aligned frame (small: weekly)
+CONTEXT = (
+    "daily_data",
+    "weekly_data",
+    "ichimoku_weekly",
+    "weekly_data_HA",
+    "weekly_bb",
+    "weekly_HMA",
+    "weekly_ATR",
+)
+
+# settings that change a precomputed weekly frame → rebuilt per evaluation
+WEEKLY_BB_SETTINGS = {"BB_SQUEEZE_WINDOW", "BB_SQUEEZE_PCT"}
+
+
+# =========================
+# Grid
+# =========================
+def expand_grid(grid):
+    """
+    {setting: [values]} → list of {setting: value}, every combination,
+    in a fixed order (last setting varies fastest).
+    """
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*grid.values())]
+
+
+# =========================
+# Shared frame
+# =========================
+class SharedFrame:
+    """
+    The columns of a DataFrame in shared memory: one 2D block per dtype
+    (rows = columns of the frame). Created once by the parent; workers
+    attach by name and copy out a private frame per evaluation, so the
+    data is never pickled per task.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.blocks = {}
+        layout = []
+        groups = {}
+        for col in df.columns:
+            dtype = df[col].dtype
+            if dtype.kind not in "fbiu":
+                raise TypeError(f"Column {col!r} has unsupported dtype {dtype}")
+            groups.setdefault(dtype.str, []).append(col)
+
+        for dtype, cols in groups.items():
+            shape = (len(cols), len(df))
+            shm = shared_memory.SharedMemory(
+                create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            )
+            block = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            for row, col in enumerate(cols):
+                block[row] = df[col].to_numpy()
+            self.blocks[dtype] = shm
+            layout.extend((col, dtype, row) for row, col in enumerate(cols))
+
+        order = {col: k for k, col in enumerate(df.columns)}
+        layout.sort(key=lambda item: order[item[0]])
+        self.spec = SimpleNamespace(
+            index=df.index,
+            layout=layout,
+            blocks={
+                dtype: (shm.name, (len(groups[dtype]), len(df)))
+                for dtype, shm in self.blocks.items()
+            },
+        )
+
+    def column(self, col) -> np.ndarray:
+        """
+        Read-only view of one column (parent side).
+        """
+        for name, dtype, row in self.spec.layout:
+            if name == col:
+                shape = self.spec.blocks[dtype][1]
+                view = np.ndarray(shape, dtype=dtype, buffer=self.blocks[dtype].buf)
+                view = view[row]
+                view.flags.writeable = False
+                return view
+        raise KeyError(col)
+
+    def close(self):
+        for shm in self.blocks.values():
+            shm.close()
+            shm.unlink()
+        self.blocks = {}
+
+
+class AttachedFrame:
+    """
+    Worker side of a SharedFrame: read-only views + a fresh copy per call.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self._shm = []
+        self.views = {}
+        for dtype, (name, shape) in spec.blocks.items():
+            # pool workers share the parent's resource tracker: the segment
+            # stays registered once and is unlinked by the parent
+            shm = shared_memory.SharedMemory(name=name)
+            self._shm.append(shm)
+            view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            view.flags.writeable = False
+            self.views[dtype] = view
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Private, writable copy (signals write marker columns into it).
+        The index object is shared, so per-index caches (day_to_week) hit.
+        """
+        cols = {
+            col: self.views[dtype][row].copy() for col, dtype, row in self.spec.layout
+        }
+        return pd.DataFrame(cols, index=self.spec.index, copy=False)
+
+    def close(self):
+        self.views = {}
+        for shm in self._shm:
+            shm.close()
+        self._shm = []
+
+
+# =========================
+# Worker
+# =========================
+_WORKER = None
+
+
+def share_symbols(symbols, strategy=None):
+    """
+    Prepare each symbol once (indicator cache, base strategy) and place its
+    aligned frame in shared memory.
+    Returns {symbol: SharedFrame}, {symbol: (spec, config context)}.
+    """
+    shared, frames = {}, {}
+    restore_strategy()
+    apply_strategy(strategy)
+    try:
+        for symbol in symbols:
+            reset_state()
+            data = prepare_data(symbol, columns=backtest_columns())
+            shared[symbol] = SharedFrame(data)
+            context = {name: getattr(config, name) for name in CONTEXT}
+            frames[symbol] = (shared[symbol].spec, context)
+    except Exception:
+        for frame in shared.values():
+            frame.close()
+        raise
+    return shared, frames
+
+
+def _init_worker(frames, strategy, quiet):
+    global _WORKER
+    _WORKER = SimpleNamespace(
+        symbols={
+            symbol: SimpleNamespace(frame=AttachedFrame(spec), context=context)
+            for symbol, (spec, context) in frames.items()
+        },
+        strategy=strategy,
+        quiet=quiet,
+    )
+
+
+def _close_worker():
+    global _WORKER
+    for entry in _WORKER.symbols.values():
+        entry.frame.close()
+    _WORKER = None
+
+
+def _evaluate(run, params, symbol, stop=None, start=None, detail=False):
+    """
+    One configuration on a fresh copy of `symbol`'s shared frame
+    (bars start..stop, see run_backtest) → one result row.
+    detail=True adds the trade list and equity series to the row.
+    """
+    w = _WORKER
+    entry = w.symbols[symbol]
+    t0 = time.perf_counter()
+    error = None
+    trades, equity = [], None
+
+    log = io.StringIO()
+    redirect = contextlib.redirect_stdout(log) if w.quiet else contextlib.nullcontext()
+    with redirect:
+        try:
+            # every run starts from the base strategy + untouched context
+            restore_strategy()
+            apply_strategy(w.strategy)
+            apply_strategy(params)
+            core.registry.clear()
+            signal_context.clear()
+            for name, value in entry.context.items():
+                setattr(config, name, value)
+            if WEEKLY_BB_SETTINGS & {_setting(n)[1] for n in params}:
+                config.weekly_bb = build_weekly_bb(config.weekly_data)
+
+            _, _, _, trades, equity, _ = run_backtest(
+                entry.frame.frame(), stop=stop, start=start
+            )
+        except Exception:
+            error = traceback.format_exc().strip().splitlines()[-1]
+
+    row = {"run": run, "symbol": symbol, **params, **trade_stats(trades)}
+    row["sequences"] = len(core.list_of_signal_sequences)
+    row["seconds"] = time.perf_counter() - t0
+    row["pid"] = os.getpid()
+    row["error"] = error or ""
+    if detail:
+        row["trade_list"] = trades
+        row["equity"] = equity
+    return row
+
+
+def evaluate_all(tasks, frames, strategy=None, max_workers=None, quiet=True):
+    """
+    Run _evaluate(*task) for every task, in worker processes attached to
+    `frames` (from share_symbols). Yields result rows as they finish.
+    max_workers=None → all cores; 1 → in this process.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(tasks)))
+
+    if max_workers == 1:
+        _init_worker(frames, strategy, quiet)
+        try:
+            for task in tasks:
+                yield _evaluate(*task)
+        finally:
+            _close_worker()
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(frames, strategy, quiet),
+    ) as ex:
+        futures = [ex.submit(_evaluate, *task) for task in tasks]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+# =========================
+# Sweep
+# =========================
+def run_sweep(
+    symbol, grid, strategy=None, max_workers=None, results_path=None, quiet=True
+):
+    """
+    Backtest every configuration of `grid` on one symbol.
+
+    - grid: {setting: [values]}; settings as in backtest_runner.apply_strategy
+      (config attributes or dotted module constants)
+    - strategy: base settings applied before each configuration
+    - The aligned frame is built once and placed in shared memory; workers
+      copy it out per configuration instead of receiving it pickled.
+    - results_path: CSV that receives one row per configuration as soon as
+      it finishes (partial results survive an interrupted sweep)
+
+    Returns the results table sorted by run number.
+    """
+    combos = expand_grid(grid)
+    for name in grid:
+        _setting(name)  # fail fast on typos, before any work
+
+    shared, frames = share_symbols([symbol], strategy)
+    rows = []
+    out = open(results_path, "w", newline="") if results_path else None
+    writer = None
+
+    try:
+        tasks = [(run, params, symbol) for run, params in enumerate(combos)]
+        for row in evaluate_all(tasks, frames, strategy, max_workers, quiet):
+            rows.append(row)
+            if out is not None:
+                if writer is None:
+                    writer = csv.DictWriter(out, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                out.flush()
+    finally:
+        for frame in shared.values():
+            frame.close()
+        if out is not None:
+            out.close()
+        restore_strategy()
+
+    return pd.DataFrame(rows).sort_values("run").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from get_data import DEFAULT_SYMBOL
+
+    grid = {
+        "signals.core.MIN_BARS_BETWEEN_SEQS": [40, 60, 90],
+        "signals.find_pivotline_cross.LOOKBACK_DAYS": [7, 14, 28],
+        "signals.evaluate_range_tension.MIN_REGLINE_CROSSES": [3, 4, 5],
+        "signals.evaluate_range_tension.MIN_EMA_CROSSES": [3, 4, 5],
+        "signals.helpers.find_start_of_consolidation.SLOPE_ABS_THRESHOLD": [1.5, 2.0],
+    }
+    t0 = time.perf_counter()
+    table = run_sweep(DEFAULT_SYMBOL, grid, results_path="sweep_results.csv")
+    print(table.sort_values("total_return", ascending=False).head(20).to_string())
+    print(f"{len(table)} configurations | {time.perf_counter() - t0:.2f}s wall")
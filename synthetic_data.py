@@ -0,0 +1,230 @@
+# synthetic_data.py
+
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from data_providers import DataProvider
+
+try:
+    from scipy.signal import lfilter
+
+    _HAS_SCIPY = True
+except Exception:
+    _HAS_SCIPY = False
+
+# =========================
+# Regimes
+# =========================
+# name: (min_len, max_len, drift per bar, vol per bar)
+# Lengths are in bars at daily resolution; they scale with `bars_per_day`.
+REGIMES = {
+    "flat_base": (120, 400, 0.0, 0.008),  # tight range → flat Senkou B
+    "squeeze": (40, 120, 0.0, 0.004),  # volatility contracts before a move
+    "breakout": (30, 120, 0.004, 0.025),  # trend leg out of a base
+    "bubble": (40, 150, 0.008, 0.045),  # volatility bubble
+    "crash": (20, 80, -0.010, 0.050),  # bubble unwinds
+    "decline": (60, 250, -0.002, 0.020),  # slow bear trend
+}
+
+# Markov chain between regimes: flat bases are followed by breakouts,
+# bubbles are followed by crashes, and so on.
+TRANSITIONS = {
+    "flat_base": {"squeeze": 0.5, "breakout": 0.35, "decline": 0.15},
+    "squeeze": {"breakout": 0.7, "decline": 0.3},
+    "breakout": {"flat_base": 0.4, "bubble": 0.35, "decline": 0.25},
+    "bubble": {"crash": 0.8, "flat_base": 0.2},
+    "crash": {"flat_base": 0.6, "decline": 0.4},
+    "decline": {"flat_base": 0.7, "breakout": 0.3},
+}
+
+
+def _regime_path(rng, n_bars, bars_per_day, first="flat_base"):
+    """
+    Return (drift, vol, regime_id, segments) for n_bars.
+    segments: list of (regime_name, start, end).
+    """
+    names = list(REGIMES)
+    drift = np.empty(n_bars)
+    vol = np.empty(n_bars)
+    regime_id = np.empty(n_bars, dtype=np.int8)
+    segments = []
+
+    pos = 0
+    state = first
+    while pos < n_bars:
+        lo, hi, mu, sigma = REGIMES[state]
+        length = int(rng.integers(lo, hi + 1) * bars_per_day)
+        end = min(n_bars, pos + max(1, length))
+
+        # per-bar scaling keeps daily-equivalent drift / vol for intraday bars
+        drift[pos:end] = mu / bars_per_day
+        vol[pos:end] = sigma / np.sqrt(bars_per_day)
+        regime_id[pos:end] = names.index(state)
+        segments.append((state, pos, end))
+
+        if state == "squeeze":
+            # volatility contracts linearly through the squeeze
+            vol[pos:end] *= np.linspace(1.0, 0.35, end - pos)
+
+        nxt = TRANSITIONS[state]
+        state = rng.choice(list(nxt), p=list(nxt.values()))
+        pos = end
+
+    return drift, vol, regime_id, segments
+
+
+def _ar1(shocks, phi):
+    """
+    d[t] = phi * d[t-1] + shocks[t], d[-1] = 0
+    """
+    if _HAS_SCIPY:
+        return lfilter([1.0], [1.0, -phi], shocks)
+    out = np.empty(len(shocks))
+    d = 0.0
+    for t, e in enumerate(shocks):
+        d = phi * d + e
+        out[t] = d
+    return out
+
+
+# =========================
+# Generator
+# =========================
+def generate_ohlcv(
+    n_bars=5000,
+    start="2000-01-01",
+    freq="D",
+    seed=0,
+    start_price=100.0,
+    bars_per_day=1,
+    return_regimes=False,
+):
+    """
+    Seeded synthetic OHLCV with regime switching.
+
+    Output has the exact layout of get_data.fetch_daily_data
+    (yf.download auto_adjust=False): Adj Close, Close, High, Low, Open, Volume.
+    It can be assigned straight to config.daily_data.
+
+    - freq: "D" (crypto, 7 days), "B" (stocks), "h" / "15min" (intraday)
+    - bars_per_day: set >1 for intraday so regime lengths stay in days
+    - flat_base regimes mean-revert to a fixed level, so weekly Senkou B
+      really goes flat (what senb_w_future_flat_base looks for)
+    """
+    rng = np.random.default_rng(seed)
+    drift, vol, regime_id, segments = _regime_path(rng, n_bars, bars_per_day)
+
+    # --- Close: log random walk, mean-reverting (AR(1)) inside flat bases ---
+    shocks = rng.standard_normal(n_bars) * vol + drift
+    shocks[0] = 0.0
+    log_close = np.empty(n_bars)
+
+    level = np.log(start_price)
+    for state, s0, s1 in segments:
+        if state == "flat_base":
+            phi = 1.0 - 0.05 / bars_per_day
+            log_close[s0:s1] = level + _ar1(shocks[s0:s1], phi)
+        else:
+            log_close[s0:s1] = level + np.cumsum(shocks[s0:s1])
+        level = log_close[s1 - 1]
+
+    close = np.exp(log_close)
+
+    # --- Open: previous close with a small gap ---
+    gaps = rng.standard_normal(n_bars) * vol * 0.2
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * np.exp(gaps[1:])
+
+    # --- High / Low: wicks around the body ---
+    wick_up = np.abs(rng.standard_normal(n_bars)) * vol * 0.5
+    wick_dn = np.abs(rng.standard_normal(n_bars)) * vol * 0.5
+    high = np.maximum(open_, close) * np.exp(wick_up)
+    low = np.minimum(open_, close) * np.exp(-wick_dn)
+
+    # --- Volume: higher in volatile regimes ---
+    base_vol = 1e6 / bars_per_day
+    volume = (
+        base_vol * (vol / vol.mean()) * np.exp(rng.standard_normal(n_bars) * 0.3)
+    ).astype(np.int64)
+
+    index = pd.date_range(start=start, periods=n_bars, freq=freq)
+    index.name = "Date" if bars_per_day == 1 else "Datetime"
+
+    df = pd.DataFrame(
+        {
+            "Adj Close": close,
+            "Close": close,
+            "High": high,
+            "Low": low,
+            "Open": open_,
+            "Volume": volume,
+        },
+        index=index,
+    )
+
+    if return_regimes:
+        return df, pd.Series(np.array(list(REGIMES))[regime_id], index=index)
+    return df
+
+
+def generate_universe(n_symbols=100, n_bars=5000, seed=0, **kwargs):
+    """
+    {symbol: frame} for n_symbols independent synthetic series (SYN0000, ...).
+    """
+    return {
+        f"SYN{k:04d}": generate_ohlcv(n_bars=n_bars, seed=seed + k, **kwargs)
+        for k in range(n_symbols)
+    }
+
+
+# =========================
+# Provider (plugs into config.data_provider)
+# =========================
+class SyntheticProvider(DataProvider):
+    """
+    Deterministic per-symbol synthetic data for any [start, end) range.
+    The seed is derived from the symbol name, so the same symbol always
+    returns the same series.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        seed=0,
+        freq="D",
+        bars_per_day=1,
+        origin="1970-01-01",
+        horizon="2040-01-01",
+    ):
+        # The whole [origin, horizon) history is generated once per symbol,
+        # so a symbol's bars do not depend on the requested range.
+        self.seed = seed
+        self.freq = freq
+        self.bars_per_day = bars_per_day
+        self.origin = origin
+        self.horizon = horizon
+        self._frames = {}
+
+    def _series(self, symbol):
+        df = self._frames.get(symbol)
+        if df is None:
+            n_bars = len(pd.date_range(self.origin, self.horizon, freq=self.freq))
+            df = generate_ohlcv(
+                n_bars=n_bars,
+                start=self.origin,
+                freq=self.freq,
+                seed=self.seed + zlib.crc32(symbol.encode()),
+                bars_per_day=self.bars_per_day,
+            )
+            self._frames[symbol] = df
+        return df
+
+    def fetch(self, symbol, start, end, interval="1d") -> pd.DataFrame:
+        df = self._series(symbol)
+        idx = df.index
+        mask = (idx >= pd.Timestamp(start)) & (idx < pd.Timestamp(end))
+        return df.loc[mask].copy()
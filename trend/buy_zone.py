@@ -15,6 +15,7 @@ FLAT_THRESHOLD = getattr(config, "FLAT_THRESHOLD", 0.04)              # 8w local
 BREAKOUT_PCT = getattr(config, "BREAKOUT_PCT", 0.01)
 SEN_A_BUFFER = getattr(config, "SEN_A_BUFFER", 0.01)
 LOOKBACK_W = getattr(config, "LOOKBACK_W", 8)
+RECENT_FLAT_WEEKS = getattr(config, "RECENT_FLAT_WEEKS", 3)         # recent-flat detector reach
 
 # Long-flat requirement before entry
 LONG_FLAT_MIN_WEEKS = getattr(config, "LONG_FLAT_MIN_WEEKS", 16)
@@ -31,16 +32,24 @@ CONSOL_EXT_FWD_SCAN_DAYS  = getattr(config, "CONSOL_EXT_FWD_SCAN_DAYS", 120)
 def find_recent_flat_base(
     w: pd.DataFrame,
     w_pos: int,
-    lookback_w: int = 8,
-    flat_threshold: float = 0.04,
-    recency_weeks: int = 3,
+    lookback_w: int = None,
+    flat_threshold: float = None,
+    recency_weeks: int = None,
     col: str = "W_Senkou_span_B_future",
 ):
     """
     Scan back up to `recency_weeks` from the current weekly index for any complete
     `lookback_w` window whose flatness ratio < `flat_threshold`.
+    None → module constants LOOKBACK_W / FLAT_THRESHOLD / RECENT_FLAT_WEEKS.
     Returns: (found: bool, flat_window_end_wpos: int | None)
     """
+    if lookback_w is None:
+        lookback_w = LOOKBACK_W
+    if flat_threshold is None:
+        flat_threshold = FLAT_THRESHOLD
+    if recency_weeks is None:
+        recency_weeks = RECENT_FLAT_WEEKS
+
     if w_pos - lookback_w < 0:
         return False, None
 
@@ -106,10 +115,8 @@ def check_buy_zone_and_apply(data, i, w_pos):
     # flag for visibility
     data.at[current_date, 'long_flat_senb'] = bool(long_flat_ok)
 
-    # Recent-flat detector (≤3 weeks)
-    recent_flat, recent_flat_wpos = find_recent_flat_base(
-        w, w_pos, lookback_w=LOOKBACK_W, flat_threshold=FLAT_THRESHOLD, recency_weeks=3
-    )
+    # Recent-flat detector (≤ RECENT_FLAT_WEEKS)
+    recent_flat, recent_flat_wpos = find_recent_flat_base(w, w_pos)
     data.at[current_date, "recent_flat_base"] = bool(recent_flat)
     if recent_flat and recent_flat_wpos is not None:
         data.at[current_date, "recent_flat_base_w_end_idx"] = int(recent_flat_wpos)
@@ -0,0 +1,178 @@
+# universe.py
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+
+from data_cache import load_history
+from data_providers import YFinanceProvider
+from get_data import START_DATE, END_DATE
+import config
+
+# =========================
+# Asset universe
+# =========================
+STOCKS = [
+    "AAPL",
+    "TSLA",
+    "NVDA",
+    "AMD",
+    "MSFT",
+    "AMZN",
+    "META",
+    "GOOGL",
+    "NFLX",
+    "AVGO",
+    "BRK-B",
+]
+
+CRYPTO = [
+    "BTC-USD",
+    "ETH-USD",
+    "SOL-USD",
+    "LINK-USD",
+    "XRP-USD",
+    "ADA-USD",
+    "LTC-USD",
+]
+
+UNIVERSE = STOCKS + CRYPTO
+
+
+# =========================
+# Single symbol (with retry)
+# =========================
+def _fetch_one(symbol, start, end, interval, provider, offline, retries, backoff):
+    t0 = time.perf_counter()
+    error = None
+
+    for attempt in range(1, retries + 2):
+        try:
+            if provider.cacheable:
+                df = load_history(
+                    symbol,
+                    start,
+                    end,
+                    interval,
+                    download=provider.fetch,
+                    offline=offline,
+                    source=provider.name,
+                )
+            else:
+                # local sources are read directly, never copied into the cache
+                df = provider.fetch(symbol, start, end, interval)
+            if df is not None and not df.empty:
+                return SimpleNamespace(
+                    symbol=symbol,
+                    ok=True,
+                    rows=len(df),
+                    last_bar=df.index[-1],
+                    attempts=attempt,
+                    seconds=time.perf_counter() - t0,
+                    error=None,
+                )
+            error = "empty"
+        except Exception as e:  # network errors, rate limits, bad symbols
+            error = repr(e)
+
+        if offline or attempt > retries:
+            break
+
+        # exponential backoff + jitter (avoid hammering the API in lockstep)
+        time.sleep(backoff * 2 ** (attempt - 1) + random.uniform(0, backoff))
+
+    return SimpleNamespace(
+        symbol=symbol,
+        ok=False,
+        rows=0,
+        last_bar=None,
+        attempts=attempt,
+        seconds=time.perf_counter() - t0,
+        error=error,
+    )
+
+
+# =========================
+# Bulk refresh
+# =========================
+def fetch_universe(
+    symbols=None,
+    start=START_DATE,
+    end=END_DATE,
+    interval="1d",
+    max_workers=8,
+    retries=3,
+    backoff=1.0,
+    provider=None,
+    offline=None,
+):
+    """
+    Refresh many symbols concurrently into the local cache.
+
+    - Bounded thread pool (downloads are I/O bound)
+    - One shared provider → one HTTP session reused by all workers
+    - Retries with exponential backoff
+    - Returns {symbol: result} with rows / attempts / seconds / error
+
+    Works with any DataProvider, so it can be tested against FileProvider
+    or InMemoryProvider with no network. Only cacheable (remote) providers
+    are written to the cache; local ones are just read and checked.
+    """
+    symbols = list(symbols or UNIVERSE)
+
+    if provider is None:
+        provider = getattr(config, "data_provider", None) or YFinanceProvider(
+            progress=False
+        )
+
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as ex:
+        futures = {
+            ex.submit(
+                _fetch_one,
+                sym,
+                start,
+                end,
+                interval,
+                provider,
+                offline,
+                retries,
+                backoff,
+            ): sym
+            for sym in symbols
+        }
+        for fut in as_completed(futures):
+            res = fut.result()
+            results[res.symbol] = res
+
+    # keep caller's order
+    return {sym: results[sym] for sym in symbols}
+
+
+def print_fetch_report(results, wall_seconds=None):
+    print("\n📥 UNIVERSE FETCH")
+    for res in results.values():
+        status = "ok " if res.ok else "ERR"
+        last = res.last_bar.date() if res.last_bar is not None else "-"
+        line = (
+            f"{status} {res.symbol:10} rows={res.rows:6d} last={last} "
+            f"tries={res.attempts} {res.seconds:6.2f}s"
+        )
+        if not res.ok:
+            line += f" | {res.error}"
+        print(line)
+
+    n_ok = sum(r.ok for r in results.values())
+    busy = sum(r.seconds for r in results.values())
+    line = f"{n_ok}/{len(results)} symbols refreshed | {busy:.2f}s summed per-symbol"
+    if wall_seconds is not None:
+        line += f" | {wall_seconds:.2f}s wall"
+    print(line)
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    results = fetch_universe()
+    print_fetch_report(results, wall_seconds=time.perf_counter() - t0)
@@ -0,0 +1,204 @@
+# walkforward.py
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from backtest_runner import _setting, restore_strategy
+from metrics import trade_stats
+from sweep import evaluate_all, expand_grid, share_symbols
+
+WARMUP_BARS = 52  # run_backtest never trades before this row
+
+
+# =========================
+# Folds
+# =========================
+def make_folds(valid_rows, train_bars, test_bars, anchored=True):
+    """
+    Train / test windows (row ranges, stop exclusive) over the valid bars.
+
+    anchored=True → every train window starts at the first tradable bar
+    (expanding); False → rolling train windows of `train_bars`.
+    Test windows follow each other without gaps; the last one may be short.
+    """
+    folds = []
+    k = 0
+    while True:
+        train_stop = WARMUP_BARS + train_bars + k * test_bars
+        if train_stop >= valid_rows:
+            break
+        train_start = WARMUP_BARS if anchored else train_stop - train_bars
+        folds.append(
+            SimpleNamespace(
+                fold=k,
+                train_start=train_start,
+                train_stop=train_stop,
+                test_start=train_stop,
+                test_stop=min(train_stop + test_bars, valid_rows),
+            )
+        )
+        k += 1
+    return folds
+
+
+def stitch_equity(parts):
+    """
+    Chain out-of-sample equity curves: each test window starts from the
+    capital the previous one ended with (every window is backtested from
+    the same starting cash, so it is rescaled by its first value).
+    """
+    pieces = []
+    level = None
+    for equity in parts:
+        equity = equity.dropna()
+        if equity.empty:
+            continue
+        if level is not None:
+            equity = equity * (level / equity.iloc[0])
+        pieces.append(equity)
+        level = equity.iloc[-1]
+    if not pieces:
+        return pd.Series(dtype=float, name="Equity")
+    return pd.concat(pieces).rename("Equity")
+
+
+# =========================
+# Walk-forward
+# =========================
+def walk_forward(
+    symbol,
+    grid,
+    train_bars=3 * 365,
+    test_bars=365,
+    anchored=True,
+    metric="total_return",
+    strategy=None,
+    max_workers=None,
+    verbose=False,
+):
+    """
+    Walk-forward optimization of strategy settings on one symbol.
+
+    For every fold, each configuration of `grid` is backtested on the train
+    window, the best (by `metric`) is then backtested on the following test
+    window. All (fold, configuration) train runs go to the worker pool at
+    once, then all test runs.
+
+    Features are computed once for the whole history (through the indicator
+    cache, see pipeline.prepare_data) and shared by every fold; a window is
+    a start / stop row of run_backtest on that frame.
+
+    Returns SimpleNamespace:
+    - folds: one row per fold (windows, chosen settings, train score,
+      test trade_stats, seconds)
+    - equity: stitched out-of-sample equity
+    - stats: trade_stats of every out-of-sample trade
+    - seconds: prepare / train / test / total
+    """
+    t_start = time.perf_counter()
+    configs = expand_grid(grid)
+    for name in grid:
+        _setting(name)  # fail fast on typos, before any work
+
+    seconds = {}
+    shared, frames = share_symbols([symbol], strategy)
+    seconds["prepare"] = time.perf_counter() - t_start
+    try:
+        frame = shared[symbol]
+        index = frame.spec.index
+        valid = np.flatnonzero(~np.isnan(frame.column("D_Close")))
+        valid_rows = int(valid[-1]) + 1 if len(valid) else 0
+        folds = make_folds(valid_rows, train_bars, test_bars, anchored)
+        if not folds:
+            raise ValueError(
+                f"{symbol}: {valid_rows} bars is too short for one fold "
+                f"(warmup {WARMUP_BARS} + train {train_bars} + test)"
+            )
+
+        # --- 1) optimize: every configuration on every train window ---
+        t = time.perf_counter()
+        n = len(configs)
+        tasks = [
+            (f.fold * n + c, configs[c], symbol, f.train_stop, f.train_start)
+            for f in folds
+            for c in range(n)
+        ]
+        train = {}
+        for row in evaluate_all(tasks, frames, strategy, max_workers):
+            train[divmod(row["run"], n)] = row
+        seconds["train"] = time.perf_counter() - t
+
+        best = {}
+        for f in folds:
+            scores = [train[(f.fold, c)][metric] for c in range(n)]
+            best[f.fold] = int(np.argmax(scores))  # ties → lowest config id
+
+        # --- 2) test: the chosen configuration on the next window ---
+        t = time.perf_counter()
+        tasks = [
+            (f.fold, configs[best[f.fold]], symbol, f.test_stop, f.test_start, True)
+            for f in folds
+        ]
+        test = {
+            row["run"]: row
+            for row in evaluate_all(tasks, frames, strategy, max_workers)
+        }
+        seconds["test"] = time.perf_counter() - t
+    finally:
+        for shared_frame in shared.values():
+            shared_frame.close()
+        restore_strategy()
+
+    rows = []
+    for f in folds:
+        chosen = train[(f.fold, best[f.fold])]
+        result = test[f.fold]
+        row = {
+            "fold": f.fold,
+            "train_from": index[f.train_start],
+            "train_to": index[f.train_stop - 1],
+            "test_from": index[f.test_start],
+            "test_to": index[f.test_stop - 1],
+            **configs[best[f.fold]],
+            "train_score": chosen[metric],
+            "train_seconds": sum(train[(f.fold, c)]["seconds"] for c in range(n)),
+        }
+        row.update(
+            {f"test_{k}": v for k, v in trade_stats(result["trade_list"]).items()}
+        )
+        row["test_seconds"] = result["seconds"]
+        row["error"] = result["error"] or chosen["error"]
+        rows.append(row)
+        if verbose:
+            print(
+                f"🔁 fold {f.fold}: train {row['train_from'].date()}→"
+                f"{row['train_to'].date()} score={row['train_score']:.2f} | "
+                f"test {row['test_from'].date()}→{row['test_to'].date()} "
+                f"return={row['test_total_return']:.2f}"
+            )
+
+    oos_trades = [t for f in folds for t in test[f.fold]["trade_list"]]
+    seconds["total"] = time.perf_counter() - t_start
+    return SimpleNamespace(
+        folds=pd.DataFrame(rows),
+        equity=stitch_equity(test[f.fold]["equity"] for f in folds),
+        stats=trade_stats(oos_trades),
+        trades=oos_trades,
+        seconds=seconds,
+    )
+
+
+if __name__ == "__main__":
+    from get_data import DEFAULT_SYMBOL
+
+    grid = {
+        "signals.find_pivotline_cross.LOOKBACK_DAYS": [7, 14, 28],
+        "signals.evaluate_range_tension.MIN_REGLINE_CROSSES": [3, 4, 5],
+        "signals.evaluate_range_tension.MIN_EMA_CROSSES": [3, 4, 5],
+    }
+    wf = walk_forward(DEFAULT_SYMBOL, grid, verbose=True)
+    print(wf.folds.to_string())
+    print("OOS:", {k: round(v, 2) for k, v in wf.stats.items()})
+    print({k: f"{v:.2f}s" for k, v in wf.seconds.items()})